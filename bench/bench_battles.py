@@ -0,0 +1,212 @@
+"""Full-battle throughput for every grouping strategy, roster size and ability mix.
+
+    python -m bench.bench_battles --update-baseline  # on the commit to compare against
+    python -m bench.bench_battles                 # run everything, compare with that baseline
+    python -m bench.bench_battles --quick         # skip the 10k rosters
+    python -m bench.bench_battles --out results.json --only split,vsboss
+
+Battles are played the way BattleCommand plays them: its grouping strategies (make_strategies),
+its reset, seeded start_battle, then one turn at a time until one side is wiped out or the turn cap
+is hit (lines rendered). Exits with status 1 when a case is slower or heavier than the baseline by
+more than --tolerance. Timings only compare on the machine that recorded them, so the baseline is a
+local, untracked file rather than part of the repository.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from core.game.models import Character
+from core.game.grouping import make_strategies
+from core.game.engine import GameEngine
+from core.game.generator import CharGenerator
+from core.game.rng import rng_stream
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.local.json"
+
+STRATEGIES = tuple(make_strategies())
+
+# 2vs2 and 5vs5 only ever field their first 4 / 10 characters.
+ROSTER_SIZES = {
+    "split": (4, 100, 1000, 10000),
+    "1vsall": (4, 100, 1000, 10000),
+    "2vs2": (4,),
+    "5vs5": (10,),
+    "vsboss": (4, 100, 1000, 10000),
+}
+
+MIXES = ("none", "pool", "heavy")
+
+def build_roster(size: int, mix: str, seed: int = 1) -> List[Character]:
+    """Generator fighters; `none` strips abilities, `pool` keeps 1-3 random ones, `heavy` gets the whole pool."""
+    rng = rng_stream(seed, size, mix)
+    roster = CharGenerator.generate_team(size, rng)
+    for c in roster:
+        if mix == "none":
+            c.abilities = []
+        elif mix == "heavy":
+            c.abilities = [factory(rng) for factory in CharGenerator.ABILITY_POOL]
+    return roster
+
+def reset(roster: List[Character]):
+    for c in roster:
+        c.health = c.base_hp + sum(i.bonus_hp for i in c.items)
+        c._temp_armor = 0
+        c._frozen_turns = 0
+        c._doom_counter = None
+        c._statuses = None
+        c._current_turn_counter = 0
+
+def play_battle(engine: GameEngine, roster: List[Character], strategy_name: str, seed) -> int:
+    """One BattleCommand-equivalent battle; returns the number of turns played."""
+    strategy = make_strategies()[strategy_name]
+    max_turns = 50 if strategy_name == "vsboss" else 30
+    reset(roster)
+    engine.start_battle(seed=seed)
+
+    team1, team2 = strategy.group(roster)
+    turn = 1
+    while any(c.is_alive() for c in team1) and any(c.is_alive() for c in team2):
+        for _ in engine.battle_simulation_step(roster, strategy): pass
+        if not any(c.is_alive() for c in team1) or not any(c.is_alive() for c in team2):
+            break
+        turn += 1
+        if turn > max_turns:
+            turn = max_turns
+            break
+    return turn
+
+def measure_speed(roster: List[Character], strategy_name: str, min_time: float, max_battles: int) -> Tuple[int, int, float]:
+    engine = GameEngine()
+    battles = turns = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while battles < max_battles and (battles == 0 or elapsed < min_time):
+        turns += play_battle(engine, roster, strategy_name, seed=battles)
+        battles += 1
+        elapsed = time.perf_counter() - start
+    return battles, turns, elapsed
+
+def measure_memory(roster: List[Character], strategy_name: str) -> Tuple[float, float, float]:
+    """(peak KiB over a battle, mean per-turn transient peak KiB, retained blocks per turn).
+
+    CPython has no allocation counter, so per-turn churn is the high-water mark each turn
+    reaches above its starting point; retained blocks catch leaks between turns.
+    """
+    engine = GameEngine()
+    strategy = make_strategies()[strategy_name]
+    max_turns = 50 if strategy_name == "vsboss" else 30
+    reset(roster)
+    engine.start_battle(seed=0)
+    team1, team2 = strategy.group(roster)
+
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        blocks_before = sys.getallocatedblocks()
+        turn_peaks = []
+        peak = turns = 0
+        while turns < max_turns and any(c.is_alive() for c in team1) and any(c.is_alive() for c in team2):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            for _ in engine.battle_simulation_step(roster, strategy): pass
+            turn_peak = tracemalloc.get_traced_memory()[1] - current
+            turn_peaks.append(turn_peak)
+            peak = max(peak, current - base + turn_peak)
+            turns += 1
+        retained = (sys.getallocatedblocks() - blocks_before) / max(1, turns)
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return peak / 1024, sum(turn_peaks) / max(1, len(turn_peaks)) / 1024, retained
+
+def run_case(strategy_name: str, size: int, mix: str, min_time: float, max_battles: int) -> dict:
+    roster = build_roster(size, mix)
+    battles, turns, elapsed = measure_speed(roster, strategy_name, min_time, max_battles)
+    peak_kib, turn_kib, retained = measure_memory(roster, strategy_name)
+    return {
+        "case": f"{strategy_name}/{size}/{mix}",
+        "battles": battles,
+        "turns": turns,
+        "seconds": round(elapsed, 4),
+        "battles_per_s": round(battles / elapsed, 2),
+        "turns_per_s": round(turns / elapsed, 1),
+        "peak_kib": round(peak_kib, 1),
+        "turn_peak_kib": round(turn_kib, 2),
+        "retained_blocks_per_turn": round(retained, 2),
+    }
+
+def compare(results: List[dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    regressions = []
+    for res in results:
+        old = baseline.get(res["case"])
+        if old is None:
+            continue
+        if res["turns_per_s"] < old["turns_per_s"] * (1 - tolerance):
+            regressions.append(f"{res['case']}: {res['turns_per_s']} turns/s vs baseline {old['turns_per_s']}")
+        if res["peak_kib"] > old["peak_kib"] * (1 + tolerance) + 64:
+            regressions.append(f"{res['case']}: peak {res['peak_kib']} KiB vs baseline {old['peak_kib']}")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="skip 10k rosters")
+    parser.add_argument("--only", default="", help="comma separated strategies")
+    parser.add_argument("--mixes", default=",".join(MIXES))
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per case")
+    parser.add_argument("--max-battles", type=int, default=5000)
+    parser.add_argument("--out", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    names = [s for s in args.only.split(",") if s] or list(STRATEGIES)
+    mixes = [m for m in args.mixes.split(",") if m]
+    results = []
+    for name in names:
+        for size in ROSTER_SIZES[name]:
+            if args.quick and size > 1000:
+                continue
+            for mix in mixes:
+                res = run_case(name, size, mix, args.min_time, args.max_battles)
+                results.append(res)
+                print(f"{res['case']:<22} {res['battles_per_s']:>10.2f} battles/s {res['turns_per_s']:>12.1f} turns/s"
+                      f" {res['peak_kib']:>10.1f} KiB peak {res['turn_peak_kib']:>8.2f} KiB/turn"
+                      f" {res['retained_blocks_per_turn']:>7.2f} blocks/turn")
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        baseline = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        baseline.update({res["case"]: res for res in results})
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions against {args.baseline.name} (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Save/load round trip of a large roster through PersistenceService (JSON, binary and SQLite) and
+GameStorage (JSON and binary),
+plus re-saving the SQLite catalog after editing a single character, opening it lazily, the
+peak memory of streaming the JSON catalog and battle turn latency while the autosave thread
+rewrites the JSON catalog.
+
+    python -m bench.bench_persistence            # 100k characters
+    python -m bench.bench_persistence 20000
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from core.game.generator import CharGenerator
+from core.game.rng import rng_stream
+from core.game import registry
+from core.game.engine import GameEngine
+from core.game.grouping import SplitInTwoStrategy
+from infra.autosave import AutosaveWorker
+from infra.catalog_db import SqliteCatalog
+from infra.persistence import PersistenceService
+from infra.storage import GameStorage
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - start
+
+def check(original, loaded):
+    assert len(loaded) == len(original), (len(loaded), len(original))
+    for a, b in zip(original, loaded):
+        assert registry.encode_skills(a.abilities) == registry.encode_skills(b.abilities), a.name
+
+def stream_peak(path: Path) -> float:
+    """Peak traced MiB while streaming the JSON catalog without keeping the characters."""
+    tracemalloc.start()
+    try:
+        for _ in PersistenceService.iter_characters(path): pass
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+def turn_latency(worker, seconds: float = 2.0):
+    """Median and worst battle turn in ms while `worker` (if any) saves every 200 turns."""
+    engine = GameEngine()
+    engine.autosave = worker
+    engine.start_battle(seed=1)
+    fighters = CharGenerator.generate_team(10, rng_stream(1, "bench_turns"))
+    times = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        for c in fighters: c.health = c.max_hp
+        start = time.perf_counter()
+        engine.resolve_turn(fighters, SplitInTwoStrategy(), engine.events)
+        times.append(time.perf_counter() - start)
+        if worker is not None and len(times) % 200 == 0: worker.request()
+        time.sleep(0.001)
+    times.sort()
+    return times[len(times) // 2] * 1000, times[-1] * 1000
+
+def main(size: int = 100_000):
+    roster = CharGenerator.generate_team(size, rng_stream(1, "bench_persistence"))
+    abilities = sum(len(c.abilities) for c in roster)
+    print(f"{size} characters, {abilities} abilities")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label, save, load, path in (
+                ("PersistenceService", PersistenceService.save_characters, PersistenceService.load_characters,
+                 Path(tmp) / "game_data.json"),
+                ("Binary catalog", PersistenceService.save_characters, PersistenceService.load_characters,
+                 Path(tmp) / "game_data.bin"),
+                ("SQLite catalog", PersistenceService.save_characters, PersistenceService.load_characters,
+                 Path(tmp) / "game_data.db"),
+                ("GameStorage", GameStorage.save_game, GameStorage.load_game, Path(tmp) / "savegame.json"),
+                ("GameStorage binary", GameStorage.save_game, GameStorage.load_game, Path(tmp) / "savegame.bin")):
+            _, save_s = timed(save, roster, path)
+            loaded, load_s = timed(load, path)
+            check(roster, loaded)
+            results[label] = loaded
+            print(f"  {label:<18} save {save_s:6.2f}s  load {load_s:6.2f}s  "
+                  f"{path.stat().st_size / 2**20:7.1f} MiB  ({size / load_s:,.0f} chars/s loaded)")
+
+        json_path = Path(tmp) / "game_data.json"
+        print(f"  JSON streaming read peak {stream_peak(json_path):6.2f} MiB for a "
+              f"{json_path.stat().st_size / 2**20:.1f} MiB file")
+
+        db = Path(tmp) / "game_data.db"
+        loaded = results["SQLite catalog"]
+        loaded[size // 2].stats["attack"] += 1
+        _, resave_s = timed(PersistenceService.save_characters, loaded, db)
+        _, single_s = timed(PersistenceService.save_character, loaded[size // 3], db)
+        print(f"  SQLite one edit     save_characters {resave_s * 1000:7.1f} ms  save_character {single_s * 1000:5.2f} ms")
+        SqliteCatalog.close_all()
+        lazy, open_s = timed(PersistenceService.open_catalog, db)
+        print(f"  SQLite open_catalog {open_s * 1000:7.1f} ms  ({len(lazy)} indexed, {lazy.loaded_count} built)")
+        SqliteCatalog.close_all()
+
+        with redirect_stdout(StringIO()):
+            idle = turn_latency(None)
+            catalog = PersistenceService.open_catalog(json_path)
+            for i in range(0, size, 100): catalog[i]
+            worker = AutosaveWorker(lambda: PersistenceService.snapshot_catalog(catalog, json_path), interval=None)
+            worker.start()
+            busy = turn_latency(worker)
+            worker.stop()
+        print(f"  Battle turn         idle median {idle[0]:.2f} ms max {idle[1]:.1f} ms;  "
+              f"autosaving median {busy[0]:.2f} ms max {busy[1]:.1f} ms ({worker.saves} JSON saves)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
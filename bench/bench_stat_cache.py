@@ -0,0 +1,90 @@
+"""Per-turn cost of a geared 5vs5 with and without the derived-stat cache.
+
+    python -m bench.bench_stat_cache
+"""
+import random
+import time
+
+from core.game.models import Character, Item
+from core.game.grouping import FiveVsFiveStrategy
+from core.game.engine import GameEngine
+from core.game import abilities
+
+class UncachedCharacter(Character):
+    """Recomputes every derived stat on read, like Character did before the cache."""
+
+    @property
+    def health(self) -> int:
+        val = self.stats.get("health")
+        if val is None: val = self.stats.get("max_hp", 100)
+        return int(val)
+
+    @health.setter
+    def health(self, value: int):
+        self.stats["health"] = value
+
+    @property
+    def attack(self) -> int:
+        base = self.stats.get("attack") or self.stats.get("base_attack", 10)
+        return int(base) + sum(i.bonus_attack for i in self.equipment if hasattr(i, 'bonus_attack'))
+
+    @property
+    def armor(self) -> int:
+        base = int(self.stats.get("defense", self.stats.get("armor", 0)))
+        item_bonus = sum(i.bonus_armor for i in self.equipment if hasattr(i, 'bonus_armor'))
+        return base + item_bonus + self._temp_armor
+
+    @property
+    def critical_chance(self) -> float:
+        return self.stats.get("crit_chance", 0.1)
+
+    @property
+    def critical_multiplier(self) -> float:
+        return self.stats.get("crit_multiplier", 1.5)
+
+    def is_alive(self) -> bool:
+        return self.health > 0
+
+def geared_roster(cls, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    roster = []
+    for i in range(10):
+        c = cls(id=i, name=f"Fighter_{i}", game="custom", level=1, stats={
+            "max_hp": rng.randint(300, 450), "attack": rng.randint(8, 18), "defense": rng.randint(0, 8)})
+        for slot in ("weapon", "helmet", "armor", "boots"):
+            c.equip(Item(name=f"{slot}_{i}", slot=slot, bonus_hp=rng.randint(0, 20),
+                         bonus_armor=rng.randint(0, 3), bonus_attack=rng.randint(0, 4)))
+        c.abilities.append(abilities.Fireball(rng.randint(20, 40)))
+        roster.append(c)
+    return roster
+
+def reset(roster: list):
+    for c in roster:
+        c.health = c.base_hp + sum(i.bonus_hp for i in c.items)
+        c._temp_armor = 0
+        c._frozen_turns = 0
+        c._doom_counter = None
+
+def per_turn_us(cls, turns: int) -> float:
+    roster = geared_roster(cls)
+    strategy = FiveVsFiveStrategy()
+    engine = GameEngine()
+    random.seed(7)
+    reset(roster)
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        engine.resolve_turn(roster, strategy)
+        if not any(c.is_alive() for c in roster[:5]) or not any(c.is_alive() for c in roster[5:]):
+            reset(roster)
+    return (time.perf_counter() - start) / turns * 1e6
+
+def main(turns: int = 20000):
+    before = per_turn_us(UncachedCharacter, turns)
+    after = per_turn_us(Character, turns)
+    print(f"geared 5vs5, {turns} turns of GameEngine.resolve_turn")
+    print(f"  uncached: {before:8.2f} us/turn")
+    print(f"  cached:   {after:8.2f} us/turn  ({before / after:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,35 @@
 from infra.io import IDisplay
-from core.game.engine import GameEngine
+from core.game.engine import GameEngine, GROUPING_FAILED
+from core.game.events import render_lines
 from core.game.models import Character, Item
-from core.game import abilities
+from core.game import registry
 from core.game.generator import CharGenerator
-from core.game.grouping import IGroupingStrategy, SplitInTwoStrategy, OneVsAllStrategy
+from core.game.grouping import IGroupingStrategy, OneVsBossStrategy, TEAM_SIZES_BY_MODE, make_strategies
 from core.text.document import Document, Heading, Paragraph
 from .presenter import Presenter
 from typing import Optional, Dict, List, Any, Tuple
 from abc import ABC, abstractmethod
+from pathlib import Path
 import random
+import time
 
+from core.game.tournament import pairing_count, run_tournament
+from core.game.odds import estimate_odds
+from core.game.simulator import TEAM_1, TEAM_2
+from core.game.replay import Replay, battle_outcome
+from core.game.rng import new_seed, rng_stream
 from core.game.mapper import map_imported_character_to_core
-from infra.api_importer.importer_service import import_character
-from infra.persistence import PersistenceService
+from infra.api_importer.importer_service import import_character, import_characters
+from infra.api_importer.genshin_adapter import api_cache
+from infra.persistence import PersistenceService, DATA_DIR
+from infra.catalog import find_by_name, page_count, page_of
 from core.game.gamestate import GameSession
 from infra.storage import GameStorage
+from infra import image_loader
 
-class OneVsBossStrategy(IGroupingStrategy):
-    def __init__(self):
-        self.boss = Character(
-            id="boss_world_eater",
-            name="Evil Boss", 
-            game="custom",
-            level=99,
-            stats={
-                "max_hp": 250000,
-                "health": 250000,
-                "attack": 250, 
-                "defense": 100,
-                "crit_chance": 0.2,
-                "crit_multiplier": 2.0
-            }
-        )
-
-    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
-        return characters, [self.boss]
-
-class SplitInTwoStrategy(IGroupingStrategy):
-    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
-        mid = len(characters) // 2
-        return characters[:mid], characters[mid:]
-
-class OneVsAllStrategy(IGroupingStrategy):
-    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
-        if not characters: return [], []
-        return characters[:-1], [characters[-1]]
-
-class TwoVsTwoStrategy(IGroupingStrategy):
-    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
-        if len(characters) < 4: return [], []
-        return characters[:2], characters[2:4]
-
-class FiveVsFiveStrategy(IGroupingStrategy):
-    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
-        if len(characters) < 10: return [], []
-        return characters[:5], characters[5:10]
+TOURNAMENT_MAX_MATCHUPS = 5000
+ROSTER_PREVIEW = 10
+LAST_REPLAY_FILE = DATA_DIR / "replays" / "last_battle.json"
 
 class Command(ABC):
     @abstractmethod
@@ -102,19 +77,15 @@ class SaveAllCommand(GameCommand):
 class LoadAllCommand(GameCommand):
     def _do_execute(self, parsed_args: dict):
         self.display.show("Loading save file..")
-        loaded_chars = PersistenceService.load_characters()
+        loaded_chars = PersistenceService.open_catalog()
         if loaded_chars:
-            for char in loaded_chars:
-                if hasattr(char, 'reload_image'): 
-                    char.reload_image()
-                elif hasattr(char, 'image_path'):
-                    pass
-
             self.engine.characters = loaded_chars 
             self.display.show(f"Successfully loaded {len(loaded_chars)} characters")
 
-            names = [c.name for c in loaded_chars]
-            self.display.show(f"   Roster: {', '.join(names)}")
+            names = [loaded_chars.name_at(i) for i in range(min(ROSTER_PREVIEW, len(loaded_chars)))]
+            more = len(loaded_chars) - len(names)
+            suffix = f" (+{more} more, 'ls <page>' to browse)" if more else ""
+            self.display.show(f"   Roster: {', '.join(names)}{suffix}")
         else:
             self.display.show("Save file not found or empty")
 
@@ -136,18 +107,22 @@ class ImportCharCommand:
         if len(parts) < 2:
             self.display.show("Error: Missing arguments")
             self.display.show("Usage: import genshin <Name> [level]")
+            self.display.show("       import genshin <Name> <Name> .. [level] | import genshin --all [level]")
             self.display.show("Example: import genshin Xiao 90")
             return
 
         source = parts[0].lower()
-        char_name = parts[1]
+        names = parts[1:]
         
         level = 90
-        if len(parts) > 2:
-            try:
-                level = int(parts[2])
-            except ValueError:
-                self.display.show("Level must be a number. Defaulting to 90")
+        if len(names) > 1 and names[-1].lstrip("-").isdigit():
+            level = int(names.pop())
+
+        names = [n.replace("_", " ") for n in names]
+        if names == ["--all"] or len(names) > 1:
+            self._import_many(source, None if names == ["--all"] else names, level)
+            return
+        char_name = names[0]
 
         self.display.show(f"Connecting to {source} API to fetch '{char_name}'..")
 
@@ -166,15 +141,44 @@ class ImportCharCommand:
         except Exception as e:
             self.display.show(f"Network/Parsing Error: {e}")
 
+    def _import_many(self, source: str, names: Optional[List[str]], level: int):
+        what = "every character" if names is None else f"{len(names)} characters"
+        self.display.show(f"Connecting to {source} API to fetch {what}..")
+        start = time.perf_counter()
+        try:
+            characters, errors = import_characters(source, names, level)
+        except ValueError as ve:
+            self.display.show(f"Validation Error: {ve}")
+            return
+        except Exception as e:
+            self.display.show(f"Network/Parsing Error: {e}")
+            return
+
+        for character in characters:
+            self.game_engine.add_character(character)
+        self.display.show(f"Imported {len(characters)} characters (Lvl {level}) in {time.perf_counter() - start:.1f}s")
+        for name, error in errors.items():
+            self.display.show(f"  Failed: {name} ({error})")
+
 class ListCharsCommand(GameCommand):
+    def _parse_args(self, args: list) -> Dict[str, Any]:
+        return {"page": args[0] if args else "1"}
+
+    def _validate(self, parsed_args: dict) -> Optional[str]:
+        if not parsed_args["page"].isdigit() or int(parsed_args["page"]) < 1:
+            return "Usage: ls [page]"
+        return None
+
     def _do_execute(self, parsed_args: dict):
         if not self.engine.characters:
             self.display.show("No characters")
             return
         
-        self.display.show("= Available Characters =")
+        pages = page_count(self.engine.characters)
+        page = min(int(parsed_args["page"]), pages)
+        self.display.show(f"= Available Characters (page {page}/{pages}) =")
         
-        for c in self.engine.characters:
+        for c in page_of(self.engine.characters, page):
             self.display.show(Presenter.char_row(c))
             
             if c.items:
@@ -186,7 +190,7 @@ class ListCharsCommand(GameCommand):
 class AddItemCommand(GameCommand):
     def _do_execute(self, parsed_args: dict):
         char_name = self.display.prompt("Character Name to equip item: ")
-        char: Optional[Character] = next((c for c in self.engine.characters if c.name == char_name), None)
+        char: Optional[Character] = find_by_name(self.engine.characters, char_name)
         if not char:
             return self.display.show("Character not found")
 
@@ -205,28 +209,18 @@ class AddItemCommand(GameCommand):
 class AddAbilityCommand(GameCommand):
     def __init__(self, engine: GameEngine, display: IDisplay):
         super().__init__(engine, display)
-        self.map = {
-            "fireball": lambda: abilities.Fireball(30),
-            "heal": lambda: abilities.Heal(20),
-            "shield": lambda: abilities.Shield(4, 2),
-            "freeze": lambda: abilities.Freeze(1),
-            "doom": lambda: abilities.Doom(3),
-            "storm": lambda: abilities.Thunderstorm(5, 15),
-            "brainsap": lambda: abilities.BrainSap(60, 5),
-            "darkblast": lambda: abilities.DarkBlast(80, 3),
-            "blackhole": lambda: abilities.BlackHole(50, 4)
-        }
+        self.map = registry.BY_TAG
         
     def _do_execute(self, parsed_args: dict):
         char_name = self.display.prompt("Character Name: ")
-        char: Optional[Character] = next((c for c in self.engine.characters if c.name == char_name), None)
+        char: Optional[Character] = find_by_name(self.engine.characters, char_name)
         if not char:
             return self.display.show("Character not found")
         
-        ab_name = self.display.prompt(f"Ability ({', '.join(self.map.keys())}): ").lower()
+        ab_name = self.display.prompt(f"Ability ({', '.join(s.tag for s in registry.SPECS)}): ").lower()
         
         if ab_name in self.map:
-            new_ability = self.map[ab_name]()
+            new_ability = self.map[ab_name].create()
             char.abilities.append(new_ability)
             self.display.show(f"Added {type(new_ability).__name__} to {char.name}")
         else:
@@ -276,8 +270,7 @@ class UseAbilityCommand(GameCommand):
         
         if "Elemental Skill" in skill_name:
             bonus_armor = int(char.base_armor * 0.5) 
-            char._temp_armor += bonus_armor
-            char._temp_armor_turns = 2
+            char.statuses.shield(char, bonus_armor, 2)
             self.display.show(f"Effect: {char.name} forms a shield, gaining **+{bonus_armor} Armor** for 2 turns!")
         
         elif "Elemental Burst" in skill_name:
@@ -350,17 +343,14 @@ class StartGameCommand(GameCommand):
 class BattleCommand(GameCommand):
     def __init__(self, engine: GameEngine, display: IDisplay):
         super().__init__(engine, display)
-        self.strategies: Dict[str, IGroupingStrategy] = {
-            "split": SplitInTwoStrategy(),
-            "1vsall": OneVsAllStrategy(),
-            "2vs2": TwoVsTwoStrategy(),
-            "5vs5": FiveVsFiveStrategy(),
-            "vsboss": OneVsBossStrategy(),
-        }
+        self.strategies: Dict[str, IGroupingStrategy] = make_strategies()
 
     def _parse_args(self, args: list) -> dict:
         if args and args[0].lower() in self.strategies:
-            return {"strategy_name": args[0].lower()}
+            options = [a.lower() for a in args[1:]]
+            seeds = [int(a) for a in options if a.isdigit()]
+            return {"strategy_name": args[0].lower(), "initiative": "speed" in options,
+                    "seed": seeds[0] if seeds else None}
         
         self.display.show("\n-- Select Battle Mode --")
         modes_list = list(self.strategies.keys())
@@ -374,7 +364,7 @@ class BattleCommand(GameCommand):
                 idx = int(choice) - 1
                 if 0 <= idx < len(modes_list):
                     selected_mode = modes_list[idx]
-                    return {"strategy_name": selected_mode}
+                    return {"strategy_name": selected_mode, "initiative": False, "seed": None}
             
             self.display.show("Invalid choice. Please enter a valid number")
 
@@ -400,24 +390,30 @@ class BattleCommand(GameCommand):
              self.strategies["vsboss"] = OneVsBossStrategy()
 
         strategy = self.strategies[strategy_name]
+        seed = params.get("seed")
+        if seed is None: seed = new_seed()
 
         for char in self.engine.characters:
             char.health = char.base_hp + sum(i.bonus_hp for i in char.items) 
             char._temp_armor = 0
             char._frozen_turns = 0
             char._doom_counter = None
+            char._statuses = None
             char._current_turn_counter = 0
 
         if strategy_name not in ["2vs2", "5vs5", "vsboss"] and len(self.engine.characters) < 4:
             needed = 4 - len(self.engine.characters)
             if needed > 0:
-                random_team = CharGenerator.generate_team(needed)
+                random_team = CharGenerator.generate_team(needed, rng_stream(seed, "roster"))
                 for c in random_team:
                     c.name = f"Rand_{c.name}"
                     self.engine.add_character(c)
                 self.display.show(f"Added {needed} random fighters to meet the minimum requirement")
         
         all_participants = self.engine.characters
+        max_turns = 50 if strategy_name == "vsboss" else 30
+        replay = Replay.record(seed, strategy_name, all_participants, params.get("initiative", False), max_turns)
+        self.engine.start_battle(initiative=replay.initiative, seed=seed)
 
         team1, team2 = strategy.group(all_participants)
         
@@ -430,15 +426,17 @@ class BattleCommand(GameCommand):
             self.display.show(f"Team 2: {[c.name for c in team2]}")
 
         turn = 1
-        max_turns = 50 if strategy_name == "vsboss" else 30
 
         while any(c.is_alive() for c in team1) and any(c.is_alive() for c in team2):
             self.display.show(f"\n-- Turn {turn} --")
             
-            logs = self.engine.battle_simulation_step(all_participants, strategy)
+            events = self.engine.events
+            events.clear()
+            if not self.engine.resolve_turn(all_participants, strategy, events):
+                self.display.show(f" > {GROUPING_FAILED}")
             
-            for log in logs:
-                self.display.show(f" > {log}")
+            for line in render_lines(events, " > "):
+                self.display.show(line)
             
             if not any(c.is_alive() for c in team1) or not any(c.is_alive() for c in team2):
                 break 
@@ -449,6 +447,13 @@ class BattleCommand(GameCommand):
                 break
         
         self.display.show("\n= BATTLE END =")
+
+        replay.result = battle_outcome(team1, team2, min(turn, max_turns))
+        try:
+            replay.save(LAST_REPLAY_FILE)
+            self.display.show(f"Replay saved (seed {seed}). Use 'replay' to re-run it")
+        except OSError as e:
+            self.display.show(f"Could not save replay: {e}")
         
         winner_team = []
         if any(c.is_alive() for c in team1): winner_team = team1
@@ -464,6 +469,127 @@ class BattleCommand(GameCommand):
             if c.name != "Evil Boss": 
                  self.display.show(Presenter.char_row(c))
 
+class OddsCommand(BattleCommand):
+    def _parse_args(self, args: list) -> dict:
+        params = super()._parse_args(args[:1])
+        try:
+            params["tolerance"] = float(args[1]) if len(args) > 1 else 0.05
+        except ValueError:
+            self.display.show("Tolerance must be a number. Defaulting to 0.05")
+            params["tolerance"] = 0.05
+        return params
+
+    def _validate(self, params: dict) -> Optional[str]:
+        if not 0 < params["tolerance"] < 1:
+            return "Tolerance must be between 0 and 1"
+        return super()._validate(params)
+
+    def _do_execute(self, params: dict):
+        strategy_name = params["strategy_name"]
+        max_turns = 50 if strategy_name == "vsboss" else 30
+
+        self.display.show(f"Estimating {strategy_name.upper()} odds (tolerance ±{params['tolerance'] / 2:.1%})..")
+        report = estimate_odds(self.engine.characters, self.strategies[strategy_name],
+                               tolerance=params["tolerance"], max_turns=max_turns)
+
+        self.display.show(f"\n= ODDS ({report.trials} simulated battles) =")
+        self.display.show(f"Team 1 wins: {report.win_prob:.1%} (95% CI {report.win_ci[0]:.1%} - {report.win_ci[1]:.1%})")
+        self.display.show(f"Draws: {report.draw_rate:.1%} (95% CI {report.draw_ci[0]:.1%} - {report.draw_ci[1]:.1%})")
+        self.display.show(f"Turns to finish: {report.mean_turns:.1f} (95% CI {report.turns_ci[0]:.1f} - {report.turns_ci[1]:.1f})")
+        if not report.converged:
+            self.display.show("Trial limit reached before the interval narrowed to the requested tolerance")
+
+class TournamentCommand(GameCommand):
+    def _parse_args(self, args: list) -> dict:
+        return {
+            "strategy_name": args[0].lower() if args else "2vs2",
+            "battles": int(args[1]) if len(args) > 1 and args[1].isdigit() else 10,
+            "max_matchups": int(args[2]) if len(args) > 2 and args[2].isdigit() else TOURNAMENT_MAX_MATCHUPS,
+        }
+
+    def _validate(self, params: dict) -> Optional[str]:
+        if params["strategy_name"] not in TEAM_SIZES_BY_MODE:
+            return f"Tournament supports: {', '.join(TEAM_SIZES_BY_MODE)}"
+        needed = 2 * TEAM_SIZES_BY_MODE[params["strategy_name"]]
+        if len(self.engine.characters) < needed:
+            return f"Not enough characters for a {params['strategy_name'].upper()} tournament. Requires {needed} loaded characters"
+        if params["max_matchups"] < 1:
+            return "Matchup cap must be at least 1"
+        return None
+
+    def _do_execute(self, params: dict):
+        strategy_name = params["strategy_name"]
+        strategy = make_strategies()[strategy_name]
+
+        team_size = TEAM_SIZES_BY_MODE[strategy_name]
+        total = pairing_count(len(self.engine.characters), team_size)
+        self.display.show(f"Running {strategy_name.upper()} tournament ({params['battles']} battles per matchup)..")
+        if total > params["max_matchups"]:
+            self.display.show(f"{total:,} possible matchups; sampling {params['max_matchups']:,} of them")
+        result = run_tournament(self.engine.characters, strategy, team_size=team_size,
+                                battles_per_matchup=params["battles"], max_matchups=params["max_matchups"])
+
+        self.display.show(f"\n= TOURNAMENT RESULTS ({result.matchups} matchups, {result.battles} battles) =")
+        for place, (name, rate) in enumerate(result.ranking(), 1):
+            self.display.show(f"{place:>3}. {name}: {rate:.1%} wins")
+
+class ReplayCommand(GameCommand):
+    def _parse_args(self, args: list) -> dict:
+        return {"path": Path(args[0]) if args else LAST_REPLAY_FILE}
+
+    def _validate(self, params: dict) -> Optional[str]:
+        if not params["path"].exists():
+            return f"Replay file not found: {params['path']}"
+        return None
+
+    def _do_execute(self, params: dict):
+        replay = Replay.load(params["path"])
+        strategies = make_strategies()
+        if replay.strategy not in strategies:
+            return self.display.show(f"Unknown strategy in replay: {replay.strategy}")
+
+        started = time.perf_counter()
+        result = replay.run(strategies[replay.strategy])
+        elapsed = time.perf_counter() - started
+
+        outcome = {TEAM_1: "Team 1 wins", TEAM_2: "Team 2 wins"}.get(result.winner, "Draw")
+        self.display.show(f"Replayed {replay.strategy.upper()} battle (seed {replay.seed}) in {elapsed * 1000:.1f} ms")
+        self.display.show(f"{outcome} after {result.turns} turns. Survivors HP: {list(result.survivors_hp)}")
+        if replay.result is not None:
+            self.display.show("Matches the recorded battle" if result == replay.result
+                              else "WARNING: result differs from the recorded battle")
+
+class CacheCommand(GameCommand):
+    USAGE = "Usage: cache stats | cache prune [max MiB] | cache clear-missing [name]"
+
+    def _parse_args(self, args: list) -> dict:
+        name = " ".join(args[1:]).replace("_", " ")
+        return {"action": args[0].lower() if args else "", "name": name or None}
+
+    def _validate(self, params: dict) -> Optional[str]:
+        if params["action"] not in ("stats", "prune", "clear-missing"):
+            return self.USAGE
+        if params["action"] == "prune" and params["name"] is not None and not params["name"].isdigit():
+            return self.USAGE
+        return None
+
+    def _do_execute(self, params: dict):
+        action = params["action"]
+        if action == "stats":
+            stats = image_loader.image_cache_stats()
+            self.display.show(f"Images: {stats['files']} files, {stats['bytes'] / 2**20:.1f} MiB "
+                              f"of {stats['max_bytes'] / 2**20:.0f} MiB; {stats['missing']} failed lookups remembered")
+            api = api_cache.stats()
+            self.display.show(f"API responses: {api['entries']} cached, {api['bytes'] / 2**20:.1f} MiB")
+        elif action == "prune":
+            limit = None if params["name"] is None else int(params["name"]) * 2**20
+            result = image_loader.prune_image_cache(limit)
+            self.display.show(f"Removed {result['corrupt']} corrupt and {result['evicted']} least recently used images "
+                              f"({result['freed'] / 2**20:.1f} MiB freed)")
+        else:
+            dropped = image_loader.clear_missing(params["name"])
+            self.display.show(f"Forgot {dropped} failed image lookups; they will be searched again")
+
 class TextAddCommand(Command):
     def __init__(self, doc: Document, display: IDisplay):
         self.doc, self.display = doc, display
@@ -484,20 +610,12 @@ class TextPrintCommand(Command):
 
 class CreateCharCommand(GameCommand):
     
-    def _get_ability_map(self):
-        return {
-            "1": ("Fireball", lambda dmg: abilities.Fireball(dmg), True, "damage"),
-            "2": ("Heal", lambda heal_val: abilities.Heal(heal_val), True, "heal amount"),
-            "3": ("Shield", lambda val: abilities.Shield(val, 2), True, "shield amount"), 
-            "4": ("Freeze", lambda: abilities.Freeze(1), False, None),
-            "5": ("Doom", lambda: abilities.Doom(3), False, None),
-            "6": ("Thunderstorm", lambda dmg, turns: abilities.Thunderstorm(dmg, turns), True, "damage"),
-            "7": ("BlackHole", lambda dmg, duration: abilities.BlackHole(dmg, duration), True, "damage")
-        }
+    def _get_ability_map(self) -> Dict[str, registry.AbilitySpec]:
+        return {str(i): spec for i, spec in enumerate(registry.SPECS, 1)}
 
     def _do_execute(self, parsed_args: dict):
         name = self.display.prompt("Name: ")
-        if any(c.name == name for c in self.engine.characters):
+        if find_by_name(self.engine.characters, name) is not None:
             return self.display.show(f"Character with name '{name}' already exists")
         
         try:
@@ -537,9 +655,10 @@ class CreateCharCommand(GameCommand):
         while True:
             self.display.show("\n- Choose Ability to Add -")
             
-            for key, (ab_name, _, needs_param, param_desc) in available_abilities.items():
-                param_info = f" (Needs {param_desc})" if needs_param else ""
-                self.display.show(f"[{key}] {ab_name}{param_info}")
+            for key, spec in available_abilities.items():
+                param = spec.prompt_param
+                param_info = f" (Needs {param.prompt})" if param else ""
+                self.display.show(f"[{key}] {spec.label}{param_info}")
                 
             self.display.show("[0] Finish selecting abilities")
 
@@ -553,19 +672,15 @@ class CreateCharCommand(GameCommand):
                 break
             
             if choice_str in available_abilities:
-                ab_name, ab_factory, needs_param, param_desc = available_abilities[choice_str]
+                spec = available_abilities[choice_str]
+                ab_name, param = spec.label, spec.prompt_param
                 
-                if needs_param:
+                if param:
                     try:
-                        param_str = self.display.prompt(f"Enter value for {param_desc} of {ab_name} (default 0): ").strip()
-                        param_value = int(param_str) if param_str else 0 
+                        param_str = self.display.prompt(f"Enter value for {param.prompt} of {ab_name} (default {param.default}): ").strip()
+                        param_value = int(param_str) if param_str else param.default
                         
-                        if ab_name == "Thunderstorm":
-                            new_ability = ab_factory(param_value, 5) 
-                        elif ab_name == "BlackHole":
-                            new_ability = ab_factory(param_value, 4)
-                        else:
-                            new_ability = ab_factory(param_value)
+                        new_ability = spec.create(**{param.name: param_value})
                         
                         new_char.abilities.append(new_ability)
                         self.display.show(f"Added ability: {ab_name} (Value: {param_value})")
@@ -575,7 +690,7 @@ class CreateCharCommand(GameCommand):
                         continue 
                 
                 else:
-                    new_ability = ab_factory()
+                    new_ability = spec.create()
                     new_char.abilities.append(new_ability)
                     self.display.show(f"Added ability: {ab_name}")
                     
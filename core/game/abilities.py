@@ -1,112 +1,126 @@
 from abc import ABC, abstractmethod
 import random
 
+from . import events as ev
+from . import status
+
 class Ability(ABC):
     @abstractmethod
-    def use(self, user, target) -> str:
+    def apply(self, user, target, rng=random, events=None, statuses=None):
+        """Resolves the ability, emitting its outcome into `events` when a buffer is given.
+        Timed effects go to the battle's `statuses` timeline, or the target's own outside battle."""
         raise NotImplementedError
 
+    def use(self, user, target) -> str:
+        events = ev.EventBuffer()
+        self.apply(user, target, random, events)
+        return ev.render_message(events.records[0])
+
 class Fireball(Ability):
     def __init__(self, damage: int):
         self.damage = int(damage)
-    def use(self, user, target) -> str:
+    def apply(self, user, target, rng=random, events=None, statuses=None):
         actual = max(0, self.damage - target.armor)
         target.health -= actual
-        return f"{user.name} casts Fireball at {target.name} for {actual} dmg"
+        if events is not None: events.emit(ev.FIREBALL, user, target, actual)
 
 class Heal(Ability):
     def __init__(self, amount: int):
         self.amount = int(amount)
-    def use(self, user, target) -> str:
+    def apply(self, user, target, rng=random, events=None, statuses=None):
         target.health += self.amount
-        return f"{user.name} heals {target.name} for {self.amount} HP"
+        if events is not None: events.emit(ev.HEAL, user, target, self.amount)
 
 class Shield(Ability):
     def __init__(self, bonus: int, duration: int = 1):
         self.bonus = int(bonus)
         self.duration = int(duration)
-    def use(self, user, target) -> str:
-        if not hasattr(target, "_temp_armor"): target._temp_armor = 0
-        target._temp_armor += self.bonus
-        target._temp_armor_turns = max(getattr(target, "_temp_armor_turns", 0), self.duration)
-        return f"{user.name} shields {target.name} (+{self.bonus} armor) for {self.duration} turns"
+    def apply(self, user, target, rng=random, events=None, statuses=None):
+        if statuses is None: statuses = target.statuses
+        statuses.shield(target, self.bonus, self.duration)
+        if events is not None: events.emit(ev.SHIELD, user, target, self.bonus, extra=self.duration)
 
 class Freeze(Ability):
     def __init__(self, duration: int = 1):
         self.duration = int(duration)
-    def use(self, user, target) -> str:
-        target._frozen_turns = max(getattr(target, "_frozen_turns", 0), self.duration)
-        return f"{user.name} freezes {target.name} for {self.duration} turns!"
+    def apply(self, user, target, rng=random, events=None, statuses=None):
+        status.freeze(target, self.duration)
+        if events is not None: events.emit(ev.FREEZE, user, target, self.duration)
 
 class Doom(Ability):
     def __init__(self, delay: int = 3):
         self.delay = int(delay)
-    def use(self, user, target) -> str:
-        target._doom_counter = self.delay
-        return f"{user.name} casts Doom on {target.name}. Death in {self.delay} turns.."
+    def apply(self, user, target, rng=random, events=None, statuses=None):
+        if statuses is None: statuses = target.statuses
+        statuses.doom(target, self.delay)
+        if events is not None: events.emit(ev.DOOM, user, target, self.delay)
 
 class Thunderstorm(Ability):
     def __init__(self, dmg_min=20, dmg_max=40, hits_min=1, hits_max=4):
         self.dmg_min, self.dmg_max = dmg_min, dmg_max
         self.hits_min, self.hits_max = hits_min, hits_max
-    def use(self, user, target) -> str:
-        hits = random.randint(self.hits_min, self.hits_max)
+    def apply(self, user, target, rng=random, events=None, statuses=None):
+        hits = rng.randint(self.hits_min, self.hits_max)
+        armor = target.armor
         total_dmg = 0
-        logs = []
+        dealt = []
         for _ in range(hits):
-            raw = random.randint(self.dmg_min, self.dmg_max)
-            actual = max(0, raw - target.armor)
+            raw = rng.randint(self.dmg_min, self.dmg_max)
+            actual = max(0, raw - armor)
             target.health -= actual
             total_dmg += actual
-            logs.append(str(actual))
-        return f"{user.name} summons Thunderstorm! Hits: {hits} ({', '.join(logs)}). Total: {total_dmg} dmg"
+            dealt.append(actual)
+        if events is not None: events.emit(ev.THUNDERSTORM, user, target, total_dmg, extra=dealt)
 
 class BrainSap(Ability):
     def __init__(self, damage=60, cooldown=5):
         self.damage = damage
         self.cooldown = cooldown
-    def use(self, user, target) -> str:
-        last_turn = getattr(user, "_brain_sap_last", -999)
-        current_turn = getattr(user, "_current_turn_counter", 0)
+    def apply(self, user, target, rng=random, events=None, statuses=None):
+        last_turn = user._brain_sap_last
+        current_turn = user._current_turn_counter
         
         if (current_turn - last_turn) < self.cooldown:
             rem = self.cooldown - (current_turn - last_turn)
-            return f"{user.name} fails BrainSap (Cooldown: {rem} turns)"
+            if events is not None: events.emit(ev.BRAIN_SAP_COOLDOWN, user, target, rem)
+            return
         
         actual = max(0, self.damage - target.armor)
         target.health -= actual
         user._brain_sap_last = current_turn
-        return f"{user.name} drains mind of {target.name} for {actual} dmg"
+        if events is not None: events.emit(ev.BRAIN_SAP, user, target, actual)
 
 class DarkBlast(Ability):
     def __init__(self, damage=80, min_turn=3):
         self.damage = damage
         self.min_turn = int(min_turn)
     
-    def use(self, user, target) -> str:
-        current_turn = getattr(user, "_current_turn_counter", 0) + 1
+    def apply(self, user, target, rng=random, events=None, statuses=None):
+        current_turn = user._current_turn_counter + 1
         
         if current_turn < self.min_turn:
-            return f"{user.name} fails DarkBlast (Available from turn {self.min_turn})"
+            if events is not None: events.emit(ev.DARK_BLAST_LOCKED, user, target, self.min_turn)
+            return
         
         actual = max(0, self.damage - target.armor)
         target.health -= actual
-        return f"{user.name} blasts {target.name} with Darkness for {actual} dmg!"
+        if events is not None: events.emit(ev.DARK_BLAST, user, target, actual)
 
 class BlackHole(Ability):
     def __init__(self, damage=50, min_turn=4):
         self.name = "Black Hole"
         self.damage = damage
+        self.min_turn = int(min_turn)
         self.description = "Creates a singularity.." 
     
-    def use(self, user, target) -> str:
-        current_turn = getattr(user, "_current_turn_counter", 0) + 1
+    def apply(self, user, target, rng=random, events=None, statuses=None):
+        current_turn = user._current_turn_counter + 1
         
         if current_turn < self.min_turn:
-            return f"{user.name} fails BlackHole (Available from turn {self.min_turn})"
+            if events is not None: events.emit(ev.BLACK_HOLE_LOCKED, user, target, self.min_turn)
+            return
         
         actual = max(0, self.damage - target.armor)
         target.health -= actual
-        target._frozen_turns += 1
-        
-        return f"{user.name} summons BlackHole, dealing {actual} dmg and Freezing {target.name} for 1 turn!"
\ No newline at end of file
+        status.freeze(target, 1, stack=True)
+        if events is not None: events.emit(ev.BLACK_HOLE, user, target, actual)
@@ -0,0 +1,57 @@
+from typing import List, Optional
+
+from .models import Character
+
+class CombatantState:
+    """Per-battle combat state with exactly the fields the rules touch.
+
+    Built from a Character at battle start (full HP, clear statuses) and optionally written
+    back at the end. Attribute names match Character so abilities work on either.
+    """
+    __slots__ = ("source", "name", "start_health", "health", "attack", "base_armor",
+                 "critical_chance", "critical_multiplier", "abilities",
+                 "_temp_armor", "_frozen_turns", "_doom_counter",
+                 "_brain_sap_last", "_current_turn_counter")
+
+    def __init__(self, source: Character):
+        self.source = source
+        self.name = source.name
+        self.start_health = source.base_hp + sum(i.bonus_hp for i in source.items)
+        self.attack = source.attack
+        self.base_armor = source.armor - source._temp_armor
+        self.critical_chance = source.critical_chance
+        self.critical_multiplier = source.critical_multiplier
+        self.abilities = source.abilities
+        self.reset()
+
+    def reset(self):
+        """Back to the state at battle start, so one set of states can play many battles."""
+        self.health = self.start_health
+        self._temp_armor = 0
+        self._frozen_turns = 0
+        self._doom_counter: Optional[int] = None
+        self._brain_sap_last = -999
+        self._current_turn_counter = 0
+
+    @property
+    def armor(self) -> int:
+        return self.base_armor + self._temp_armor
+
+    def is_alive(self) -> bool:
+        return self.health > 0
+
+    take_damage = Character.take_damage
+    strike = Character.strike
+    tick_frozen = Character.tick_frozen
+
+    def write_back(self):
+        c = self.source
+        c.health = self.health
+        c._temp_armor = self._temp_armor
+        c._frozen_turns = self._frozen_turns
+        c._doom_counter = self._doom_counter
+        c._brain_sap_last = self._brain_sap_last
+        c._current_turn_counter = self._current_turn_counter
+
+def build_sides(team1: List[Character], team2: List[Character]) -> List[List[CombatantState]]:
+    return [[CombatantState(c) for c in team1], [CombatantState(c) for c in team2]]
@@ -2,62 +2,102 @@ import random
 from typing import List, Generator, Optional, Tuple
 
 from infra.api_importer.entities import Character, Skill
+from infra.catalog import find_by_name
+from infra.autosave import AutosaveWorker
 from core.game.grouping import IGroupingStrategy
+from core.game.teams import TeamIndex
+from core.game.scheduler import InitiativeScheduler
+from core.game.rng import Seed, rng_stream
+from core.game.status import StatusTimeline
+from core.game import events as ev
+
+GROUPING_FAILED = "Grouping failed: Not enough characters for this strategy"
+SKILL_CHANCE = 0.3
+
+def play_turn(order: list, teams: TeamIndex, statuses: StatusTimeline,
+              rng=random, events: Optional[ev.EventBuffer] = None):
+    """Runs every actor in `order` once (stopping when a side has no enemies left), then
+    expires the status effects due this turn."""
+    for actor in order:
+        if not actor.is_alive(): continue
+
+        alive_enemies = teams.enemies_of(actor)
+        if not alive_enemies:
+             break
+
+        if actor._frozen_turns > 0:
+             if events is not None: events.emit(ev.FROZEN_SKIP, actor)
+             actor.tick_frozen(events)
+             statuses.acted(actor)
+             continue
+
+        if actor.abilities and rng.random() < SKILL_CHANCE: 
+             target = alive_enemies.choice(rng)
+             ab = rng.choice(actor.abilities)
+             ab.apply(actor, target, rng, events, statuses)
+        else:
+             target = alive_enemies.choice(rng)
+             actor.strike(target, rng, events)
+
+        teams.refresh(target)
+        statuses.acted(actor)
+
+    for doomed in statuses.end_turn(events):
+        teams.refresh(doomed)
 
 class GameEngine:
     def __init__(self):
         self.characters: List[Character] = []
+        self.events = ev.EventBuffer()
+        self.rng = random
+        self.initiative: Optional[InitiativeScheduler] = None
+        self.statuses = StatusTimeline()
+        # Told how many events each turn produced so it can save after enough of them.
+        self.autosave: Optional[AutosaveWorker] = None
+
+    def start_battle(self, initiative: bool = False, seed: Optional[Seed] = None):
+        """Resets per-battle state. A `seed` makes every roll of the battle reproducible;
+        with `initiative` turn order follows speed instead of a shuffle."""
+        self.rng = random if seed is None else rng_stream(seed)
+        self.initiative = InitiativeScheduler(self.rng) if initiative else None
+        self.statuses = StatusTimeline()
 
     def add_character(self, char: Character):
         self.characters.append(char)
 
     def get_character_by_name(self, name: str) -> Optional[Character]:
-        return next((c for c in self.characters if c.name.lower() == name.lower()), None)
+        return find_by_name(self.characters, name, ignore_case=True)
+
+    def resolve_turn(self,
+                     characters: List[Character],
+                     grouping_strategy: IGroupingStrategy,
+                     events: Optional[ev.EventBuffer] = None) -> bool:
+        """Plays one turn; outcomes go to `events` only when a buffer is given. False if grouping failed."""
+        group1, group2 = grouping_strategy.group(characters)
+
+        if not group1 or not group2:
+             return False
+
+        all_participants = group1 + group2
+        if self.initiative is not None:
+             order = self.initiative.turn(all_participants)
+        else:
+             order = all_participants
+             self.rng.shuffle(order)
+
+        play_turn(order, TeamIndex(group1, group2), self.statuses, self.rng, events)
+        if self.autosave is not None:
+            self.autosave.notify(len(events) if events is not None else 1)
+        return True
 
     def battle_simulation_step(self, 
                                characters: List[Character], 
                                grouping_strategy: IGroupingStrategy) -> Generator[str, None, None]:
-        
-        group1, group2 = grouping_strategy.group(characters)
+        events = self.events
+        events.clear()
 
-        if not group1 or not group2:
-             yield "Grouping failed: Not enough characters for this strategy"
+        if not self.resolve_turn(characters, grouping_strategy, events):
+             yield GROUPING_FAILED
              return
 
-        all_participants = group1 + group2
-        random.shuffle(all_participants)
-
-        for actor in all_participants:
-            if not actor.is_alive(): continue
-            
-            enemies = group2 if actor in group1 else group1
-            alive_enemies = [e for e in enemies if e.is_alive()]
-            
-            if not alive_enemies:
-                 return
-
-            if actor._frozen_turns > 0:
-                 yield f" > ❄️ {actor.name} is frozen and skips turn!"
-                 for log in actor.end_turn_update():
-                      yield f"[STATUS] {log}"
-                 continue
-
-            used_actions = 0
-            max_uses = 1
-
-            if actor.abilities and random.random() < 0.3: 
-                 target = random.choice(alive_enemies) 
-                 ab = random.choice(actor.abilities)
-                 
-                 full_log_msg = ab.use(actor, target)
-                 yield f" > (Skill) {full_log_msg}"
-                 used_actions += 1
-            
-            if used_actions == 0 and alive_enemies:
-                 target = random.choice(alive_enemies)
-                 attack_log_msg = actor.attack_target(target)
-                 yield f" > (Attack) {attack_log_msg}"
-            
-            logs = actor.end_turn_update()
-            for log in logs:
-                 yield f"[STATUS] {log}"
\ No newline at end of file
+        yield from ev.render_lines(events)
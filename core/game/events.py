@@ -0,0 +1,105 @@
+from typing import Any, Iterator, List, Tuple
+
+# Event record: (kind, actor, target, amount, crit, extra)
+BattleEvent = Tuple[int, Any, Any, int, bool, Any]
+
+ATTACK = 1
+FIREBALL = 2
+HEAL = 3
+SHIELD = 4
+FREEZE = 5
+DOOM = 6
+THUNDERSTORM = 7
+BRAIN_SAP = 8
+BRAIN_SAP_COOLDOWN = 9
+DARK_BLAST = 10
+DARK_BLAST_LOCKED = 11
+BLACK_HOLE = 12
+BLACK_HOLE_LOCKED = 13
+SKILL = 14
+TEXT = 15
+FROZEN_SKIP = 20
+STATUS_FROZEN = 21
+STATUS_THAWED = 22
+STATUS_DOOMED = 23
+
+STATUS_KINDS = frozenset((STATUS_FROZEN, STATUS_THAWED, STATUS_DOOMED))
+
+class EventBuffer:
+    """Reusable sink for battle events; nothing is formatted until a line is rendered."""
+    __slots__ = ("records",)
+
+    def __init__(self):
+        self.records: List[BattleEvent] = []
+
+    def emit(self, kind: int, actor: Any, target: Any = None, amount: int = 0,
+             crit: bool = False, extra: Any = None):
+        self.records.append((kind, actor, target, amount, crit, extra))
+
+    def clear(self):
+        self.records.clear()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[BattleEvent]:
+        return iter(self.records)
+
+def render_message(event: BattleEvent) -> str:
+    kind, actor, target, amount, crit, extra = event
+    u = actor.name
+    t = target.name if target is not None else ""
+
+    if kind == ATTACK:
+        crit_text = " (CRIT!)" if crit else ""
+        return f"{u} hits {t}{crit_text} for {amount} damage!"
+    if kind == FIREBALL:
+        return f"{u} casts Fireball at {t} for {amount} dmg"
+    if kind == HEAL:
+        return f"{u} heals {t} for {amount} HP"
+    if kind == SHIELD:
+        return f"{u} shields {t} (+{amount} armor) for {extra} turns"
+    if kind == FREEZE:
+        return f"{u} freezes {t} for {amount} turns!"
+    if kind == DOOM:
+        return f"{u} casts Doom on {t}. Death in {amount} turns.."
+    if kind == THUNDERSTORM:
+        return f"{u} summons Thunderstorm! Hits: {len(extra)} ({', '.join(str(d) for d in extra)}). Total: {amount} dmg"
+    if kind == BRAIN_SAP:
+        return f"{u} drains mind of {t} for {amount} dmg"
+    if kind == BRAIN_SAP_COOLDOWN:
+        return f"{u} fails BrainSap (Cooldown: {amount} turns)"
+    if kind == DARK_BLAST:
+        return f"{u} blasts {t} with Darkness for {amount} dmg!"
+    if kind == DARK_BLAST_LOCKED:
+        return f"{u} fails DarkBlast (Available from turn {amount})"
+    if kind == BLACK_HOLE:
+        return f"{u} summons BlackHole, dealing {amount} dmg and Freezing {t} for 1 turn!"
+    if kind == BLACK_HOLE_LOCKED:
+        return f"{u} fails BlackHole (Available from turn {amount})"
+    if kind == SKILL:
+        return f"{u} casts '{extra}' on {t}! (Dmg: {amount})"
+    if kind == FROZEN_SKIP:
+        return f"{u} is frozen and skips turn!"
+    if kind == STATUS_FROZEN:
+        return f"{u} is frozen"
+    if kind == STATUS_THAWED:
+        return f"{u} thawed out"
+    if kind == STATUS_DOOMED:
+        return f"☠️ DOOM claims {u}!"
+    return str(extra)
+
+def render_line(event: BattleEvent) -> str:
+    """Engine log line for an event, as yielded by GameEngine.battle_simulation_step."""
+    kind = event[0]
+    if kind in STATUS_KINDS:
+        return f"[STATUS] {render_message(event)}"
+    if kind == FROZEN_SKIP:
+        return f" > ❄️ {render_message(event)}"
+    if kind == ATTACK:
+        return f" > (Attack) {render_message(event)}"
+    return f" > (Skill) {render_message(event)}"
+
+def render_lines(events, prefix: str = "") -> Iterator[str]:
+    for event in events:
+        yield prefix + render_line(event)
@@ -1,19 +1,31 @@
+import os
+import time
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Optional, List, Any
-from infra.persistence import PersistenceService 
+from infra.persistence import PersistenceService, DATA_DIR
+from infra.catalog import page_count, page_of
+from infra.journal import HistoryJournal
 from core.game.models import Character 
 
 if TYPE_CHECKING:
     from infra.io import IDisplay
     from core.game.engine import GameEngine
 
+HISTORY_DIR = DATA_DIR / "history"
+HISTORY_PAGE = 20
+
 class GameSession:
-    def __init__(self, engine: 'GameEngine', display: 'IDisplay'):
+    def __init__(self, engine: 'GameEngine', display: 'IDisplay', history: Optional[HistoryJournal] = None):
         self.engine = engine
         self.display = display
         self.active_char: Optional[Character] = None
         
-        self.history: List[str] = []
+        # Saves point into the journal, so every session logs to a file of its own.
+        self._owns_history = history is None
+        if history is None:
+            history = HistoryJournal(HISTORY_DIR / f"session-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{id(self):x}")
+        self.history = history
+        self.saved = False
         self.target_char: Optional[Character] = None 
         
         self.current_state: GameState = CharacterSelectionState(self)
@@ -48,6 +60,10 @@ class GameSession:
                 self.display.show("Game interrupted")
                 self.is_running = False
                 
+        if self._owns_history and not self.saved:
+            self.history.delete()
+        else:
+            self.history.flush()
         self.display.show("Game session ended")
 
 class GameState(ABC):
@@ -102,7 +118,7 @@ class PlayingState(GameState):
         self.session.display.show(f"\n-- GAME TURN --")
         self.session.display.show(f"You: **{c.name}** (HP: {c.health}/{c.base_hp} | ATK: {c.attack} | ARM: {c.armor})")
         self.session.display.show(f"Enemy: **{t.name}** (HP: {t.health}/{t.base_hp} | ARM: {t.armor})")
-        self.session.display.show("Commands: attack, status, save, history, quit")
+        self.session.display.show("Commands: attack, status, save, history [page], quit")
 
     def handle_input(self, inp: str):
         parts = inp.split()
@@ -116,13 +132,17 @@ class PlayingState(GameState):
         elif cmd == 'save':
             all_chars = [self.session.active_char, self.session.target_char] + self.session.engine.characters
             if PersistenceService.save_game([c for c in all_chars if c is not None], self.session.history):
+                self.session.saved = True
                 self.session.display.show("Game state saved successfully!")
             else:
                  self.session.display.show("Error saving game state")
 
         elif cmd == 'history':
-            self.session.display.show("\n-- Battle History --")
-            for record in self.session.history:
+            history = self.session.history
+            pages = page_count(history, HISTORY_PAGE)
+            page = min(int(args[0]), pages) if args and args[0].isdigit() and int(args[0]) > 0 else pages
+            self.session.display.show(f"\n-- Battle History (page {page}/{pages}) --")
+            for record in page_of(history, page, HISTORY_PAGE):
                  self.session.display.show(f" > {record}")
             
         elif cmd == 'status':
@@ -1,6 +1,6 @@
 import random
 from .models import Character
-from . import abilities
+from . import registry
 
 class CharGenerator:
     NAMES = [
@@ -9,40 +9,36 @@ class CharGenerator:
         "Lurtz", "Gollum", "Frodo", "Sam"
     ]
 
-    ABILITY_POOL = [
-        lambda: abilities.Fireball(random.randint(20, 40)),
-        lambda: abilities.Heal(random.randint(15, 30)),
-        lambda: abilities.Shield(random.randint(3, 6), random.randint(1, 3)),
-        lambda: abilities.Freeze(random.randint(1, 2)),
-        lambda: abilities.Doom(random.randint(2, 4)),
-        lambda: abilities.Thunderstorm(5, 15, 1, 3),
-        lambda: abilities.BrainSap(50, 4),
-        lambda: abilities.DarkBlast(60, 2),
-        lambda: abilities.BlackHole(random.randint(40, 60), random.randint(3, 5)) 
-    ]
+    ABILITY_POOL = [spec.roll for spec in registry.SPECS]
 
     @staticmethod
-    def create_random_char() -> Character:
-        name = random.choice(CharGenerator.NAMES)
-        unique_name = f"{name}_{random.randint(10, 99)}"
+    def create_random_char(rng=random) -> Character:
+        name = rng.choice(CharGenerator.NAMES)
+        unique_name = f"{name}_{rng.randint(10, 99)}"
         
-        hp = random.randint(80, 150)
-        armor = random.randint(0, 8)
-        atk = random.randint(8, 18)
+        hp = rng.randint(80, 150)
+        armor = rng.randint(0, 8)
+        atk = rng.randint(8, 18)
         
-        char = Character(unique_name, hp, armor, atk)
+        char = Character(
+            id=unique_name.lower(),
+            name=unique_name,
+            game="custom",
+            level=1,
+            stats={"max_hp": hp, "health": hp, "attack": atk, "defense": armor}
+        )
         
         
         max_possible = len(CharGenerator.ABILITY_POOL)
-        num_abilities = random.randint(1, min(3, max_possible)) 
+        num_abilities = rng.randint(1, min(3, max_possible)) 
         
-        unique_ability_factories = random.sample(CharGenerator.ABILITY_POOL, num_abilities)
+        unique_ability_factories = rng.sample(CharGenerator.ABILITY_POOL, num_abilities)
         
         for ability_factory in unique_ability_factories:
-            char.abilities.append(ability_factory())
+            char.abilities.append(ability_factory(rng))
             
         return char
 
     @staticmethod
-    def generate_team(size: int = 4) -> list[Character]:
-        return [CharGenerator.create_random_char() for _ in range(size)]
\ No newline at end of file
+    def generate_team(size: int = 4, rng=random) -> list[Character]:
+        return [CharGenerator.create_random_char(rng) for _ in range(size)]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from .models import Character 
 
 class IGroupingStrategy(ABC):
@@ -20,4 +20,58 @@ class OneVsAllStrategy(IGroupingStrategy):
         if len(characters) < 3:
             return [], []
         
-        return [characters[0]], characters[1:]
\ No newline at end of file
+        return [characters[0]], characters[1:]
+
+class TwoVsTwoStrategy(IGroupingStrategy):
+    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
+        if len(characters) < 4: return [], []
+        return characters[:2], characters[2:4]
+
+class FiveVsFiveStrategy(IGroupingStrategy):
+    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
+        if len(characters) < 10: return [], []
+        return characters[:5], characters[5:10]
+
+class OneVsBossStrategy(IGroupingStrategy):
+    def __init__(self):
+        self.boss = Character(
+            id="boss_world_eater",
+            name="Evil Boss", 
+            game="custom",
+            level=99,
+            stats={
+                "max_hp": 250000,
+                "health": 250000,
+                "attack": 250, 
+                "defense": 100,
+                "crit_chance": 0.2,
+                "crit_multiplier": 2.0
+            }
+        )
+
+    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
+        return characters, [self.boss]
+
+class HalvesStrategy(IGroupingStrategy):
+    """BattleCommand's "split": first half against second half, however few characters there are."""
+    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
+        mid = len(characters) // 2
+        return characters[:mid], characters[mid:]
+
+class LastVsRestStrategy(IGroupingStrategy):
+    """BattleCommand's "1vsall": everyone else against the last character."""
+    def group(self, characters: List[Character]) -> Tuple[List[Character], List[Character]]:
+        if not characters: return [], []
+        return characters[:-1], [characters[-1]]
+
+def make_strategies() -> Dict[str, IGroupingStrategy]:
+    """The battle modes offered to players, by name."""
+    return {
+        "split": HalvesStrategy(),
+        "1vsall": LastVsRestStrategy(),
+        "2vs2": TwoVsTwoStrategy(),
+        "5vs5": FiveVsFiveStrategy(),
+        "vsboss": OneVsBossStrategy(),
+    }
+
+TEAM_SIZES_BY_MODE = {"2vs2": 2, "5vs5": 5}
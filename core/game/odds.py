@@ -0,0 +1,80 @@
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import List, Tuple
+
+from .models import Character
+from .grouping import IGroupingStrategy
+from .simulator import BattleSimulator, DRAW, TEAM_1
+
+@dataclass(frozen=True)
+class OddsReport:
+    trials: int
+    win_prob: float
+    win_ci: Tuple[float, float]
+    draw_rate: float
+    draw_ci: Tuple[float, float]
+    mean_turns: float
+    turns_ci: Tuple[float, float]
+    converged: bool
+
+def z_score(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> Tuple[float, float]:
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+def estimate_odds(roster: List[Character],
+                  strategy: IGroupingStrategy,
+                  tolerance: float = 0.05,
+                  confidence: float = 0.95,
+                  min_trials: int = 100,
+                  max_trials: int = 100_000,
+                  batch: int = 50,
+                  seed: int = 0,
+                  max_turns: int = 30) -> OddsReport:
+    """Simulates until the win-probability interval is narrower than `tolerance` (team 1's view)."""
+    z = z_score(confidence)
+    sim = BattleSimulator(roster, strategy, seed=seed, max_turns=max_turns)
+
+    trials = wins = draws = 0
+    turns_sum = turns_sq = 0
+    converged = False
+
+    while trials < max_trials:
+        results = sim.run_many(min(batch, max_trials - trials), start=trials)
+        if not results:
+            raise ValueError("Grouping failed: Not enough characters for this strategy")
+
+        for res in results:
+            wins += res.winner == TEAM_1
+            draws += res.winner == DRAW
+            turns_sum += res.turns
+            turns_sq += res.turns * res.turns
+        trials += len(results)
+
+        low, high = wilson_interval(wins, trials, z)
+        if trials >= min_trials and high - low < tolerance:
+            converged = True
+            break
+
+    mean_turns = turns_sum / trials
+    variance = max(0.0, turns_sq / trials - mean_turns * mean_turns)
+    turns_half = z * math.sqrt(variance / trials)
+
+    return OddsReport(
+        trials=trials,
+        win_prob=wins / trials,
+        win_ci=wilson_interval(wins, trials, z),
+        draw_rate=draws / trials,
+        draw_ci=wilson_interval(draws, trials, z),
+        mean_turns=mean_turns,
+        turns_ci=(mean_turns - turns_half, mean_turns + turns_half),
+        converged=converged
+    )
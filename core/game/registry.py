@@ -0,0 +1,124 @@
+import random
+from dataclasses import asdict, dataclass, field, is_dataclass
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from . import abilities
+from .abilities import Ability
+from .models import Skill
+
+# Bump when the [tag, *params] layout of a spec changes; saves record the version they used.
+ENCODING_VERSION = 1
+
+@dataclass(frozen=True)
+class Param:
+    name: str
+    default: int
+    roll: Tuple[int, int]
+    prompt: Optional[str] = None
+
+@dataclass(frozen=True)
+class AbilitySpec:
+    """One ability described as data: constructor params with their CLI default, the range
+    CharGenerator rolls from and the prompt CreateCharCommand asks with."""
+    tag: str
+    label: str
+    cls: Type[Ability]
+    params: Tuple[Param, ...]
+    aliases: Tuple[str, ...] = ()
+    _names: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _defaults: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_names", tuple(p.name for p in self.params))
+        object.__setattr__(self, "_defaults", tuple(p.default for p in self.params))
+
+    def create(self, *values: int, **overrides: int) -> Ability:
+        """Positional values fill params in order; anything missing takes its default."""
+        args = list(values) + list(self._defaults[len(values):])
+        for name, val in overrides.items():
+            args[self._names.index(name)] = val
+        return self.cls(*args)
+
+    def roll(self, rng=random) -> Ability:
+        return self.cls(*[rng.randint(*p.roll) if p.roll[0] != p.roll[1] else p.roll[0]
+                          for p in self.params])
+
+    @property
+    def prompt_param(self) -> Optional[Param]:
+        return next((p for p in self.params if p.prompt), None)
+
+    def values(self, ability: Ability) -> List[Any]:
+        return [getattr(ability, name) for name in self._names]
+
+SPECS: Tuple[AbilitySpec, ...] = (
+    AbilitySpec("fireball", "Fireball", abilities.Fireball,
+                (Param("damage", 30, (20, 40), "damage"),)),
+    AbilitySpec("heal", "Heal", abilities.Heal,
+                (Param("amount", 20, (15, 30), "heal amount"),)),
+    AbilitySpec("shield", "Shield", abilities.Shield,
+                (Param("bonus", 4, (3, 6), "shield amount"), Param("duration", 2, (1, 3)))),
+    AbilitySpec("freeze", "Freeze", abilities.Freeze,
+                (Param("duration", 1, (1, 2)),)),
+    AbilitySpec("doom", "Doom", abilities.Doom,
+                (Param("delay", 3, (2, 4)),)),
+    AbilitySpec("thunderstorm", "Thunderstorm", abilities.Thunderstorm,
+                (Param("dmg_min", 5, (5, 5)), Param("dmg_max", 15, (15, 15), "max damage per hit"),
+                 Param("hits_min", 1, (1, 1)), Param("hits_max", 4, (3, 3))), aliases=("storm",)),
+    AbilitySpec("brainsap", "BrainSap", abilities.BrainSap,
+                (Param("damage", 60, (50, 50), "damage"), Param("cooldown", 5, (4, 4)))),
+    AbilitySpec("darkblast", "DarkBlast", abilities.DarkBlast,
+                (Param("damage", 80, (60, 60), "damage"), Param("min_turn", 3, (2, 2)))),
+    AbilitySpec("blackhole", "BlackHole", abilities.BlackHole,
+                (Param("damage", 50, (40, 60), "damage"), Param("min_turn", 4, (3, 5)))),
+)
+
+BY_TAG: Dict[str, AbilitySpec] = {alias: s for s in SPECS for alias in (s.tag, *s.aliases)}
+BY_CLASS: Dict[type, AbilitySpec] = {s.cls: s for s in SPECS}
+
+def get(tag: str) -> Optional[AbilitySpec]:
+    return BY_TAG.get(tag.lower())
+
+def spec_of(ability: Any) -> Optional[AbilitySpec]:
+    return BY_CLASS.get(type(ability))
+
+def encode(ability: Ability) -> list:
+    """[tag, *params] in spec order."""
+    spec = BY_CLASS.get(type(ability))
+    if spec is None:
+        raise ValueError(f"Unregistered ability: {type(ability).__name__}")
+    return [spec.tag, *spec.values(ability)]
+
+def decode(data: list) -> Ability:
+    spec = BY_TAG.get(data[0])
+    if spec is None:
+        raise ValueError(f"Unknown ability type: {data[0]}")
+    return spec.cls(*data[1:])
+
+def encode_skills(skills: List[Any]) -> List[Any]:
+    """Character.skills for saving: registered abilities as [tag, *params], imported skills as field dicts."""
+    out = []
+    for s in skills:
+        spec = BY_CLASS.get(type(s))
+        if spec is not None:
+            out.append([spec.tag, *spec.values(s)])
+        elif is_dataclass(s):
+            out.append(asdict(s))
+        elif isinstance(s, dict):
+            out.append(s)
+    return out
+
+def decode_skills(data: List[Any], version: Optional[int] = ENCODING_VERSION) -> List[Any]:
+    """Inverse of encode_skills; entries that cannot be rebuilt are skipped. `version` None means
+    a save from before abilities were encoded, which only holds skill dicts."""
+    out = []
+    for item in data:
+        try:
+            if isinstance(item, list):
+                if version is not None: out.append(decode(item))
+            elif isinstance(item, dict):
+                out.append(Skill(**item))
+            else:
+                out.append(item)
+        except (TypeError, ValueError):
+            pass
+    return out
@@ -0,0 +1,116 @@
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .models import Character, Item
+from .grouping import IGroupingStrategy
+from .engine import GameEngine
+from .simulator import BattleResult, DRAW, TEAM_1, TEAM_2
+from .rng import Seed
+from . import registry
+from infra.atomic import atomic_write
+
+REPLAY_VERSION = 4
+
+# Per-battle state that survives between battles and therefore has to be recorded.
+STATE_FIELDS = ("_temp_armor", "_frozen_turns", "_doom_counter",
+                "_brain_sap_last", "_current_turn_counter")
+
+def encode_character(c: Character) -> Dict[str, Any]:
+    return {
+        "id": c.id,
+        "name": c.name,
+        "game": c.game,
+        "level": c.level,
+        "stats": dict(c.stats),
+        "equipment": [asdict(i) for i in c.equipment],
+        "abilities": registry.encode_skills(c.abilities),
+        "state": [getattr(c, f) for f in STATE_FIELDS],
+    }
+
+def decode_character(d: Dict[str, Any]) -> Character:
+    char = Character(id=d["id"], name=d["name"], game=d["game"], level=d["level"],
+                     stats=d["stats"], skills=registry.decode_skills(d["abilities"]),
+                     equipment=[Item(**i) for i in d["equipment"]])
+    for f, val in zip(STATE_FIELDS, d["state"]):
+        setattr(char, f, val)
+    return char
+
+def battle_outcome(team1: List[Character], team2: List[Character], turns: int) -> BattleResult:
+    alive1 = any(c.is_alive() for c in team1)
+    alive2 = any(c.is_alive() for c in team2)
+    winner = DRAW if alive1 == alive2 else TEAM_1 if alive1 else TEAM_2
+    return BattleResult(winner, turns, tuple(max(0, c.health) for c in team1 + team2))
+
+@dataclass
+class Replay:
+    """Everything needed to re-run a battle exactly: seed, starting roster and rules. No log is stored."""
+    seed: Seed
+    strategy: str
+    roster: List[Dict[str, Any]]
+    initiative: bool = False
+    max_turns: int = 30
+    result: Optional[BattleResult] = None
+
+    @classmethod
+    def record(cls, seed: Seed, strategy: str, characters: List[Character],
+               initiative: bool = False, max_turns: int = 30) -> 'Replay':
+        """Snapshot taken right before the first turn."""
+        return cls(seed, strategy, [encode_character(c) for c in characters], initiative, max_turns)
+
+    def run(self, grouping_strategy: IGroupingStrategy) -> BattleResult:
+        """Replays headless on a fresh roster; rolls match the recorded battle one for one."""
+        roster = [decode_character(d) for d in self.roster]
+        engine = GameEngine()
+        engine.characters = roster
+        engine.start_battle(initiative=self.initiative, seed=self.seed)
+
+        team1, team2 = grouping_strategy.group(roster)
+        turn = 1
+        while any(c.is_alive() for c in team1) and any(c.is_alive() for c in team2):
+            engine.resolve_turn(roster, grouping_strategy)
+            if not any(c.is_alive() for c in team1) or not any(c.is_alive() for c in team2):
+                break
+            turn += 1
+            if turn > self.max_turns:
+                turn = self.max_turns
+                break
+
+        return battle_outcome(team1, team2, turn)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "strategy": self.strategy,
+            "initiative": self.initiative,
+            "max_turns": self.max_turns,
+            "roster": self.roster,
+        }
+        if self.result is not None:
+            data["result"] = [self.result.winner, self.result.turns, list(self.result.survivors_hp)]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Replay':
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        result = data.get("result")
+        return cls(
+            seed=data["seed"],
+            strategy=data["strategy"],
+            roster=data["roster"],
+            initiative=data.get("initiative", False),
+            max_turns=data.get("max_turns", 30),
+            result=BattleResult(result[0], result[1], tuple(result[2])) if result else None
+        )
+
+    def save(self, path: Path):
+        with atomic_write(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: Path) -> 'Replay':
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,15 @@
+import random
+import secrets
+
+Seed = int | str
+
+def new_seed() -> int:
+    return secrets.randbits(32)
+
+def derive_seed(seed: Seed, *path) -> str:
+    """Child seed for a sub-stream (battle index, matchup, worker..); the same in every process."""
+    return ":".join(str(p) for p in (seed, *path))
+
+def rng_stream(seed: Seed, *path) -> random.Random:
+    """Independent RNG for `seed`, split by `path` so parallel runs never share a generator."""
+    return random.Random(derive_seed(seed, *path) if path else seed)
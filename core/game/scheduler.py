@@ -0,0 +1,54 @@
+import heapq
+import random
+from itertools import count
+from typing import Any, Iterator, List
+
+DEFAULT_SPEED = 10
+TURN_LENGTH = 1 / DEFAULT_SPEED
+
+class InitiativeScheduler:
+    """ATB-style initiative: an actor with speed s acts every 1/s time units.
+
+    A turn is the window of TURN_LENGTH, so a speed-10 actor acts once per turn,
+    speed 20 twice and speed 5 every other turn. Each action costs one heap pop and push;
+    dead actors are dropped when they reach the top instead of being searched for.
+    """
+    __slots__ = ("now", "turn_end", "_heap", "_seq", "_known", "_rng")
+
+    def __init__(self, rng=random):
+        self.now = 0.0
+        self.turn_end = 0.0
+        self._heap: List[tuple] = []
+        self._seq = count()
+        self._known = set()
+        self._rng = rng
+
+    def add(self, actor: Any):
+        """Schedules a newcomer at a random offset inside its first interval."""
+        self._known.add(id(actor))
+        at = self.now + self._rng.random() * self.interval(actor)
+        heapq.heappush(self._heap, (at, next(self._seq), actor))
+
+    @staticmethod
+    def interval(actor: Any) -> float:
+        return 1 / max(1, getattr(actor, "speed", DEFAULT_SPEED))
+
+    def turn(self, participants: List[Any]) -> Iterator[Any]:
+        """Yields the actors due in the next window; each is rescheduled once it has acted."""
+        known = self._known
+        for actor in participants:
+            if id(actor) not in known: self.add(actor)
+
+        self.turn_end += TURN_LENGTH
+        heap = self._heap
+        while heap and heap[0][0] < self.turn_end:
+            at, _, actor = heapq.heappop(heap)
+            if not actor.is_alive():
+                known.discard(id(actor))
+                continue
+            self.now = at
+            yield actor
+            heapq.heappush(heap, (at + self.interval(actor), next(self._seq), actor))
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,120 @@
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .models import Character
+from .grouping import IGroupingStrategy
+from .combatant import CombatantState, build_sides
+from .engine import SKILL_CHANCE
+from .teams import TeamIndex
+from .status import StatusTimeline
+from .rng import Seed, rng_stream
+
+DRAW = 0
+TEAM_1 = 1
+TEAM_2 = 2
+
+@dataclass(frozen=True, slots=True)
+class BattleResult:
+    winner: int
+    turns: int
+    survivors_hp: Tuple[int, ...]
+
+class BattleSimulator:
+    """Headless battle runner: same rules as GameEngine.battle_simulation_step, no log formatting.
+
+    _battle is play_turn inlined for CombatantState sides. It makes the same rng calls in the
+    same order, so a seed plays the same battle either way; tests hold the two together.
+    """
+
+    def __init__(self,
+                 roster: List[Character],
+                 grouping_strategy: IGroupingStrategy,
+                 seed: Seed = 0,
+                 max_turns: int = 30):
+        self.roster = roster
+        self.grouping_strategy = grouping_strategy
+        self.seed = seed
+        self.max_turns = max_turns
+
+    def run(self, index: int = 0, write_back: bool = False) -> Optional[BattleResult]:
+        """Plays battle number `index`; with write_back the roster keeps the final HP and statuses."""
+        team1, team2 = self.grouping_strategy.group(self.roster)
+        if not team1 or not team2:
+            return None
+
+        sides = build_sides(team1, team2)
+        result = self._battle(sides, rng_stream(self.seed, index))
+        if write_back:
+            for c in sides[0] + sides[1]:
+                c.write_back()
+        return result
+
+    def run_many(self, n: int, start: int = 0) -> List[BattleResult]:
+        team1, team2 = self.grouping_strategy.group(self.roster)
+        if not team1 or not team2:
+            return []
+
+        sides = build_sides(team1, team2)
+        fighters = sides[0] + sides[1]
+        results = []
+        for i in range(start, start + n):
+            for c in fighters: c.reset()
+            results.append(self._battle(sides, rng_stream(self.seed, i)))
+        return results
+
+    def _battle(self, sides: List[List[CombatantState]], rng: random.Random) -> BattleResult:
+        team1, team2 = sides
+        participants = team1 + team2
+        teams = TeamIndex(team1, team2)
+        statuses = StatusTimeline()
+        acted = statuses.acted
+        random_, shuffle, choice = rng.random, rng.shuffle, rng.choice
+        # Shuffling (actor, enemies) slots draws the same permutation as shuffling the actors.
+        slots = [(c, teams.enemies_of(c)) for c in participants]
+
+        turn = 1
+        while True:
+            order = slots[:]
+            shuffle(order)
+
+            for actor, enemies in order:
+                if actor.health <= 0: continue
+                members = enemies.members
+                if not members: break
+
+                if actor._frozen_turns > 0:
+                    actor._frozen_turns -= 1
+                    acted(actor)
+                    continue
+
+                skill = actor.abilities and random_() < SKILL_CHANCE
+                target = choice(members)
+                if skill:
+                    choice(actor.abilities).apply(actor, target, rng, None, statuses)
+                else:
+                    dmg = actor.attack
+                    if random_() < actor.critical_chance:
+                        dmg = int(dmg * actor.critical_multiplier)
+                    dmg -= target.base_armor + target._temp_armor
+                    hp = target.health - (dmg if dmg > 1 else 1)
+                    target.health = hp if hp > 0 else 0
+
+                if target.health <= 0: enemies.discard(target)
+                acted(actor)
+
+            for doomed in statuses.end_turn():
+                teams.refresh(doomed)
+
+            alive1, alive2 = bool(teams.alive[0]), bool(teams.alive[1])
+            if not alive1 or not alive2:
+                winner = TEAM_1 if alive1 else TEAM_2 if alive2 else DRAW
+                break
+
+            turn += 1
+            if turn > self.max_turns:
+                turn = self.max_turns
+                winner = DRAW
+                break
+
+        return BattleResult(winner, turn, tuple(max(0, c.health) for c in participants))
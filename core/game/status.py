@@ -0,0 +1,83 @@
+from typing import Any, Dict, List, Tuple
+
+from . import events as ev
+
+SHIELD = 1
+DOOM = 2
+
+Entry = Tuple[int, Any, int]
+
+class StatusTimeline:
+    """Timed status effects of one battle, bucketed by the turn they expire on (a timing wheel).
+
+    end_turn() only touches the bucket that is due and the pending Dooms (to keep each target's
+    `_doom_counter` at the turns it has left), so the per-turn cost follows the number of
+    effects rather than the number of combatants. Durations count the target's own
+    turns, so an effect landing after the target already acted this turn lasts one turn longer.
+
+    Stacking: shields stack additively and expire independently; a new Doom replaces the
+    pending one. Freeze is not stored here: each skipped action uses up one frozen turn.
+    """
+    __slots__ = ("turn", "_wheel", "_doom_due", "_acted", "_pending")
+
+    def __init__(self):
+        self.turn = 1
+        self._wheel: Dict[int, List[Entry]] = {}
+        self._doom_due: Dict[int, Tuple[Any, int]] = {}
+        self._acted: Dict[int, int] = {}
+        self._pending = 0
+
+    def acted(self, actor: Any):
+        self._acted[id(actor)] = self.turn
+
+    def expiry(self, target: Any, duration: int) -> int:
+        acted = self._acted.get(id(target)) == self.turn
+        return self.turn + max(1, duration) - 1 + acted
+
+    def _schedule(self, turn: int, entry: Entry):
+        self._wheel.setdefault(turn, []).append(entry)
+        self._pending += 1
+
+    def shield(self, target: Any, bonus: int, duration: int):
+        target._temp_armor += bonus
+        self._schedule(self.expiry(target, duration), (SHIELD, target, bonus))
+
+    def doom(self, target: Any, delay: int):
+        due = self.expiry(target, delay)
+        target._doom_counter = delay
+        self._doom_due[id(target)] = (target, due)
+        self._schedule(due, (DOOM, target, due))
+
+    def end_turn(self, events=None) -> List[Any]:
+        """Expires this turn's effects and advances the clock; returns combatants Doom killed."""
+        if not self._pending:
+            self.turn += 1
+            return []
+        doomed = []
+        due = self._wheel.pop(self.turn, ())
+        self._pending -= len(due)
+        for kind, target, value in due:
+            if kind == SHIELD:
+                # A reset between battles may already have zeroed the bonus.
+                target._temp_armor = max(0, target._temp_armor - value)
+            elif self._doom_due.get(id(target), (None, None))[1] == value:
+                del self._doom_due[id(target)]
+                target._doom_counter = None
+                if target.is_alive():
+                    target.health = 0
+                    doomed.append(target)
+                    if events is not None: events.emit(ev.STATUS_DOOMED, target)
+        self.turn += 1
+        for target, due in self._doom_due.values():
+            target._doom_counter = due - self.turn + 1
+        return doomed
+
+    def __len__(self) -> int:
+        return self._pending
+
+def freeze(target: Any, turns: int, stack: bool = False):
+    """Freeze refreshes to the longer duration; stacking sources (BlackHole) extend it."""
+    if stack:
+        target._frozen_turns += turns
+    else:
+        target._frozen_turns = max(target._frozen_turns, turns)
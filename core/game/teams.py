@@ -0,0 +1,46 @@
+from typing import Any, List
+
+class AliveIndex:
+    """Alive members of one team: O(1) removal on death and uniform random picks."""
+    __slots__ = ("members", "_pos")
+
+    def __init__(self, members: List[Any]):
+        self.members = [m for m in members if m.is_alive()]
+        self._pos = {id(m): i for i, m in enumerate(self.members)}
+
+    def discard(self, member: Any):
+        idx = self._pos.pop(id(member), None)
+        if idx is None:
+            return
+        last = self.members.pop()
+        if last is not member:
+            self.members[idx] = last
+            self._pos[id(last)] = idx
+
+    def choice(self, rng) -> Any:
+        return rng.choice(self.members)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __bool__(self) -> bool:
+        return bool(self.members)
+
+    def __iter__(self):
+        return iter(self.members)
+
+class TeamIndex:
+    """Per-battle actor -> team lookup plus alive sets kept up to date as combatants die."""
+    __slots__ = ("team_of", "alive")
+
+    def __init__(self, group1: List[Any], group2: List[Any]):
+        self.team_of = {id(c): 0 for c in group1}
+        self.team_of.update((id(c), 1) for c in group2)
+        self.alive = [AliveIndex(group1), AliveIndex(group2)]
+
+    def enemies_of(self, actor: Any) -> AliveIndex:
+        return self.alive[1 - self.team_of[id(actor)]]
+
+    def refresh(self, combatant: Any):
+        if not combatant.is_alive():
+            self.alive[self.team_of[id(combatant)]].discard(combatant)
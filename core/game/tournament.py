@@ -0,0 +1,167 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import combinations, islice
+from math import comb
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import Character
+from .grouping import IGroupingStrategy, TEAM_SIZES_BY_MODE, make_strategies
+from .simulator import BattleSimulator, TEAM_1, TEAM_2
+from .rng import Seed, derive_seed, rng_stream
+
+MAX_CHUNK = 256
+
+Matchup = Tuple[Tuple[int, ...], Tuple[int, ...]]
+# Roster indices of each side as the strategy grouped them, then side 1 wins, side 2 wins, draws.
+Tally = Tuple[Tuple[int, ...], Tuple[int, ...], int, int, int]
+
+@dataclass
+class TournamentResult:
+    names: List[str]
+    wins: List[List[int]]
+    losses: List[List[int]]
+    draws: List[List[int]]
+    matchups: int
+    battles: int
+
+    def win_rate(self, idx: int) -> float:
+        won, lost, drawn = sum(self.wins[idx]), sum(self.losses[idx]), sum(self.draws[idx])
+        total = won + lost + drawn
+        return won / total if total else 0.0
+
+    def ranking(self) -> List[Tuple[str, float]]:
+        rates = [(name, self.win_rate(i)) for i, name in enumerate(self.names)]
+        return sorted(rates, key=lambda r: r[1], reverse=True)
+
+def pairing_count(roster_size: int, team_size: int) -> int:
+    if roster_size < 2 * team_size:
+        return 0
+    return comb(roster_size, team_size) * comb(roster_size - team_size, team_size) // 2
+
+def team_pairings(roster_size: int, team_size: int) -> Iterator[Matchup]:
+    """Every pair of disjoint teams, each unordered pair exactly once, in lexicographic order.
+
+    Team B is drawn from the members left after team A whose index is above A's first member, so
+    nothing is materialized and no candidate is rejected."""
+    for team_a in combinations(range(roster_size), team_size):
+        rest = [i for i in range(team_a[0] + 1, roster_size) if i not in team_a]
+        for team_b in combinations(rest, team_size):
+            yield team_a, team_b
+
+def sample_pairings(roster_size: int, team_size: int, count: int, seed: Seed) -> Iterator[Matchup]:
+    """`count` distinct random pairings of disjoint teams (at most pairing_count()), reproducible from `seed`."""
+    rng = rng_stream(seed, "pairings")
+    seen = set()
+    while len(seen) < count:
+        picked = rng.sample(range(roster_size), 2 * team_size)
+        matchup = tuple(sorted((tuple(sorted(picked[:team_size])), tuple(sorted(picked[team_size:])))))
+        if matchup not in seen:
+            seen.add(matchup)
+            yield matchup
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+_worker_roster: List[Character] = []
+_worker_strategy: Optional[IGroupingStrategy] = None
+
+def _init_worker(roster: List[Character], strategy: IGroupingStrategy):
+    global _worker_roster, _worker_strategy
+    _worker_roster, _worker_strategy = roster, strategy
+
+def _tally(forward: List[List[int]], backward: List[List[int]], side_a: Sequence[int], side_b: Sequence[int],
+           count: int):
+    if not count:
+        return
+    for i in side_a:
+        for j in side_b:
+            forward[i][j] += count
+            backward[j][i] += count
+
+def _run_chunk(chunk: Sequence[Tuple[int, Matchup]], seed: Seed, battles: int, max_turns: int) -> List[Tally]:
+    """Plays a slice of matchups; returns one tally per matchup, so what goes back to the parent
+    grows with the chunk rather than with the roster."""
+    roster, strategy = _worker_roster, _worker_strategy
+    index_of = {id(c): i for i, c in enumerate(roster)}
+    tallies = []
+
+    for matchup_idx, (team_a, team_b) in chunk:
+        lineup = [roster[i] for i in team_a + team_b]
+        group1, group2 = strategy.group(lineup)
+        side1 = tuple(index_of[id(c)] for c in group1 if id(c) in index_of)
+        side2 = tuple(index_of[id(c)] for c in group2 if id(c) in index_of)
+
+        sim = BattleSimulator(lineup, strategy, seed=derive_seed(seed, matchup_idx), max_turns=max_turns)
+        outcomes = [0, 0, 0]
+        for res in sim.run_many(battles):
+            outcomes[0 if res.winner == TEAM_1 else 1 if res.winner == TEAM_2 else 2] += 1
+        tallies.append((side1, side2, *outcomes))
+
+    return tallies
+
+def run_tournament(roster: List[Character],
+                   strategy: IGroupingStrategy,
+                   team_size: Optional[int] = None,
+                   battles_per_matchup: int = 10,
+                   seed: Seed = 0,
+                   max_turns: int = 30,
+                   workers: Optional[int] = None,
+                   max_matchups: Optional[int] = None) -> TournamentResult:
+    """Round-robin of every disjoint team pairing; results do not depend on the worker count.
+
+    When there are more pairings than `max_matchups`, that many are sampled at random instead.
+    Pairings are generated as the workers take them, in chunks of at most MAX_CHUNK, with no more
+    than two chunks per worker in flight."""
+    if team_size is None:
+        sizes = {type(s): TEAM_SIZES_BY_MODE[mode] for mode, s in make_strategies().items()
+                 if mode in TEAM_SIZES_BY_MODE}
+        team_size = sizes.get(type(strategy))
+    if not team_size:
+        raise ValueError(f"Team size is required for {type(strategy).__name__}")
+
+    n = len(roster)
+    count = pairing_count(n, team_size)
+    if max_matchups is not None and count > max_matchups:
+        count, pairings = max_matchups, sample_pairings(n, team_size, max_matchups, seed)
+    else:
+        pairings = team_pairings(n, team_size)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, min(MAX_CHUNK, -(-count // (workers * 4))))
+    chunks = _chunked(enumerate(pairings), chunk_size)
+    wins, losses, draws = ([[0] * n for _ in range(n)] for _ in range(3))
+
+    def add(tallies: List[Tally]):
+        for side1, side2, won1, won2, drawn in tallies:
+            _tally(wins, losses, side1, side2, won1)
+            _tally(wins, losses, side2, side1, won2)
+            _tally(draws, draws, side1, side2, drawn)
+
+    if workers == 1 or count <= chunk_size:
+        _init_worker(roster, strategy)
+        try:
+            for chunk in chunks:
+                add(_run_chunk(chunk, seed, battles_per_matchup, max_turns))
+        finally:
+            _init_worker([], None)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(roster, strategy)) as pool:
+            pending = set()
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done: add(future.result())
+                pending.add(pool.submit(_run_chunk, chunk, seed, battles_per_matchup, max_turns))
+            for future in pending: add(future.result())
+
+    return TournamentResult(
+        names=[c.name for c in roster],
+        wins=wins,
+        losses=losses,
+        draws=draws,
+        matchups=count,
+        battles=count * battles_per_matchup
+    )
@@ -0,0 +1,123 @@
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .models import Character
+from .simulator import BattleResult, DRAW, TEAM_1, TEAM_2
+
+class VectorBattle:
+    """Struct-of-arrays battle for large fights (basic attacks, crits, armor, freeze/doom ticks).
+
+    Abilities are not resolved here; use BattleSimulator for ability-heavy rosters.
+    Each turn the shuffled actor order is cut into `waves`; actors inside a wave strike
+    simultaneously and deaths apply between waves (waves == combatants is fully sequential).
+    """
+
+    def __init__(self, hp, attack, armor, team, crit_chance=None, crit_mult=None,
+                 seed: int = 0, waves: Optional[int] = None):
+        if np is None:
+            raise RuntimeError("VectorBattle requires numpy (pip install numpy)")
+
+        self.hp = np.asarray(hp, dtype=np.int64).copy()
+        n = self.hp.size
+        self.attack = np.asarray(attack, dtype=np.int64)
+        self.armor = np.asarray(armor, dtype=np.int64)
+        self.team = np.asarray(team, dtype=np.int8)
+        self.crit_chance = np.full(n, 0.1) if crit_chance is None else np.asarray(crit_chance, dtype=np.float64)
+        self.crit_mult = np.full(n, 1.5) if crit_mult is None else np.asarray(crit_mult, dtype=np.float64)
+        self.frozen = np.zeros(n, dtype=np.int32)
+        self.doom = np.zeros(n, dtype=np.int32)
+
+        self.rng = np.random.default_rng(seed)
+        self.waves = max(1, min(n, waves if waves is not None else 16))
+        self.turn = 0
+
+    @classmethod
+    def from_teams(cls, team1: List[Character], team2: List[Character], seed: int = 0,
+                   waves: Optional[int] = None) -> 'VectorBattle':
+        fighters = team1 + team2
+        return cls(
+            hp=[c.base_hp + sum(i.bonus_hp for i in c.items) for c in fighters],
+            attack=[c.attack for c in fighters],
+            armor=[c.armor - c._temp_armor for c in fighters],
+            team=[0] * len(team1) + [1] * len(team2),
+            crit_chance=[c.critical_chance for c in fighters],
+            crit_mult=[c.critical_multiplier for c in fighters],
+            seed=seed,
+            waves=waves
+        )
+
+    def freeze(self, idx, turns: int):
+        self.frozen[idx] = np.maximum(self.frozen[idx], turns)
+
+    def doom_in(self, idx, turns: int):
+        self.doom[idx] = max(1, turns)
+
+    def team_alive(self, side: int) -> bool:
+        return bool(np.any((self.hp > 0) & (self.team == side)))
+
+    def step(self):
+        """Resolves one turn."""
+        self.turn += 1
+        order = self.rng.permutation(self.hp.size)
+        for wave in np.array_split(order, self.waves):
+            if not self._wave(wave):
+                return
+
+    def run(self, max_turns: int = 30) -> BattleResult:
+        turn = 1
+        while True:
+            self.step()
+
+            alive1, alive2 = self.team_alive(0), self.team_alive(1)
+            if not alive1 or not alive2:
+                winner = TEAM_1 if alive1 else TEAM_2 if alive2 else DRAW
+                break
+
+            turn += 1
+            if turn > max_turns:
+                turn = max_turns
+                winner = DRAW
+                break
+
+        return BattleResult(winner, turn, tuple(int(h) for h in self.hp))
+
+    def _wave(self, actors) -> bool:
+        hp = self.hp
+        actors = actors[hp[actors] > 0]
+        if not actors.size:
+            return True
+
+        alive = hp > 0
+        acting = actors[self.frozen[actors] == 0]
+        for side in (0, 1):
+            movers = acting[self.team[acting] == side]
+            pool = np.flatnonzero(alive & (self.team != side))
+            if not pool.size:
+                return False
+            if not movers.size:
+                continue
+
+            targets = pool[self.rng.integers(0, pool.size, movers.size)]
+            atk = self.attack[movers]
+            crit = self.rng.random(movers.size) < self.crit_chance[movers]
+            raw = np.where(crit, (atk * self.crit_mult[movers]).astype(np.int64), atk)
+            np.subtract.at(hp, targets, np.maximum(1, raw - self.armor[targets]))
+
+        np.maximum(hp, 0, out=hp)
+        self._tick(actors)
+        return True
+
+    def _tick(self, actors):
+        frozen = self.frozen[actors]
+        self.frozen[actors] = np.maximum(frozen - 1, 0)
+
+        doom = self.doom[actors]
+        dooming = doom > 0
+        if dooming.any():
+            doom = np.where(dooming, doom - 1, 0)
+            self.doom[actors] = doom
+            self.hp[actors[dooming & (doom == 0)]] = 0
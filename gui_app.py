@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QTextEdit, QLineEdit, QPushButton, 
                              QTabWidget, QScrollArea, QGridLayout, QLabel)
@@ -7,10 +8,15 @@ from PyQt6.QtCore import QThread, pyqtSlot, Qt
 from core.game.engine import GameEngine
 from cli.router import Router
 from cli.commands import (LoadAllCommand, SaveAllCommand, CreateCharCommand, 
-                          ListCharsCommand, ImportCharCommand, BattleCommand, StartFileManagerCommand)
+                          ListCharsCommand, ImportCharCommand, BattleCommand, StartFileManagerCommand,
+                          TournamentCommand, OddsCommand, ReplayCommand, CacheCommand)
 from infra.gui_importer.gui_adapter import GuiDisplayAdapter
+from infra.autosave import AutosaveWorker
+from infra.persistence import PersistenceService
 from infra.gui_importer.components import CharacterCard
 
+MAX_CATALOG_CARDS = 60
+
 class GameThread(QThread):
     def __init__(self, display_adapter, game_engine):
         super().__init__()
@@ -25,6 +31,10 @@ class GameThread(QThread):
         self.router.register("import", ImportCharCommand(self.game_engine, self.display)) 
         self.router.register("play", BattleCommand(self.game_engine, self.display))
         self.router.register("files", StartFileManagerCommand(self.game_engine, self.display))
+        self.router.register("odds", OddsCommand(self.game_engine, self.display))
+        self.router.register("tournament", TournamentCommand(self.game_engine, self.display))
+        self.router.register("replay", ReplayCommand(self.game_engine, self.display))
+        self.router.register("cache", CacheCommand(self.game_engine, self.display))
 
     def run(self):
         self.display.show("System ready. GUI Mode Initialized")
@@ -34,6 +44,8 @@ class GameThread(QThread):
                 inp = self.display.prompt("> ").strip()
                 if inp == "exit": break
                 self.router.handle_input(inp)
+                if self.game_engine.autosave is not None:
+                    self.game_engine.autosave.checkpoint()
             except Exception as e:
                 self.display.show(f"Error: {e}")
 
@@ -45,6 +57,8 @@ class MainWindow(QMainWindow):
         self.setStyleSheet("background-color: #1e1e1e; color: white;")
 
         self.game_engine = GameEngine()
+        self.autosave = AutosaveWorker(lambda: PersistenceService.snapshot_catalog(self.game_engine.characters))
+        self.game_engine.autosave = self.autosave
         self.display_adapter = GuiDisplayAdapter()
         
         self.display_adapter.text_written.connect(self.append_text)
@@ -68,6 +82,12 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self.tabs)
         
         self.game_thread.start()
+        self.autosave.start()
+
+    def closeEvent(self, event):
+        # Runs on the GUI thread; the game thread already snapshotted after its last command.
+        self.autosave.stop(snapshot=False)
+        super().closeEvent(event)
 
     def create_console_tab(self):
         widget = QWidget()
@@ -138,7 +158,8 @@ class MainWindow(QMainWindow):
         row, col = 0, 0
         max_cols = 3
         
-        for char in chars:
+        # Large catalogs are loaded lazily; only the first cards are built, 'ls <page>' lists the rest.
+        for char in chars[:MAX_CATALOG_CARDS]:
             card = CharacterCard(char)
             self.catalog_layout.addWidget(card, row, col)
             col += 1
@@ -181,6 +202,7 @@ class MainWindow(QMainWindow):
                 QTimer.singleShot(500, self.refresh_catalog)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
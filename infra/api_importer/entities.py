@@ -1,6 +1,9 @@
 import random
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+
+from core.game import events as ev
+from core.game.status import StatusTimeline
 
 @dataclass
 class Item:
@@ -23,14 +26,63 @@ class Skill:
     def __repr__(self):
         return self.name
 
-    def use(self, user: 'Character', target: 'Character') -> str:
+    def apply(self, user: 'Character', target: 'Character', rng=random, events=None, statuses=None):
         multiplier = self.power if self.power is not None else 1.5
         atk = user.attack
         raw_damage = int(atk * multiplier)
         
         actual_dmg = target.take_damage(raw_damage)
-        
-        return f"{user.name} casts '{self.name}' on {target.name}! (Dmg: {actual_dmg})"
+        if events is not None: events.emit(ev.SKILL, user, target, actual_dmg, extra=self.name)
+
+    def use(self, user: 'Character', target: 'Character') -> str:
+        events = ev.EventBuffer()
+        self.apply(user, target, random, events)
+        return ev.render_message(events.records[0])
+
+class StatBlock(dict):
+    """Stats dict that drops its owner's cached derived stats on every write."""
+    _owner = None
+
+    def __init__(self, *args, owner: Optional['Character'] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owner = owner
+
+    def _changed(self):
+        if self._owner is not None: self._owner.invalidate_stats()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def pop(self, *args):
+        val = super().pop(*args)
+        self._changed()
+        return val
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        val = super().setdefault(key, default)
+        self._changed()
+        return val
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def __reduce__(self):
+        return (StatBlock, (dict(self),))
 
 @dataclass
 class Character:
@@ -46,12 +98,44 @@ class Character:
     _temp_armor: int = field(init=False, default=0)
     _frozen_turns: int = field(init=False, default=0)
     _doom_counter: Optional[int] = field(init=False, default=None)
+    _brain_sap_last: int = field(init=False, default=-999, repr=False, compare=False)
+    _current_turn_counter: int = field(init=False, default=0, repr=False, compare=False)
+
+    _statuses: Optional[StatusTimeline] = field(init=False, default=None, repr=False, compare=False)
+    _derived: Optional[Tuple[int, int, float, float]] = field(init=False, default=None, repr=False, compare=False)
+    _health: Optional[int] = field(init=False, default=None, repr=False, compare=False)
+    _revision: int = field(init=False, default=0, repr=False, compare=False)
+    _catalog_key: Optional[Tuple[str, int]] = field(init=False, default=None, repr=False, compare=False)
 
     def __post_init__(self):
         self._temp_armor = 0
         self._frozen_turns = 0
         self._doom_counter = None
-        if self.stats is None: self.stats = {}
+        self.stats = StatBlock(self.stats or {}, owner=self)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.stats = StatBlock(self.stats, owner=self)
+        self.invalidate_stats()
+
+    def invalidate_stats(self):
+        """Call after mutating `equipment` in place or replacing `stats` without going through the API;
+        also marks the character as changed for the SQLite catalog."""
+        self._derived = None
+        self._health = None
+        self._revision += 1
+
+    def _derive(self) -> Tuple[int, int, float, float]:
+        stats = self.stats
+        base_atk = stats.get("attack") or stats.get("base_attack", 10)
+        base_arm = stats.get("defense", stats.get("armor", 0))
+        atk_bonus = sum(i.bonus_attack for i in self.equipment if hasattr(i, 'bonus_attack'))
+        arm_bonus = sum(i.bonus_armor for i in self.equipment if hasattr(i, 'bonus_armor'))
+
+        derived = (int(base_atk) + atk_bonus, int(base_arm) + arm_bonus,
+                   stats.get("crit_chance", 0.1), stats.get("crit_multiplier", 1.5))
+        self._derived = derived
+        return derived
 
     @property
     def items(self) -> List[Item]:
@@ -60,6 +144,7 @@ class Character:
     @items.setter
     def items(self, value: List[Item]):
         self.equipment = value
+        self.invalidate_stats()
 
     @property
     def abilities(self) -> List[Skill]:
@@ -69,15 +154,25 @@ class Character:
     def abilities(self, value: List[Skill]):
         self.skills = value
 
+    @property
+    def statuses(self) -> StatusTimeline:
+        """Timeline for effects applied outside a battle; advanced by end_turn_update."""
+        if self._statuses is None: self._statuses = StatusTimeline()
+        return self._statuses
+
     @property
     def health(self) -> int:
-        val = self.stats.get("health")
-        if val is None: val = self.stats.get("max_hp", 100)
-        return int(val)
+        hp = self._health
+        if hp is None:
+            val = self.stats.get("health")
+            if val is None: val = self.stats.get("max_hp", 100)
+            hp = self._health = int(val)
+        return hp
 
     @health.setter
     def health(self, value: int):
-        self.stats["health"] = value
+        dict.__setitem__(self.stats, "health", value)
+        self._health = int(value)
 
     @property
     def max_hp(self) -> int:
@@ -88,32 +183,33 @@ class Character:
 
     @property
     def attack(self) -> int:
-        base = self.stats.get("attack") or self.stats.get("base_attack", 10)
-        item_bonus = sum(i.bonus_attack for i in self.equipment if hasattr(i, 'bonus_attack'))
-        return int(base) + item_bonus
+        return (self._derived or self._derive())[0]
     
     @property
     def base_attack(self) -> int: return int(self.stats.get("attack", 10))
 
     @property
     def critical_chance(self) -> float:
-        return self.stats.get("crit_chance", 0.1)
+        return (self._derived or self._derive())[2]
 
     @property
     def critical_multiplier(self) -> float:
-        return self.stats.get("crit_multiplier", 1.5)
+        return (self._derived or self._derive())[3]
+
+    @property
+    def speed(self) -> int:
+        return int(self.stats.get("speed", 10))
 
     @property
     def armor(self) -> int:
-        base = int(self.stats.get("defense", self.stats.get("armor", 0)))
-        item_bonus = sum(i.bonus_armor for i in self.equipment if hasattr(i, 'bonus_armor'))
-        return base + item_bonus + self._temp_armor
+        return (self._derived or self._derive())[1] + self._temp_armor
 
     @property
     def base_armor(self) -> int: return int(self.stats.get("defense", 0))
 
     def is_alive(self) -> bool:
-        return self.health > 0
+        hp = self._health
+        return (hp if hp is not None else self.health) > 0
 
     def take_damage(self, raw_amount: int) -> int:
         reduction = self.armor
@@ -121,44 +217,43 @@ class Character:
         self.health = max(0, self.health - final_damage)
         return final_damage
 
-    def attack_target(self, target: 'Character') -> str:
-        if self._frozen_turns > 0:
-            return f"{self.name} is frozen and cannot attack"
-
+    def strike(self, target: 'Character', rng=random, events=None):
         base_dmg = self.attack
-        is_crit = random.random() < self.critical_chance
+        is_crit = rng.random() < self.critical_chance
         
-        crit_text = ""
         if is_crit:
             base_dmg = int(base_dmg * self.critical_multiplier)
-            crit_text = " (CRIT!)"
 
         dealt = target.take_damage(base_dmg)
-        
-        return f"{self.name} hits {target.name}{crit_text} for {dealt} damage!"
+        if events is not None: events.emit(ev.ATTACK, self, target, dealt, is_crit)
 
-    def end_turn_update(self) -> List[str]:
-        logs = []
-        if self._temp_armor > 0:
-            self._temp_armor = 0
-            
+    def attack_target(self, target: 'Character') -> str:
+        if self._frozen_turns > 0:
+            return f"{self.name} is frozen and cannot attack"
+
+        events = ev.EventBuffer()
+        self.strike(target, random, events)
+        return ev.render_message(events.records[0])
+
+    def tick_frozen(self, events=None):
+        """Uses up one frozen turn; called for the action a frozen character skips."""
         if self._frozen_turns > 0:
             self._frozen_turns -= 1
-            if self._frozen_turns == 0:
-                logs.append(f"{self.name} thawed out")
-            else:
-                logs.append(f"{self.name} is frozen")
-
-        if self._doom_counter is not None:
-            self._doom_counter -= 1
-            if self._doom_counter <= 0 and self.is_alive():
-                self.health = 0
-                self._doom_counter = None
-                logs.append(f"☠️ DOOM claims {self.name}!")
-                
-        return logs
+            if events is not None:
+                events.emit(ev.STATUS_FROZEN if self._frozen_turns > 0 else ev.STATUS_THAWED, self)
+
+    def tick_status(self, events=None):
+        """Ends this character's turn outside a battle: freeze, then its own shield/doom timeline."""
+        self.tick_frozen(events)
+        if self._statuses is not None: self._statuses.end_turn(events)
+
+    def end_turn_update(self) -> List[str]:
+        events = ev.EventBuffer()
+        self.tick_status(events)
+        return [ev.render_message(e) for e in events]
 
     def equip(self, item: Item):
         self.equipment.append(item)
+        self.invalidate_stats()
         if hasattr(item, 'bonus_hp') and item.bonus_hp:
             self.health += item.bonus_hp
\ No newline at end of file
@@ -1,12 +1,30 @@
 import requests
 import os
-from functools import lru_cache
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Tuple
+
+from requests.adapters import HTTPAdapter
 
 from .entities import Character, Skill
+from .http_cache import HttpCache
 from infra.image_loader import cache_image
+from infra.persistence import DATA_DIR
 
 GENSHIN_API_URL = "https://genshin.jmp.blue"
+API_CACHE_DIR = DATA_DIR / "cache" / "api"
+# Requests in flight at once during a bulk import.
+IMPORT_CONCURRENCY = int(os.environ.get("SORTEM_IMPORT_CONCURRENCY", "8"))
+
+def make_session(pool_size: int = IMPORT_CONCURRENCY) -> requests.Session:
+    """Keep-alive session whose pool holds a connection per concurrent request."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Character data barely changes, so re-imports are served from disk and revalidated after the TTL.
+api_cache = HttpCache(API_CACHE_DIR, session=make_session())
 
 BASE_STATS_MOCK = {
     "max_hp": 15000,
@@ -17,13 +35,13 @@ BASE_STATS_MOCK = {
 def get_genshin_icon_url(char_slug: str) -> str:
     return f"{GENSHIN_API_URL}/characters/{char_slug}/icon-big"
 
-@lru_cache(maxsize=50)
-def fetch_genshin_character(name: str, level: int = 90) -> Character:
+def _fetch_genshin_data(name: str) -> Tuple[str, Dict[str, Any], str]:
+    """(slug, API data, local icon path); the network part of an import."""
     name_slug = name.lower().replace(' ', '-')
     char_url = f"{GENSHIN_API_URL}/characters/{name_slug}"
 
     try:
-        response = requests.get(char_url)
+        response = api_cache.get(char_url)
         if response.status_code == 404:
             raise ValueError(f"Genshin Character '{name}' not found. Check spelling")
         
@@ -38,7 +56,11 @@ def fetch_genshin_character(name: str, level: int = 90) -> Character:
     print(f"DEBUG: Downloading image for {name} from {remote_url}")
     local_icon_path = cache_image(remote_url, name)
     print(f"DEBUG: Saved raw path: {local_icon_path}")
+    return name_slug, data, local_icon_path
 
+def _map_genshin_character(name: str, name_slug: str, data: Dict[str, Any], local_icon_path: str,
+                           level: int) -> Character:
+    remote_url = get_genshin_icon_url(name_slug)
     web_icon_path = local_icon_path.replace("\\", "/")
     
     if "data/" in web_icon_path:
@@ -87,4 +109,33 @@ def fetch_genshin_character(name: str, level: int = 90) -> Character:
             }
         }
     )
-    return core_char
\ No newline at end of file
+    return core_char
+
+def fetch_genshin_character(name: str, level: int = 90) -> Character:
+    return _map_genshin_character(name, *_fetch_genshin_data(name), level)
+
+def list_genshin_characters() -> List[str]:
+    """Slugs of every character the API knows."""
+    try:
+        response = api_cache.get(f"{GENSHIN_API_URL}/characters")
+        response.raise_for_status()
+        return list(response.json())
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Network error during Genshin API request: {e}")
+
+def fetch_genshin_characters(names: Iterable[str], level: int = 90,
+                             concurrency: int = IMPORT_CONCURRENCY) -> Tuple[List[Character], Dict[str, Exception]]:
+    """Imports many characters, at most `concurrency` at a time over the shared session, then maps
+    them in one pass. Returns the characters in the order of `names` and the error of each one that failed.
+    Icon lookups of all workers share image_loader's bounded probe pool."""
+    names = list(dict.fromkeys(names))
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(names) or 1))) as pool:
+        futures = [(name, pool.submit(_fetch_genshin_data, name)) for name in names]
+
+    characters, errors = [], {}
+    for name, future in futures:
+        try:
+            characters.append(_map_genshin_character(name, *future.result(), level))
+        except Exception as e:
+            errors[name] = e
+    return characters, errors
\ No newline at end of file
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+
+from infra.atomic import atomic_write
+
+API_CACHE_TTL = 7 * 24 * 3600
+API_CACHE_MAX_BYTES = 16 * 2**20
+REQUEST_TIMEOUT = 10
+
+@dataclass
+class CachedResponse:
+    url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+class HttpCache:
+    """GET responses kept on disk, one file per URL: a JSON header line, then the raw body.
+
+    A response younger than `ttl` seconds is served without touching the network; an older one is
+    revalidated with If-None-Match / If-Modified-Since (a 304 just renews it) and still served if
+    the server cannot be reached. Only 200 responses are stored. File mtimes record the last
+    access, so the least recently used files are dropped once the directory exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory: Path, ttl: float = API_CACHE_TTL, max_bytes: int = API_CACHE_MAX_BYTES,
+                 session: Any = requests, timeout: float = REQUEST_TIMEOUT):
+        self.directory = Path(directory)
+        self.ttl, self.max_bytes = ttl, max_bytes
+        self.session, self.timeout = session, timeout
+        self.network_requests = 0
+        self._lock = threading.Lock()
+        self._sizes: Optional["OrderedDict[str, int]"] = None
+        self._total = 0
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.http"
+
+    def _index(self) -> "OrderedDict[str, int]":
+        """Sizes of the cached files, least recently used first; read from the directory once."""
+        if self._sizes is None:
+            found = []
+            if self.directory.exists():
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(".http"):
+                        st = entry.stat()
+                        found.append((st.st_mtime, entry.name[:-5], st.st_size))
+            found.sort()
+            self._sizes = OrderedDict((key, size) for _, key, size in found)
+            self._total = sum(self._sizes.values())
+        return self._sizes
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = json.loads(f.readline())
+                entry["content"] = f.read()
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def _touch(self, key: str):
+        with self._lock:
+            index = self._index()
+            if key in index:
+                index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _store(self, key: str, entry: Dict[str, Any]):
+        header = {k: v for k, v in entry.items() if k != "content"}
+        data = json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n" + entry["content"]
+        # The write (and its fsyncs) happens outside the lock so other lookups are not held up by
+        # it; the lock only covers the index. Should a concurrent eviction remove the file anyway,
+        # the next get() finds it missing and fetches it again.
+        with atomic_write(self._path(key)) as f:
+            f.write(data)
+        evicted = []
+        with self._lock:
+            index = self._index()
+            self._total += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            while self._total > self.max_bytes and len(index) > 1:
+                old, size = index.popitem(last=False)
+                self._total -= size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.unlink(self._path(old))
+            except OSError:
+                pass
+
+    def _response(self, entry: Dict[str, Any], from_cache: bool) -> CachedResponse:
+        return CachedResponse(entry["url"], entry["status"], entry["content"], entry.get("headers", {}), from_cache)
+
+    def get(self, url: str) -> CachedResponse:
+        key = self.key_for(url)
+        entry = self._read(key)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            self._touch(key)
+            return self._response(entry, True)
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            with self._lock:
+                self.network_requests += 1
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            if entry is None:
+                raise
+            self._touch(key)
+            return self._response(entry, True)
+
+        if response.status_code == 304 and entry is not None:
+            entry["fetched_at"] = time.time()
+            self._store(key, entry)
+            return self._response(entry, True)
+        if response.status_code != 200:
+            return CachedResponse(url, response.status_code, response.content, dict(response.headers))
+
+        entry = {"url": url, "status": 200, "fetched_at": time.time(),
+                 "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified"),
+                 "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+                 "content": response.content}
+        self._store(key, entry)
+        return self._response(entry, False)
+
+    def clear(self):
+        with self._lock:
+            for key in self._index():
+                try:
+                    os.unlink(self._path(key))
+                except OSError:
+                    pass
+            self._sizes, self._total = OrderedDict(), 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._index()), "bytes": self._total}
@@ -1,4 +1,7 @@
-from .genshin_adapter import fetch_genshin_character 
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .genshin_adapter import (fetch_genshin_character, fetch_genshin_characters, list_genshin_characters,
+                              IMPORT_CONCURRENCY)
 from .entities import Character
 
 def import_character(source: str, **kwargs) -> Character:
@@ -9,4 +12,15 @@ def import_character(source: str, **kwargs) -> Character:
         
         return fetch_genshin_character(kwargs["name"], int(kwargs.get("level", 90)))
         
+    raise ValueError(f"Unknown source: {source}. Only 'genshin' is supported")
+
+def import_characters(source: str, names: Optional[Sequence[str]] = None, level: int = 90,
+                      concurrency: int = IMPORT_CONCURRENCY) -> Tuple[List[Character], Dict[str, Exception]]:
+    """Imports `names` concurrently (every character of the source when None); returns the
+    characters and the error of each name that failed."""
+    if source == "genshin":
+        if names is None:
+            names = list_genshin_characters()
+        return fetch_genshin_characters(names, level, concurrency)
+
     raise ValueError(f"Unknown source: {source}. Only 'genshin' is supported")
\ No newline at end of file
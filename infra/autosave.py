@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+AUTOSAVE_INTERVAL = 60.0
+AUTOSAVE_EVERY_EVENTS = 2000
+
+# Takes the snapshot on the calling thread and returns the job that writes it (or None: nothing to save).
+Snapshot = Callable[[], Optional[Callable[[], Any]]]
+
+class AutosaveWorker(threading.Thread):
+    """Writes snapshots of the game state on its own thread so the game loop never waits for the disk.
+
+    `snapshot` is always called on the thread that calls notify() / request() (the game thread),
+    so it sees consistent state; it should only encode what changed and leave the I/O to the job it
+    returns, which runs here. A snapshot is taken after `every_events` notified events, on the
+    first event once `interval` seconds have passed since the last one, and on request(). A job
+    still waiting when a newer one arrives is replaced by it, so rapid saves never queue up.
+    """
+
+    def __init__(self, snapshot: Snapshot, interval: Optional[float] = AUTOSAVE_INTERVAL,
+                 every_events: Optional[int] = AUTOSAVE_EVERY_EVENTS):
+        super().__init__(name="autosave", daemon=True)
+        self._snapshot = snapshot
+        self.interval, self.every_events = interval, every_events
+        self._cond = threading.Condition()
+        self._job: Optional[Callable[[], Any]] = None
+        self._events = 0
+        self._last = time.monotonic()
+        self._stopping = False
+        self.saves = 0
+        self.last_error: Optional[Exception] = None
+
+    def notify(self, events: int = 1):
+        """Counts state changes; cheap enough to call once per battle turn."""
+        self._events += events
+        if ((self.every_events and self._events >= self.every_events)
+                or (self.interval is not None and time.monotonic() - self._last >= self.interval)):
+            self.request()
+
+    def request(self):
+        """Snapshots the state now and hands the write to the worker without waiting for it."""
+        self._events, self._last = 0, time.monotonic()
+        job = self._snapshot()
+        if job is None:
+            return
+        with self._cond:
+            self._job = job
+            self._cond.notify()
+
+    def checkpoint(self):
+        """Snapshots the changes notified since the last snapshot, if any; for the game thread to
+        call between commands."""
+        if self._events:
+            self.request()
+
+    def stop(self, snapshot: bool = True, timeout: Optional[float] = None):
+        """Ends the thread once the queued job is written. With `snapshot`, changes notified since
+        the last snapshot are snapshotted first, so only pass it from the game thread."""
+        if snapshot:
+            self.checkpoint()
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._job is None and not self._stopping:
+                    self._cond.wait()
+                job, self._job = self._job, None
+                if job is None:
+                    return
+            try:
+                job()
+                self.saves += 1
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"Autosave failed: {e}")
@@ -0,0 +1,395 @@
+"""Compact binary documents in a msgpack-style encoding with interned strings and record shapes.
+
+Layout: MAGIC, FORMAT_VERSION byte, header map, array key, records..., END byte, trailer map.
+Values use msgpack's type bytes; three ext types are specific to this format:
+
+- strings: map keys and strings up to INTERN_MAX_LEN chars are defined once (STR_DEF) and then
+  referenced by number (STR_REF), so repeated stat names cost 3 bytes;
+- shapes: a map's key tuple is defined once (SHAPE_DEF) and later maps with the same keys write a
+  SHAPE_REF followed by their values only;
+- int rows: a shaped map whose values are all 16-bit ints stores them packed (SHAPE_I16), which
+  decodes with a single struct call;
+- small lists of short scalars (encoded abilities like ["fireball", 30]) are defined once
+  (LIST_DEF) and then referenced (LIST_REF); the reader hands out a fresh copy each time.
+
+Both tables are built while writing and rebuilt while reading, so records stream one at a time.
+"""
+import struct
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+MAGIC = b"SRPGB"
+FORMAT_VERSION = 1
+END = 0xc1  # never used by msgpack
+STR_DEF = 1
+STR_REF = 2
+SHAPE_DEF = 3
+SHAPE_REF = 4
+SHAPE_I16 = 5
+LIST_DEF = 6
+LIST_REF = 7
+INTERN_LIST_LEN = 4
+INTERN_MAX_LEN = 16
+CHUNK_SIZE = 1 << 16
+
+_pack_b = struct.Struct(">b").pack
+_pack_h = struct.Struct(">h").pack
+_pack_i = struct.Struct(">i").pack
+_pack_q = struct.Struct(">q").pack
+_pack_d = struct.Struct(">d").pack
+_unpack_h, _unpack_H = struct.Struct(">h").unpack_from, struct.Struct(">H").unpack_from
+_unpack_i, _unpack_I = struct.Struct(">i").unpack_from, struct.Struct(">I").unpack_from
+_unpack_q, _unpack_d = struct.Struct(">q").unpack_from, struct.Struct(">d").unpack_from
+
+def _ref(out: bytearray, ext_type: int, n: int):
+    if n < 0x100: out += bytes((0xd4, ext_type, n))
+    elif n < 0x10000: out += bytes((0xd5, ext_type)) + n.to_bytes(2, "big")
+    else: out += bytes((0xd6, ext_type)) + n.to_bytes(4, "big")
+
+class Encoder:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.shapes: Dict[Tuple[str, ...], Tuple[int, struct.Struct]] = {}
+        self.lists: Dict[Tuple[Any, ...], int] = {}
+
+    def _str(self, out: bytearray, s: str, intern: bool):
+        if intern or len(s) <= INTERN_MAX_LEN:
+            ref = self.strings.get(s)
+            if ref is not None:
+                _ref(out, STR_REF, ref)
+                return
+            data = s.encode("utf-8")
+            self.strings[s] = len(self.strings)
+            if len(data) < 0x100: out += bytes((0xc7, len(data), STR_DEF))
+            else: out += b"\xc9" + len(data).to_bytes(4, "big") + bytes((STR_DEF,))
+            out += data
+            return
+        data = s.encode("utf-8")
+        n = len(data)
+        if n < 32: out.append(0xa0 | n)
+        elif n < 0x100: out += bytes((0xd9, n))
+        elif n < 0x10000: out += b"\xda" + n.to_bytes(2, "big")
+        else: out += b"\xdb" + n.to_bytes(4, "big")
+        out += data
+
+    def _map(self, out: bytearray, value: dict):
+        n = len(value)
+        keys = tuple(value)
+        if 0 < n < 0x100 and all(type(k) is str for k in keys):
+            shape = self.shapes.get(keys)
+            if shape is None:
+                shape = self.shapes[keys] = (len(self.shapes), struct.Struct(f">{n}h"))
+                out += bytes((0xd4, SHAPE_DEF, n))
+                for k in keys:
+                    self._str(out, k, True)
+            values = value.values()
+            if all(type(v) is int and -0x8000 <= v < 0x8000 for v in values):
+                _ref(out, SHAPE_I16, shape[0])
+                out += shape[1].pack(*values)
+            else:
+                _ref(out, SHAPE_REF, shape[0])
+                for v in values:
+                    self.encode(out, v)
+            return
+        if n < 16: out.append(0x80 | n)
+        elif n < 0x10000: out += b"\xde" + n.to_bytes(2, "big")
+        else: out += b"\xdf" + n.to_bytes(4, "big")
+        for k, v in value.items():
+            self._str(out, k if isinstance(k, str) else str(k), True)
+            self.encode(out, v)
+
+    def encode(self, out: bytearray, value: Any):
+        if value is None:
+            out.append(0xc0)
+        elif value is True:
+            out.append(0xc3)
+        elif value is False:
+            out.append(0xc2)
+        elif type(value) is int:
+            if 0 <= value < 0x80: out.append(value)
+            elif -32 <= value < 0: out.append(value & 0xff)
+            elif -0x80 <= value < 0x80: out += b"\xd0" + _pack_b(value)
+            elif -0x8000 <= value < 0x8000: out += b"\xd1" + _pack_h(value)
+            elif -0x80000000 <= value < 0x80000000: out += b"\xd2" + _pack_i(value)
+            else: out += b"\xd3" + _pack_q(value)
+        elif isinstance(value, str):
+            self._str(out, value, False)
+        elif isinstance(value, float):
+            out += b"\xcb" + _pack_d(value)
+        elif isinstance(value, dict):
+            self._map(out, value)
+        elif isinstance(value, (list, tuple)):
+            n = len(value)
+            if 0 < n <= INTERN_LIST_LEN and all(v is None or type(v) in (int, bool) or
+                                                (type(v) is str and len(v) <= INTERN_MAX_LEN) for v in value):
+                key = tuple((type(v), v) for v in value)
+                ref = self.lists.get(key)
+                if ref is not None:
+                    _ref(out, LIST_REF, ref)
+                    return
+                self.lists[key] = len(self.lists)
+                out += bytes((0xd4, LIST_DEF, 0))
+            if n < 16: out.append(0x90 | n)
+            elif n < 0x10000: out += b"\xdc" + n.to_bytes(2, "big")
+            else: out += b"\xdd" + n.to_bytes(4, "big")
+            for v in value:
+                self.encode(out, v)
+        elif isinstance(value, int):
+            self.encode(out, int(value))
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+class Decoder:
+    """Decodes values from `buf` starting at `pos`. Running off the end of the buffer raises
+    IndexError or struct.error (the caller reads more and retries)."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.shapes: List[Tuple[Tuple[str, ...], struct.Struct]] = []
+        self.lists: List[List[Any]] = []
+        self.buf = b""
+        self.pos = 0
+
+    def decode(self) -> Any:
+        buf = self.buf
+        pos = self.pos
+        b = buf[pos]
+        pos += 1
+        if b < 0x80:
+            self.pos = pos
+            return b
+        if b == 0xd4:
+            ext_type, n = buf[pos], buf[pos + 1]
+            self.pos = pos + 2
+            if ext_type == STR_REF: return self.strings[n]
+            if ext_type == LIST_REF: return self.lists[n][:]
+            return self._ext_ref(ext_type, n)
+        if 0xa0 <= b < 0xc0:
+            self.pos = pos
+            return self._raw_str(b & 0x1f)
+        if 0x90 <= b < 0xa0:
+            self.pos = pos
+            return self._values(b & 0x0f)
+        if b >= 0xe0:
+            self.pos = pos
+            return b - 0x100
+        if 0x80 <= b < 0x90:
+            self.pos = pos
+            return self._map(b & 0x0f)
+        if b == 0xc7:
+            n, ext_type = buf[pos], buf[pos + 1]
+            self.pos = pos + 2
+            return self._ext_def(ext_type, n)
+        if b == 0xc0: self.pos = pos; return None
+        if b == 0xc2: self.pos = pos; return False
+        if b == 0xc3: self.pos = pos; return True
+        if b == 0xd5:
+            ext_type, n = buf[pos], _unpack_H(buf, pos + 1)[0]
+            self.pos = pos + 3
+            return self._ext_ref(ext_type, n)
+        if b == 0xd6:
+            ext_type, n = buf[pos], _unpack_I(buf, pos + 1)[0]
+            self.pos = pos + 5
+            return self._ext_ref(ext_type, n)
+        if b == 0xc9:
+            n, ext_type = _unpack_I(buf, pos)[0], buf[pos + 4]
+            self.pos = pos + 5
+            return self._ext_def(ext_type, n)
+        if b == 0xcb:
+            val = _unpack_d(buf, pos)[0]
+            self.pos = pos + 8
+            return val
+        if b == 0xd0:
+            v = buf[pos]
+            self.pos = pos + 1
+            return v - 0x100 if v >= 0x80 else v
+        if b in (0xd1, 0xd2, 0xd3):
+            unpack, size = {0xd1: (_unpack_h, 2), 0xd2: (_unpack_i, 4), 0xd3: (_unpack_q, 8)}[b]
+            val = unpack(buf, pos)[0]
+            self.pos = pos + size
+            return val
+        if b in (0xd9, 0xda, 0xdb):
+            size = {0xd9: 1, 0xda: 2, 0xdb: 4}[b]
+            n = self._length(pos, size)
+            return self._raw_str(n)
+        if b in (0xdc, 0xdd):
+            n = self._length(pos, 2 if b == 0xdc else 4)
+            return [self.decode() for _ in range(n)]
+        if b in (0xde, 0xdf):
+            n = self._length(pos, 2 if b == 0xde else 4)
+            return self._map(n)
+        raise ValueError(f"Unsupported type byte 0x{b:02x} at offset {pos - 1}")
+
+    def _length(self, pos: int, size: int) -> int:
+        if pos + size > len(self.buf):
+            raise IndexError("buffer ends mid-value")
+        self.pos = pos + size
+        return int.from_bytes(self.buf[pos:pos + size], "big")
+
+    def _raw_str(self, n: int) -> str:
+        pos = self.pos
+        if pos + n > len(self.buf):
+            raise IndexError("buffer ends mid-value")
+        self.pos = pos + n
+        return self.buf[pos:pos + n].decode("utf-8")
+
+    def _ext_ref(self, ext_type: int, n: int) -> Any:
+        if ext_type == STR_REF:
+            return self.strings[n]
+        if ext_type == LIST_REF:
+            return self.lists[n][:]
+        if ext_type == SHAPE_I16:
+            keys, row = self.shapes[n]
+            pos = self.pos
+            values = row.unpack_from(self.buf, pos)
+            self.pos = pos + row.size
+            return dict(zip(keys, values))
+        if ext_type == SHAPE_REF:
+            return dict(zip(self.shapes[n][0], self._values(len(self.shapes[n][0]))))
+        if ext_type == SHAPE_DEF:
+            keys = tuple(self.decode() for _ in range(n))
+            self.shapes.append((keys, struct.Struct(f">{n}h")))
+            return self.decode()
+        if ext_type == LIST_DEF:
+            value = self.decode()
+            self.lists.append(value)
+            return value[:]
+        raise ValueError(f"Unsupported ext type {ext_type}")
+
+    def _values(self, count: int) -> List[Any]:
+        """`count` consecutive values; small ints, interned strings and lists and empty containers
+        are read inline."""
+        buf, strings, lists, decode = self.buf, self.strings, self.lists, self.decode
+        pos = self.pos
+        values = []
+        append = values.append
+        for _ in range(count):
+            b = buf[pos]
+            if b < 0x80:
+                append(b)
+                pos += 1
+            elif b == 0xd4 and buf[pos + 1] == STR_REF:
+                append(strings[buf[pos + 2]])
+                pos += 3
+            elif b == 0xd4 and buf[pos + 1] == LIST_REF:
+                append(lists[buf[pos + 2]][:])
+                pos += 3
+            elif b == 0x90:
+                append([])
+                pos += 1
+            elif b == 0x80:
+                append({})
+                pos += 1
+            else:
+                self.pos = pos
+                append(decode())
+                pos = self.pos
+        self.pos = pos
+        return values
+
+    def _ext_def(self, ext_type: int, n: int) -> str:
+        if ext_type != STR_DEF:
+            raise ValueError(f"Unsupported ext type {ext_type}")
+        s = self._raw_str(n)
+        self.strings.append(s)
+        return s
+
+    def _map(self, n: int) -> Dict[str, Any]:
+        decode = self.decode
+        return {decode(): decode() for _ in range(n)}
+
+def dumps(value: Any) -> bytes:
+    out = bytearray()
+    Encoder().encode(out, value)
+    return bytes(out)
+
+def loads(data: bytes) -> Any:
+    dec = Decoder()
+    dec.buf = data
+    return dec.decode()
+
+Trailer = Union[Dict[str, Any], Callable[[], Dict[str, Any]], None]
+
+def write_document(f: IO[bytes], header: Dict[str, Any], key: str, records: Iterable[Any],
+                   trailer: Trailer = None) -> int:
+    """Binary counterpart of jsonstream.write_document; `trailer` may be a callable evaluated
+    after the records are written."""
+    enc = Encoder()
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    enc.encode(out, header)
+    enc.encode(out, key)
+    count = 0
+    for record in records:
+        enc.encode(out, record)
+        count += 1
+        if len(out) >= CHUNK_SIZE:
+            f.write(out)
+            out.clear()
+    out.append(END)
+    enc.encode(out, (trailer() if callable(trailer) else trailer) or {})
+    f.write(out)
+    return count
+
+class _Reader:
+    def __init__(self, f: IO[bytes], chunk_size: int):
+        self.f, self.chunk_size, self.eof = f, chunk_size, False
+        self.dec = Decoder()
+
+    def _more(self) -> bool:
+        dec = self.dec
+        if self.eof:
+            return False
+        rest = dec.buf[dec.pos:]
+        chunk = self.f.read(max(self.chunk_size, len(rest)))
+        if not chunk:
+            self.eof = True
+            return False
+        dec.buf, dec.pos = rest + chunk, 0
+        return True
+
+    def at_end(self) -> bool:
+        dec = self.dec
+        while dec.pos >= len(dec.buf):
+            if not self._more():
+                raise ValueError("Unexpected end of file")
+        if dec.buf[dec.pos] == END:
+            dec.pos += 1
+            return True
+        return False
+
+    def value(self) -> Any:
+        dec = self.dec
+        while True:
+            pos, strings, shapes, lists = dec.pos, len(dec.strings), len(dec.shapes), len(dec.lists)
+            try:
+                return dec.decode()
+            except (IndexError, struct.error):
+                dec.pos = pos
+                del dec.strings[strings:]
+                del dec.shapes[shapes:]
+                del dec.lists[lists:]
+                if not self._more():
+                    raise ValueError("Unexpected end of file") from None
+
+def read_header(f: IO[bytes], chunk_size: int = CHUNK_SIZE) -> Tuple[str, Dict[str, Any], Iterator[Any]]:
+    """(array key, fields, records); trailer fields are added to `fields` once records are exhausted."""
+    magic = f.read(len(MAGIC) + 1)
+    if magic[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary save file")
+    if magic[len(MAGIC)] > FORMAT_VERSION:
+        raise ValueError(f"Binary save format {magic[len(MAGIC)]} is newer than supported ({FORMAT_VERSION})")
+    r = _Reader(f, chunk_size)
+    fields = dict(r.value())
+    key = r.value()
+
+    def records() -> Iterator[Any]:
+        while not r.at_end():
+            yield r.value()
+        fields.update(r.value())
+    return key, fields, records()
+
+def read_document(f: IO[bytes], key: str, chunk_size: int = CHUNK_SIZE) -> Tuple[Dict[str, Any], Iterator[Any]]:
+    found, fields, records = read_header(f, chunk_size)
+    if found != key:
+        raise ValueError(f"Expected a '{key}' document, found '{found}'")
+    return fields, records
@@ -0,0 +1,140 @@
+from collections.abc import MutableSequence
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+# (ref, id, name, level); `ref` is whatever the source needs to build that character later.
+Entry = Tuple[Any, Any, str, int]
+
+PAGE_SIZE = 20
+BATCH_SIZE = 500
+
+def _entry_of(c: Any) -> Entry:
+    return (None, getattr(c, "id", None), getattr(c, "name", ""), getattr(c, "level", 1))
+
+class LazyCatalog(MutableSequence):
+    """engine.characters backed by a catalog index of ids, names and levels.
+
+    Characters are built by `load_many(refs)` the first time they are accessed (in batches when
+    iterating or slicing) and kept afterwards; names of untouched characters come from the index.
+    """
+
+    def __init__(self, entries: Sequence[Entry] = (), load_many: Optional[Callable[[List[Any]], List[Any]]] = None,
+                 source: Any = None):
+        self._entries: List[Entry] = list(entries)
+        self._chars: List[Optional[Any]] = [None] * len(self._entries)
+        self._load_many = load_many
+        self.source = source
+
+    def _materialize(self, indices):
+        missing = [i for i in indices if self._chars[i] is None]
+        if missing:
+            built = self._load_many([self._entries[i][0] for i in missing])
+            for i, c in zip(missing, built):
+                self._chars[i] = c
+
+    def __len__(self) -> int:
+        return len(self._chars)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            indices = range(len(self._chars))[i]
+            self._materialize(indices)
+            return [self._chars[j] for j in indices]
+        c = self._chars[i]
+        if c is None:
+            i = range(len(self._chars))[i]
+            self._materialize((i,))
+            c = self._chars[i]
+        return c
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            value = list(value)
+            self._chars[i] = value
+            self._entries[i] = [_entry_of(c) for c in value]
+        else:
+            self._chars[i] = value
+            self._entries[i] = _entry_of(value)
+
+    def __delitem__(self, i):
+        del self._chars[i]
+        del self._entries[i]
+
+    def insert(self, i: int, value: Any):
+        self._chars.insert(i, value)
+        self._entries.insert(i, _entry_of(value))
+
+    def clear(self):
+        self._chars.clear()
+        self._entries.clear()
+
+    def copy(self) -> 'LazyCatalog':
+        """Snapshot of the slots (not the characters): later inserts, deletes and replacements on
+        either catalog do not show up in the other. Costs two list copies, nothing is built."""
+        clone = LazyCatalog((), self._load_many, self.source)
+        clone._entries, clone._chars = list(self._entries), list(self._chars)
+        return clone
+
+    def __iter__(self) -> Iterator[Any]:
+        start = 0
+        while start < len(self._chars):
+            yield from self[start:start + BATCH_SIZE]
+            start += BATCH_SIZE
+
+    def __contains__(self, value: Any) -> bool:
+        # A character that was never built cannot be an object the caller holds.
+        return any(c is value or c == value for c in self._chars if c is not None)
+
+    def __add__(self, other) -> list:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> list:
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        return f"LazyCatalog({len(self)} characters, {self.loaded_count} loaded)"
+
+    @property
+    def loaded_count(self) -> int:
+        return len(self._chars) - self._chars.count(None)
+
+    def name_at(self, i: int) -> str:
+        c = self._chars[i]
+        return c.name if c is not None else self._entries[i][2]
+
+    def names(self) -> List[str]:
+        return [self.name_at(i) for i in range(len(self._chars))]
+
+    def find(self, name: str, ignore_case: bool = False) -> Optional[Any]:
+        """First character called `name`, building only that one."""
+        if ignore_case: name = name.lower()
+        for i in range(len(self._chars)):
+            n = self.name_at(i)
+            if (n.lower() if ignore_case else n) == name:
+                return self[i]
+        return None
+
+    def build_detached(self, refs: List[Any]) -> List[Any]:
+        """Characters for `refs` that the catalog does not keep; since nothing shared is touched,
+        another thread may call this (e.g. to write a snapshot of slots() out)."""
+        return self._load_many(list(refs))
+
+    def slots(self) -> Iterator[Tuple[int, Optional[Any], Any]]:
+        """(index, character or None if never built, ref) for backends saving without building everything."""
+        for i, c in enumerate(self._chars):
+            yield i, c, self._entries[i][0]
+
+def find_by_name(characters: Sequence[Any], name: str, ignore_case: bool = False) -> Optional[Any]:
+    if isinstance(characters, LazyCatalog):
+        return characters.find(name, ignore_case)
+    if ignore_case:
+        name = name.lower()
+        return next((c for c in characters if c.name.lower() == name), None)
+    return next((c for c in characters if c.name == name), None)
+
+def page_count(characters: Sequence[Any], size: int = PAGE_SIZE) -> int:
+    return max(1, -(-len(characters) // size))
+
+def page_of(characters: Sequence[Any], number: int, size: int = PAGE_SIZE) -> List[Any]:
+    """1-based page; slicing a LazyCatalog builds just that page."""
+    start = (number - 1) * size
+    return list(characters[start:start + size])
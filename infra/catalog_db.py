@@ -0,0 +1,254 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.game import registry
+from infra.catalog import LazyCatalog
+
+SQLITE_SUFFIXES = frozenset((".db", ".sqlite", ".sqlite3"))
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    key INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    game TEXT,
+    level INTEGER,
+    encoding INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_characters_name ON characters(name);
+CREATE INDEX IF NOT EXISTS idx_characters_game ON characters(game);
+CREATE INDEX IF NOT EXISTS idx_characters_level ON characters(level);
+"""
+
+UPSERT = ("INSERT INTO characters (key, id, name, game, level, encoding, data) VALUES (?, ?, ?, ?, ?, ?, ?) "
+          "ON CONFLICT(key) DO UPDATE SET id = excluded.id, name = excluded.name, game = excluded.game, "
+          "level = excluded.level, encoding = excluded.encoding, data = excluded.data")
+
+Row = Tuple[int, str, str, Any, Any, int, str]
+State = Tuple[Optional[int], Tuple[Any, ...]]
+# (rows to upsert, keys to delete, states the upserted rows were written from)
+SavePlan = Tuple[List[Row], List[Tuple[int]], Dict[int, State]]
+
+def is_sqlite_path(path: Path) -> bool:
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+class SqliteCatalog:
+    """Character catalog kept in a SQLite file (WAL journal, one row per character).
+
+    Rows are keyed by a surrogate `_catalog_key` stamped on each character this catalog loads or
+    saves. A save compares every character's `_revision` (bumped by stat and equipment writes) and
+    a cheap fingerprint of its name, game, level and ability count with what was last written, so
+    only changed rows are serialized and the whole batch goes out in one transaction.
+
+    commit() writes through a connection of its own and takes the catalog lock only to merge what
+    it wrote, so the game thread can prepare() the next save or read while a commit is on disk.
+    """
+    _open: Dict[str, 'SqliteCatalog'] = {}
+    _open_lock = threading.Lock()
+
+    def __init__(self, path: Path, encode: Callable[[Any], Dict[str, Any]],
+                 decode: Callable[[Dict[str, Any], Optional[int]], Any]):
+        self.path = Path(path)
+        self.token = str(self.path.resolve())
+        self._encode = encode
+        self._decode = decode
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        # Every key in the table; the value is what was last written for a tracked character.
+        self._known: Dict[int, Optional[State]] = {k: None for (k,) in self._conn.execute("SELECT key FROM characters")}
+        self._next_key = max(self._known, default=0) + 1
+
+    @classmethod
+    def open(cls, path: Path, encode, decode) -> 'SqliteCatalog':
+        """Shared instance per file, so change tracking survives between save/load calls."""
+        token = str(Path(path).resolve())
+        with cls._open_lock:
+            catalog = cls._open.get(token)
+            if catalog is None:
+                catalog = cls._open[token] = cls(path, encode, decode)
+            return catalog
+
+    @classmethod
+    def close_all(cls):
+        with cls._open_lock:
+            for catalog in cls._open.values():
+                catalog._close_connections()
+            cls._open.clear()
+
+    def close(self):
+        with self._open_lock:
+            if self._open.get(self.token) is self: del self._open[self.token]
+        self._close_connections()
+
+    def _close_connections(self):
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        self._conn.close()
+
+    @staticmethod
+    def _state(c: Any) -> State:
+        return (getattr(c, "_revision", None),
+                (getattr(c, "name", None), getattr(c, "game", None), getattr(c, "level", None),
+                 len(getattr(c, "skills", ()))))
+
+    def _row(self, key: int, c: Any) -> Row:
+        d = self._encode(c)
+        return (key, str(d["id"]), d["name"], d["game"], d["level"], registry.ENCODING_VERSION,
+                json.dumps(d, ensure_ascii=False, separators=(",", ":")))
+
+    def _key_of(self, c: Any) -> Optional[int]:
+        ck = getattr(c, "_catalog_key", None)
+        return ck[1] if ck is not None and ck[0] == self.token else None
+
+    def _stamp(self, c: Any, key: int):
+        try:
+            c._catalog_key = (self.token, key)
+        except AttributeError:
+            pass
+
+    def _new_key(self) -> int:
+        key = self._next_key
+        self._next_key += 1
+        return key
+
+    def save(self, characters: List[Any]) -> int:
+        """Makes the table hold exactly `characters`; returns how many rows were written or deleted."""
+        return self.commit(self.prepare(characters))
+
+    def prepare(self, characters: List[Any]) -> SavePlan:
+        """First half of save(), run where `characters` may be read safely: assigns keys and encodes
+        the changed rows. commit() then only touches the database, so it can run on another thread.
+        A newer plan covers everything an uncommitted older one would write, so old plans may be dropped."""
+        with self._lock:
+            rows: List[Row] = []
+            written: Dict[int, State] = {}
+            keep = set()
+            for i, c, ref in self._slots(characters):
+                if c is None:
+                    if ref in self._known and ref not in keep:
+                        keep.add(ref)
+                        continue
+                    c = characters[i]
+                key = self._key_of(c)
+                if key is None or key in keep:
+                    key = self._new_key()
+                    self._stamp(c, key)
+                keep.add(key)
+                state = self._state(c)
+                if state[0] is None or self._known.get(key) != state:
+                    rows.append(self._row(key, c))
+                    written[key] = state
+            removed = [(k,) for k in self._known if k not in keep]
+            return rows, removed, written
+
+    def commit(self, plan: SavePlan) -> int:
+        """Writes a prepare()d plan in one transaction; returns how many rows were written or deleted.
+
+        Until the merge, prepare() still sees the old states, so a plan made meanwhile repeats these
+        rows at worst."""
+        rows, removed, written = plan
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = sqlite3.connect(str(self.path), check_same_thread=False)
+                self._writer.execute("PRAGMA synchronous=NORMAL")
+            with self._writer:
+                self._writer.executemany("DELETE FROM characters WHERE key = ?", removed)
+                self._writer.executemany(UPSERT, rows)
+        with self._lock:
+            for (k,) in removed:
+                self._known.pop(k, None)
+            self._known.update(written)
+        return len(rows) + len(removed)
+
+    def _slots(self, characters: List[Any]):
+        """Characters of one of our own LazyCatalogs that were never built are unchanged rows."""
+        if isinstance(characters, LazyCatalog) and characters.source is self:
+            return characters.slots()
+        return ((i, c, None) for i, c in enumerate(characters))
+
+    def upsert(self, c: Any) -> bool:
+        """Writes one character without looking at the rest of the catalog; False if it was unchanged."""
+        with self._lock:
+            key = self._key_of(c)
+            if key is None:
+                key = self._new_key()
+                self._stamp(c, key)
+            state = self._state(c)
+            if state[0] is not None and self._known.get(key) == state:
+                return False
+            with self._conn:
+                self._conn.execute(UPSERT, self._row(key, c))
+            self._known[key] = state
+            return True
+
+    def delete(self, c: Any) -> bool:
+        with self._lock:
+            key = self._key_of(c)
+            if key is None or key not in self._known:
+                return False
+            with self._conn:
+                self._conn.execute("DELETE FROM characters WHERE key = ?", (key,))
+            del self._known[key]
+            c._catalog_key = None
+            return True
+
+    def _materialize(self, rows) -> List[Any]:
+        out = []
+        for key, encoding, data in rows:
+            c = self._decode(json.loads(data), encoding)
+            self._stamp(c, key)
+            self._known[key] = self._state(c)
+            out.append(c)
+        return out
+
+    def load(self) -> List[Any]:
+        with self._lock:
+            return self._materialize(self._conn.execute("SELECT key, encoding, data FROM characters ORDER BY key"))
+
+    def get_many(self, keys: List[int]) -> List[Any]:
+        by_key = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                rows = self._conn.execute("SELECT key, encoding, data FROM characters WHERE key IN "
+                                          f"({','.join('?' * len(part))})", part).fetchall()
+                by_key.update(zip((r[0] for r in rows), self._materialize(rows)))
+        return [by_key[k] for k in keys]
+
+    def lazy(self) -> LazyCatalog:
+        """Catalog index (key, id, name, level) only; characters are built on first access."""
+        with self._lock:
+            entries = self._conn.execute("SELECT key, id, name, level FROM characters ORDER BY key").fetchall()
+        return LazyCatalog(entries, self.get_many, source=self)
+
+    def find(self, name: Optional[str] = None, game: Optional[str] = None,
+             min_level: Optional[int] = None, max_level: Optional[int] = None) -> List[Any]:
+        """Indexed lookup; every given filter must match."""
+        clauses, params = [], []
+        for clause, value in (("name = ?", name), ("game = ?", game),
+                              ("level >= ?", min_level), ("level <= ?", max_level)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._materialize(self._conn.execute(
+                f"SELECT key, encoding, data FROM characters{where} ORDER BY key", params))
+
+    def __len__(self) -> int:
+        return len(self._known)
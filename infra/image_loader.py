@@ -1,7 +1,18 @@
+import atexit
+import hashlib
+import json
 import os
 import sys
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+
+from infra.atomic import atomic_write
 
 def get_root_dir():
     if getattr(sys, 'frozen', False):
@@ -29,69 +40,377 @@ ALIASES = {
     "Traveler": "PlayerBoy",
 }
 
+# Icon mirrors, formatted with the name variant capitalised ({cap}) or lower-cased ({lower}).
+MIRRORS = {
+    "enka": "https://enka.network/ui/UI_AvatarIcon_{cap}.png",
+    "hoyolab": "https://upload-os-bbs.mihoyo.com/game_record/genshin/character_icon/UI_AvatarIcon_{cap}.png",
+    "fortoffans": "https://raw.githubusercontent.com/FortOfFans/GenShin/main/icon/{lower}.png",
+    "ambr": "https://api.ambr.top/assets/UI/UI_AvatarIcon_{cap}.png",
+}
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PROBE_TIMEOUT = 5
+# Most spellings _name_variations yields; a lookup has at most this many candidates per mirror and
+# probes them all at once, so it never waits much more than one timeout.
+MAX_SPELLINGS = 7
+# "<mirror>/<name rule>" -> times that pattern delivered the icon; the best are probed first.
+MIRROR_STATS_FILE = CACHE_DIR / "mirror_stats.json"
+# Names no mirror had: cache key -> {"expires_at": time, "tried": [urls]}. Until an entry expires
+# only candidates missing from "tried" (say, from a new alias or mirror) are probed.
+MISSING_FILE = CACHE_DIR / "missing.json"
+MISSING_TTL = 3 * 24 * 3600
+# Expiry instead when some probe failed on a network error rather than a 404, e.g. while offline.
+MISSING_RETRY_TTL = 10 * 60
+# Cached icons: cache key -> {"file", "size", "sha256", "last_access"}. Read once, then every lookup
+# is a dict hit; rebuilt from the directory if missing.
+MANIFEST_FILE = CACHE_DIR / "manifest.json"
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("SORTEM_IMAGE_CACHE_MB", "200")) * 2**20
+# Access times alone are written back at most this often (and at exit).
+MANIFEST_FLUSH_INTERVAL = 60
+
+_session: Optional[requests.Session] = None
+_stats: Optional[Dict[str, int]] = None
+_missing: Optional[Dict[str, Dict[str, Any]]] = None
+_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+_manifest_flushed = 0.0
+_manifest_dirty = False
+_lock = threading.Lock()
+_manifest_lock = threading.RLock()
+
 def ensure_cache_dir():
     if not CACHE_DIR.exists():
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-def get_name_variations(char_name: str) -> list[str]:
+def _name_variations(char_name: str) -> List[Tuple[str, str]]:
+    """(rule, name) pairs, one per distinct spelling the mirrors might use."""
     variations = []
     clean_name = char_name.strip()
     
     if clean_name in ALIASES:
-        variations.append(ALIASES[clean_name])
+        variations.append(("alias", ALIASES[clean_name]))
 
     parts = clean_name.split()
 
     if len(parts) > 1:
-        variations.append(parts[-1])
-        variations.append(parts[-1].capitalize()) 
-        variations.append("".join(parts).capitalize())
+        variations.append(("last", parts[-1]))
+        variations.append(("last_cap", parts[-1].capitalize()))
+        variations.append(("joined_cap", "".join(parts).capitalize()))
 
-    variations.append(clean_name.replace(" ", ""))
-    variations.append(clean_name.replace(" ", "").capitalize())
-    variations.append(clean_name.replace(" ", "_").lower())
-    
-    return list(dict.fromkeys(variations))
+    variations.append(("nospace", clean_name.replace(" ", "")))
+    variations.append(("nospace_cap", clean_name.replace(" ", "").capitalize()))
+    variations.append(("snake", clean_name.replace(" ", "_").lower()))
 
-def cache_image(original_url: str, char_name: str) -> str:
+    seen = set()
+    return [(rule, name) for rule, name in variations if name and not (name in seen or seen.add(name))]
+
+def get_name_variations(char_name: str) -> list[str]:
+    return [name for _, name in _name_variations(char_name)]
+
+def probe_workers() -> int:
+    """Most probes one lookup runs at once: all of its candidates fit in a single wave. Each lookup
+    has its own probes, so one that waits out timeouts never holds up another's."""
+    return MAX_SPELLINGS * len(MIRRORS)
+
+def _get_session() -> requests.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            # A connection per probe thread, whichever host they all happen to hit.
+            adapter = HTTPAdapter(pool_connections=len(MIRRORS), pool_maxsize=probe_workers())
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def _mirror_stats() -> Dict[str, int]:
+    global _stats
+    if _stats is None:
+        try:
+            _stats = json.loads(MIRROR_STATS_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _stats = {}
+    return _stats
+
+def _record_win(pattern: str):
+    with _lock:
+        stats = _mirror_stats()
+        stats[pattern] = stats.get(pattern, 0) + 1
+        try:
+            with atomic_write(MIRROR_STATS_FILE, "w", encoding="utf-8") as f:
+                json.dump(stats, f)
+        except OSError:
+            pass
+
+def _missing_entries() -> Dict[str, Dict[str, Any]]:
+    global _missing
+    if _missing is None:
+        try:
+            _missing = json.loads(MISSING_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _missing = {}
+    return _missing
+
+def _save_missing():
+    now = time.time()
+    live = {k: v for k, v in _missing_entries().items() if v["expires_at"] > now}
+    try:
+        with atomic_write(MISSING_FILE, "w", encoding="utf-8") as f:
+            json.dump(live, f)
+    except OSError:
+        pass
+
+def _tried_before(key: str) -> set:
+    with _lock:
+        entry = _missing_entries().get(key)
+        if entry is None or entry["expires_at"] <= time.time():
+            return set()
+        return set(entry["tried"])
+
+def _record_missing(key: str, tried: List[str], ttl: float):
+    with _lock:
+        entries = _missing_entries()
+        previous = entries.get(key)
+        expires_at = time.time() + ttl
+        if previous is not None and previous["expires_at"] > time.time():
+            tried = list(dict.fromkeys(previous["tried"] + tried))
+            expires_at = min(expires_at, previous["expires_at"])
+        entries[key] = {"expires_at": expires_at, "tried": tried}
+        _save_missing()
+
+def _forget_missing(key: str):
+    with _lock:
+        if _missing_entries().pop(key, None) is not None:
+            _save_missing()
+
+def clear_missing(char_name: Optional[str] = None) -> int:
+    """Forgets failed lookups (all of them, or just `char_name`'s) so they are probed again;
+    returns how many were dropped."""
+    with _lock:
+        entries = _missing_entries()
+        if char_name is None:
+            dropped = len(entries)
+            entries.clear()
+        else:
+            dropped = 1 if entries.pop(_cache_key(char_name), None) is not None else 0
+        _save_missing()
+    return dropped
+
+def missing_count() -> int:
+    now = time.time()
+    with _lock:
+        return sum(1 for v in _missing_entries().values() if v["expires_at"] > now)
+
+def _cache_key(char_name: str) -> str:
+    return char_name.strip().lower().replace(' ', '_')
+
+def is_valid_png(data: bytes) -> bool:
+    """Signature, IHDR first and IEND last: catches error pages and truncated downloads."""
+    return data.startswith(PNG_SIGNATURE) and data[12:16] == b'IHDR' and data[-8:-4] == b'IEND'
+
+def _scan_images() -> Dict[str, Dict[str, Any]]:
+    """Manifest entries for the PNGs already in CACHE_DIR; files that are not valid PNGs are removed."""
+    entries = {}
+    if not CACHE_DIR.exists():
+        return entries
+    for path in CACHE_DIR.glob("*.png"):
+        try:
+            data = path.read_bytes()
+            if not is_valid_png(data):
+                path.unlink()
+                continue
+            entries[path.stem] = {"file": path.name, "size": len(data), "sha256": hashlib.sha256(data).hexdigest(),
+                                  "last_access": path.stat().st_mtime}
+        except OSError:
+            continue
+    return entries
+
+def _manifest_entries() -> Dict[str, Dict[str, Any]]:
+    global _manifest, _manifest_flushed
+    with _manifest_lock:
+        if _manifest is None:
+            try:
+                _manifest = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                _manifest = _scan_images()
+                _save_manifest()
+            _manifest_flushed = time.time()
+        return _manifest
+
+def _save_manifest():
+    global _manifest_dirty, _manifest_flushed
+    with _manifest_lock:
+        if _manifest is None:
+            return
+        try:
+            with atomic_write(MANIFEST_FILE, "w", encoding="utf-8") as f:
+                json.dump(_manifest, f)
+            _manifest_dirty, _manifest_flushed = False, time.time()
+        except OSError:
+            pass
+
+def flush_manifest():
+    """Writes back access times that are still only in memory."""
+    if _manifest_dirty:
+        _save_manifest()
+
+atexit.register(flush_manifest)
+
+def _cached_path(key: str) -> Optional[str]:
+    global _manifest_dirty
+    with _manifest_lock:
+        entry = _manifest_entries().get(key)
+        if entry is None:
+            return None
+        entry["last_access"] = time.time()
+        _manifest_dirty = True
+        if entry["last_access"] - _manifest_flushed > MANIFEST_FLUSH_INTERVAL:
+            _save_manifest()
+        return str(CACHE_DIR / entry["file"])
+
+def _evict(max_bytes: int, keep: Optional[str] = None) -> Tuple[int, int]:
+    """Drops least recently used icons until the cache fits `max_bytes`; (files, bytes) removed."""
+    with _manifest_lock:
+        entries = _manifest_entries()
+        total = sum(e["size"] for e in entries.values())
+        removed = freed = 0
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = entries.pop(key)
+            try:
+                os.unlink(CACHE_DIR / entry["file"])
+            except OSError:
+                pass
+            total -= entry["size"]
+            removed, freed = removed + 1, freed + entry["size"]
+        return removed, freed
+
+def _store_image(key: str, data: bytes) -> str:
+    if not is_valid_png(data):
+        raise ValueError(f"Not a complete PNG for '{key}'")
     ensure_cache_dir()
-    
-    save_filename = f"{char_name.strip().lower().replace(' ', '_')}.png"
-    local_path = CACHE_DIR / save_filename
-    
-    if local_path.exists() and local_path.stat().st_size > 0:
-        return str(local_path)
+    filename = f"{key}.png"
+    with atomic_write(CACHE_DIR / filename) as f:
+        f.write(data)
+    with _manifest_lock:
+        _manifest_entries()[key] = {"file": filename, "size": len(data), "sha256": hashlib.sha256(data).hexdigest(),
+                                    "last_access": time.time()}
+        _evict(IMAGE_CACHE_MAX_BYTES, keep=key)
+        _save_manifest()
+    return str(CACHE_DIR / filename)
 
-    print(f"⬇ Downloading image for [{char_name}]..")
-    
-    possible_names = get_name_variations(char_name)
-    
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    
-    for name_variant in possible_names:
-        
+def image_cache_stats() -> Dict[str, Any]:
+    with _manifest_lock:
+        entries = _manifest_entries()
+        return {"files": len(entries), "bytes": sum(e["size"] for e in entries.values()),
+                "max_bytes": IMAGE_CACHE_MAX_BYTES, "missing": missing_count()}
+
+def prune_image_cache(max_bytes: Optional[int] = None) -> Dict[str, int]:
+    """Re-checks every cached icon against its recorded hash, dropping missing or corrupt ones,
+    then evicts least recently used icons down to `max_bytes` (default: the configured cap)."""
+    corrupt = 0
+    with _manifest_lock:
+        entries = _manifest_entries()
+        for key, entry in list(entries.items()):
+            try:
+                data = (CACHE_DIR / entry["file"]).read_bytes()
+            except OSError:
+                data = b""
+            if hashlib.sha256(data).hexdigest() != entry["sha256"] or not is_valid_png(data):
+                del entries[key]
+                corrupt += 1
+                try:
+                    os.unlink(CACHE_DIR / entry["file"])
+                except OSError:
+                    pass
+        removed, freed = _evict(IMAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes)
+        _save_manifest()
+    return {"corrupt": corrupt, "evicted": removed, "freed": freed}
+
+def candidate_urls(char_name: str) -> List[Tuple[str, str, str]]:
+    """(pattern, name variant, url) for every mirror and spelling; patterns that won before go first,
+    then mirrors that won for other spellings."""
+    candidates, seen = [], set()
+    for rule, name_variant in _name_variations(char_name):
         name_cap = name_variant[0].upper() + name_variant[1:]
         name_lower = name_variant.lower()
-        
-        sources = [
-            f"https://enka.network/ui/UI_AvatarIcon_{name_cap}.png",
-            f"https://upload-os-bbs.mihoyo.com/game_record/genshin/character_icon/UI_AvatarIcon_{name_cap}.png",
-            f"https://raw.githubusercontent.com/FortOfFans/GenShin/main/icon/{name_lower}.png",
-            f"https://api.ambr.top/assets/UI/UI_AvatarIcon_{name_cap}.png"
-        ]
-
-        for url in sources:
-            try:
-                response = requests.get(url, headers=headers, timeout=5)
-                
-                if response.status_code == 200 and response.content.startswith(b'\x89PNG'):
-                    with open(local_path, 'wb') as f:
-                        f.write(response.content)
-                    print(f" Found as '{name_variant}' -> Saved to cache")
-                    return str(local_path)
-                    
-            except Exception:
-                continue
+        for mirror, template in MIRRORS.items():
+            url = template.format(cap=name_cap, lower=name_lower)
+            if url not in seen:
+                seen.add(url)
+                candidates.append((f"{mirror}/{rule}", name_variant, url))
+    with _lock:
+        stats = dict(_mirror_stats())
+    mirror_wins: Dict[str, int] = {}
+    for pattern, wins in stats.items():
+        mirror = pattern.split("/", 1)[0]
+        mirror_wins[mirror] = mirror_wins.get(mirror, 0) + wins
+    candidates.sort(key=lambda c: (-stats.get(c[0], 0), -mirror_wins.get(c[0].split("/", 1)[0], 0)))
+    return candidates
+
+def _probe(url: str, cancelled: threading.Event, errors: List[str]) -> Optional[bytes]:
+    if cancelled.is_set():
+        return None
+    try:
+        response = _get_session().get(url, headers=HEADERS, timeout=PROBE_TIMEOUT)
+    except requests.exceptions.RequestException:
+        errors.append(url)
+        return None
+    if response.status_code == 200 and is_valid_png(response.content):
+        return response.content
+    if response.status_code >= 500:
+        errors.append(url)
+    return None
+
+def resolve_image(char_name: str, skip: frozenset = frozenset(),
+                  errors: Optional[List[str]] = None) -> Optional[Tuple[str, str, bytes]]:
+    """Races all candidate URLs not in `skip` and returns (pattern, name variant, PNG bytes) of the
+    first one that delivers a PNG; the other probes are cancelled or ignored, and finish on their own
+    threads without delaying the caller or any other lookup. URLs that failed for network or server
+    reasons rather than a missing icon go to `errors`."""
+    errors = [] if errors is None else errors
+    candidates = [c for c in candidate_urls(char_name) if c[2] not in skip]
+    if not candidates:
+        return None
+    cancelled = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=min(len(candidates), probe_workers()), thread_name_prefix="image-probe")
+    futures = {pool.submit(_probe, url, cancelled, errors): (pattern, name_variant)
+               for pattern, name_variant, url in candidates}
+    try:
+        for future in as_completed(futures):
+            data = future.result()
+            if data is not None:
+                return futures[future] + (data,)
+        return None
+    finally:
+        cancelled.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def cache_image(original_url: str, char_name: str) -> str:
+    key = _cache_key(char_name)
+    local_path = _cached_path(key)
+    if local_path is not None:
+        return local_path
+
+    tried = _tried_before(key)
+    urls = [url for _, _, url in candidate_urls(char_name)]
+    if tried and tried.issuperset(urls):
+        return original_url
+
+    print(f"⬇ Downloading image for [{char_name}]..")
+    
+    errors: List[str] = []
+    found = resolve_image(char_name, frozenset(tried), errors)
+    if found is None:
+        _record_missing(key, urls, MISSING_RETRY_TTL if errors else MISSING_TTL)
+        print(f" Failed to find image for {char_name} (Tried: {get_name_variations(char_name)})")
+        return original_url
 
-    print(f" Failed to find image for {char_name} (Tried: {possible_names})")
-    return original_url
\ No newline at end of file
+    pattern, name_variant, data = found
+    local_path = _store_image(key, data)
+    _record_win(pattern)
+    _forget_missing(key)
+    print(f" Found as '{name_variant}' -> Saved to cache")
+    return str(local_path)
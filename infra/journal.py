@@ -0,0 +1,212 @@
+import json
+import os
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Iterator, List
+
+BLOCK = 64
+# Index header: records in the snapshot, snapshot bytes, journal bytes already folded into the snapshot.
+HEADER = 3
+PAGE = 256
+
+def _fsync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+class HistoryJournal(Sequence):
+    """Append-only list of log records on disk.
+
+    Records are appended to `<path>.journal` as one JSON value per line and fsynced every
+    `fsync_every` appends (0: only on flush(); saves and session ends flush anyway). Every `compact_every` records the journal is folded
+    into `<path>.snapshot`, whose sparse offset index (`<path>.index`, one entry per BLOCK records)
+    lets a page be read with one seek. Only the index and the current journal's offsets stay in RAM.
+    """
+
+    def __init__(self, path: Path, fsync_every: int = 32, compact_every: int = 1000):
+        self.path = Path(path)
+        self.fsync_every, self.compact_every = fsync_every, compact_every
+        self.journal_path = self.path.with_suffix(".journal")
+        self.snapshot_path = self.path.with_suffix(".snapshot")
+        self.index_path = self.path.with_suffix(".index")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._recover()
+        self._journal = open(self.journal_path, "ab")
+        self._unsynced = 0
+
+    def _write_index(self, header_only: bool = False):
+        with open(self.index_path, "r+b" if header_only and self.index_path.exists() else "wb") as f:
+            f.write((self._index[:HEADER] if header_only else self._index).tobytes())
+            _fsync(f)
+
+    def _rewrite_journal(self, data: bytes):
+        with open(self.journal_path, "wb") as f:
+            f.write(data)
+            _fsync(f)
+
+    def _recover(self):
+        """Finishes or rolls back a compaction cut short and drops a torn last journal line."""
+        self._index = array("q")
+        if self.index_path.exists():
+            self._index.frombytes(self.index_path.read_bytes())
+        if len(self._index) < HEADER:
+            self._index = array("q", [0] * HEADER)
+            self._write_index()
+        with open(self.snapshot_path, "ab") as f:
+            if f.tell() != self._index[1]:
+                f.truncate(self._index[1])
+                _fsync(f)
+
+        journal = self.journal_path.read_bytes() if self.journal_path.exists() else b""
+        folded = self._index[2]
+        if folded:
+            journal = journal[folded:]
+            self._rewrite_journal(journal)
+            self._index[2] = 0
+            self._write_index(header_only=True)
+        end = journal.rfind(b"\n") + 1
+        if end != len(journal):
+            journal = journal[:end]
+            self._rewrite_journal(journal)
+
+        self._offsets: List[int] = []
+        pos = 0
+        while pos < end:
+            self._offsets.append(pos)
+            pos = journal.index(b"\n", pos) + 1
+        self._journal_size = end
+
+    def append(self, record: Any):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        self._journal.write(line)
+        self._offsets.append(self._journal_size)
+        self._journal_size += len(line)
+        self._unsynced += 1
+        if self.fsync_every and self._unsynced >= self.fsync_every:
+            self.flush()
+        if self.compact_every and len(self._offsets) >= self.compact_every:
+            self.compact()
+
+    def flush(self):
+        """Makes every appended record durable; the cost follows the records since the last flush."""
+        if self._unsynced:
+            _fsync(self._journal)
+            self._unsynced = 0
+
+    def compact(self):
+        """Folds the journal into the snapshot. Each step is fsynced before the next, so _recover
+        can always tell which records made it."""
+        if not self._offsets:
+            return
+        self.flush()
+        self._journal.flush()
+        with open(self.journal_path, "rb") as f:
+            data = f.read(self._journal_size)
+        count, end = self._index[0], self._index[1]
+        with open(self.snapshot_path, "ab") as f:
+            f.write(data)
+            _fsync(f)
+        self._index.extend(end + off for i, off in enumerate(self._offsets) if (count + i) % BLOCK == 0)
+        self._index[0], self._index[1], self._index[2] = count + len(self._offsets), end + len(data), len(data)
+        self._write_index()
+        self._fold_journal()
+
+    def _fold_journal(self):
+        self._journal.truncate(0)
+        _fsync(self._journal)
+        self._offsets, self._journal_size = [], 0
+        self._index[2] = 0
+        self._write_index(header_only=True)
+
+    def clear(self):
+        self._journal.truncate(0)
+        _fsync(self._journal)
+        self._offsets, self._journal_size, self._unsynced = [], 0, 0
+        with open(self.snapshot_path, "wb") as f:
+            _fsync(f)
+        self._index = array("q", [0] * HEADER)
+        self._write_index()
+
+    def close(self):
+        self.flush()
+        self._journal.close()
+
+    def delete(self):
+        """Closes the journal and removes its files."""
+        self._journal.close()
+        HistoryJournal.remove(self.path)
+
+    @staticmethod
+    def remove(path: Path):
+        """Removes the files of the journal at `path` without opening it."""
+        for suffix in (".journal", ".snapshot", ".index"):
+            Path(path).with_suffix(suffix).unlink(missing_ok=True)
+
+    def head(self, count: int) -> "JournalView":
+        """The first `count` records, as saved; later appends stay out of it."""
+        return JournalView(self, count)
+
+    def _read(self, path: Path, offset: int, skip: int, count: int) -> List[Any]:
+        out = []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if skip:
+                    skip -= 1
+                    continue
+                if len(out) == count:
+                    break
+                out.append(json.loads(line))
+        return out
+
+    def _range(self, start: int, stop: int) -> List[Any]:
+        snap = self._index[0]
+        out = []
+        if start < snap:
+            block = start // BLOCK
+            out = self._read(self.snapshot_path, self._index[HEADER + block], start - block * BLOCK,
+                             min(stop, snap) - start)
+        if stop > snap:
+            first = max(start, snap) - snap
+            self._journal.flush()
+            out.extend(self._read(self.journal_path, self._offsets[first], 0, stop - snap - first))
+        return out
+
+    def __len__(self) -> int:
+        return self._index[0] + len(self._offsets)
+
+    def __getitem__(self, i):
+        indices = range(len(self))[i]
+        if isinstance(i, slice):
+            if indices.step != 1:
+                return [self[j] for j in indices]
+            return self._range(indices.start, indices.stop) if indices else []
+        return self._range(indices, indices + 1)[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        for start in range(0, len(self), PAGE):
+            yield from self._range(start, min(start + PAGE, len(self)))
+
+class JournalView(Sequence):
+    """Read-only prefix of a HistoryJournal."""
+
+    def __init__(self, journal: HistoryJournal, count: int):
+        self.journal, self.count = journal, count
+
+    def __len__(self) -> int:
+        return min(self.count, len(self.journal))
+
+    def __getitem__(self, i):
+        indices = range(len(self))[i]
+        if isinstance(i, slice):
+            if indices.step != 1:
+                return [self[j] for j in indices]
+            return self.journal._range(indices.start, indices.stop) if indices else []
+        return self.journal._range(indices, indices + 1)[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        for start in range(0, len(self), PAGE):
+            yield from self.journal._range(start, min(start + PAGE, len(self)))
+
+    def close(self):
+        self.journal.close()
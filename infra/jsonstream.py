@@ -0,0 +1,170 @@
+import json
+import tempfile
+import threading
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+CHUNK_SIZE = 1 << 16
+_WS = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+Trailer = Union[Dict[str, Any], Callable[[], Dict[str, Any]], None]
+
+def write_document(f: IO[str], header: Dict[str, Any], key: str, records: Iterable[Any],
+                   trailer: Trailer = None) -> int:
+    """Writes {**header, key: [*records], **trailer} one record per line and returns the record count.
+    Only one record is serialized at a time, and the output is plain JSON that json.load still reads.
+    `trailer` may be a callable evaluated after the records are written."""
+    f.write("{")
+    for name, value in header.items():
+        f.write(f"{_dumps(name)}: {_dumps(value)},\n ")
+    f.write(f"{_dumps(key)}: [")
+    count = 0
+    for record in records:
+        f.write(",\n  " if count else "\n  ")
+        f.write(_dumps(record))
+        count += 1
+    f.write("\n ]" if count else "]")
+    for name, value in ((trailer() if callable(trailer) else trailer) or {}).items():
+        f.write(f",\n {_dumps(name)}: {_dumps(value)}")
+    f.write("}\n")
+    return count
+
+class _Scanner:
+    """Sliding window over a text stream that hands whole JSON values to json's raw_decode."""
+
+    def __init__(self, f: IO[str], chunk_size: int):
+        self.f, self.chunk_size = f, chunk_size
+        self.buf, self.pos, self.eof = "", 0, False
+
+    def _more(self) -> bool:
+        if self.eof:
+            return False
+        self.buf, self.pos = self.buf[self.pos:], 0
+        # Read at least as much as is still unparsed, so a value spanning many chunks costs O(size).
+        chunk = self.f.read(max(self.chunk_size, len(self.buf)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, not consumed; '' at end of input."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._more():
+                return ""
+
+    def expect(self, ch: str):
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"Expected {ch!r}, found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                val, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number ending at the window edge may continue in the next chunk.
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return val
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._more()
+
+def _elements(s: _Scanner) -> Iterator[Any]:
+    s.expect("[")
+    if s.peek() == "]":
+        s.pos += 1
+        return
+    while True:
+        yield s.value()
+        ch = s.peek()
+        s.pos += 1
+        if ch == "]":
+            return
+        if ch != ",":
+            raise ValueError(f"Expected ',' or ']' in array, found {ch or 'end of file'!r}")
+
+def _fields(s: _Scanner, fields: Dict[str, Any], stop: Sequence[str]) -> Optional[str]:
+    """Reads name/value pairs into `fields` until the value of a `stop` name is next (returns that
+    name) or the object closes (None)."""
+    while True:
+        ch = s.peek()
+        if ch == "}":
+            s.pos += 1
+            return None
+        if ch == ",":
+            s.pos += 1
+            continue
+        name = s.value()
+        s.expect(":")
+        if name in stop:
+            return name
+        fields[name] = s.value()
+
+def read_header(f: IO[str], keys: Sequence[str], chunk_size: int = CHUNK_SIZE) -> Tuple[Optional[str], Dict[str, Any], Iterator[Any]]:
+    """Like read_document for whichever of `keys` comes first; returns (that key or None, fields, records).
+    A top-level array is reported under the first key."""
+    s = _Scanner(f, chunk_size)
+    fields: Dict[str, Any] = {}
+    if s.peek() == "[":
+        return keys[0], fields, _elements(s)
+    s.expect("{")
+    key = _fields(s, fields, keys)
+    if key is None:
+        return None, fields, iter(())
+
+    def records() -> Iterator[Any]:
+        yield from _elements(s)
+        _fields(s, fields, ())
+    return key, fields, records()
+
+def read_document(f: IO[str], key: str, chunk_size: int = CHUNK_SIZE) -> Tuple[Dict[str, Any], Iterator[Any]]:
+    """Streams the `key` array of a top-level JSON object (or a top-level array) one element at a time.
+
+    Returns (fields, records). `fields` holds the object's other fields: those written before the
+    array are there right away, those after it once `records` is exhausted.
+    """
+    _, fields, records = read_header(f, (key,), chunk_size)
+    return fields, records
+
+class RecordSpool:
+    """Records parked in an anonymous temporary file and read back by the (offset, length) ref that
+    append() returned, so a lazy index keeps refs rather than records. Reads may come from any thread."""
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def append(self, record: Any) -> Tuple[int, int]:
+        data = _dumps(record).encode("utf-8")
+        with self._lock:
+            self._file.seek(self._end)
+            self._file.write(data)
+            ref = (self._end, len(data))
+            self._end += len(data)
+        return ref
+
+    def read(self, refs: Iterable[Tuple[int, int]]) -> List[Any]:
+        with self._lock:
+            raw = []
+            for offset, length in refs:
+                self._file.seek(offset)
+                raw.append(self._file.read(length))
+        return [json.loads(data.decode("utf-8")) for data in raw]
+
+    def close(self):
+        self._file.close()
@@ -1,11 +1,15 @@
 import sys
-import json
 import os
-from typing import List, Dict, Any, Tuple
-from dataclasses import asdict, is_dataclass
+from collections import deque
+from typing import List, Dict, Any, Callable, Iterator, Optional, Sequence, Set, Tuple
 from pathlib import Path
 
 from infra.api_importer.entities import Character, Skill, Item 
+from core.game import registry
+from infra.catalog import LazyCatalog, BATCH_SIZE
+from infra import jsonstream, savefile
+from infra.journal import HistoryJournal
+from infra.catalog_db import SqliteCatalog, is_sqlite_path
 
 if getattr(sys, 'frozen', False):
     BASE_DIR = Path(sys.executable).parent
@@ -14,10 +18,16 @@ else:
 
 DATA_DIR = BASE_DIR / "data"
 DATA_FILE = DATA_DIR / 'game_data.json'
+CATALOG_DB_FILE = DATA_DIR / 'game_data.db'
 SAVE_GAME_FILE = DATA_DIR / 'game_save.json'
 
 class PersistenceService:
-    
+    # "json" keeps the catalog in game_data.json, "binary" in game_data.bin and "sqlite" (opt-in) in
+    # game_data.db, which imports game_data.json the first time it is loaded and never touches it after.
+    catalog_backend = os.environ.get("SORTEM_CATALOG", "json")
+    # Format of game_save: "json" (game_save.json) or "binary" (game_save.bin).
+    save_format = os.environ.get("SORTEM_SAVE_FORMAT", savefile.JSON)
+
     @staticmethod
     def _extract_stat(obj: Any, keys: List[str], default: int = 0) -> int:
         stats_dict = getattr(obj, "stats", {}) or {}
@@ -49,19 +59,7 @@ class PersistenceService:
             "level": getattr(c, "level", 1)
         }
 
-        safe_skills = []
-        if hasattr(c, "skills"):
-            for s in c.skills:
-                if is_dataclass(s):
-                    safe_skills.append(asdict(s))
-                elif isinstance(s, dict):
-                    safe_skills.append(s)
-                else:
-                    safe_skills.append({
-                        "name": getattr(s, "name", "Unknown Skill"),
-                        "description": getattr(s, "description", ""),
-                        "damage": getattr(s, "value", getattr(s, "damage", 0))
-                    })
+        safe_skills = registry.encode_skills(getattr(c, "skills", []))
 
         return {
             "id": getattr(c, "id", getattr(c, "name", "unknown").lower()),
@@ -75,16 +73,8 @@ class PersistenceService:
         }
 
     @staticmethod
-    def _dict_to_char(d: Dict[str, Any]) -> Character:
-        skills_list = []
-        for s in d.get("skills", []):
-            try:
-                if isinstance(s, dict):
-                    skills_list.append(Skill(**s))
-                else:
-                    skills_list.append(s)
-            except Exception:
-                pass
+    def _dict_to_char(d: Dict[str, Any], encoding: Optional[int] = registry.ENCODING_VERSION) -> Character:
+        skills_list = registry.decode_skills(d.get("skills", []), encoding)
 
         saved_stats = d.get("stats", {})
         
@@ -125,59 +115,218 @@ class PersistenceService:
             )
 
     @staticmethod
-    def save_characters(characters: List[Character]) -> bool:
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
+    def _catalog_path(path: Optional[Path]) -> Path:
+        if path is not None:
+            return path
+        backend = PersistenceService.catalog_backend
+        if backend == "sqlite":
+            return CATALOG_DB_FILE
+        return savefile.path_for(DATA_FILE, backend) if backend == savefile.BINARY else DATA_FILE
+
+    @staticmethod
+    def _catalog_db(path: Path) -> SqliteCatalog:
+        return SqliteCatalog.open(path, PersistenceService._char_to_dict, PersistenceService._dict_to_char)
+
+    @staticmethod
+    def save_characters(characters: List[Character], path: Optional[Path] = None) -> bool:
+        path = PersistenceService._catalog_path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
         
-        print(f"DEBUG: Saving to {DATA_FILE}")
+        print(f"DEBUG: Saving to {path}")
+        if is_sqlite_path(path):
+            try:
+                PersistenceService._catalog_db(path).save(characters)
+                return True
+            except Exception as e:
+                print(f"Error saving catalog: {e}")
+                return False
         
-        data = [PersistenceService._char_to_dict(c) for c in characters] 
+        records = (PersistenceService._char_to_dict(c) for c in characters)
         try:
-            with open(DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump({"characters": data}, f, indent=4, ensure_ascii=False)
+            savefile.write_document(path, {"ability_encoding": registry.ENCODING_VERSION}, "characters", records)
             return True
         except Exception as e:
             print(f"Error saving catalog: {e}")
             return False
 
     @staticmethod
-    def load_characters() -> List[Character]:
-        if not DATA_FILE.exists():
-            print(f"DEBUG: File not found at {DATA_FILE}")
+    def snapshot_catalog(characters: List[Character], path: Optional[Path] = None) -> Optional[Callable[[], Any]]:
+        """Autosave of a roster opened with open_catalog(), for AutosaveWorker: encodes the characters
+        that were built (only the changed ones for SQLite) on the calling thread and returns the job
+        that writes them, which touches no live character. Any other roster (nothing loaded yet,
+        say) gives None, as saving it would replace the catalog."""
+        if not isinstance(characters, LazyCatalog) or not characters:
+            return None
+        path = PersistenceService._catalog_path(path)
+        if is_sqlite_path(path):
+            catalog = PersistenceService._catalog_db(path)
+            plan = catalog.prepare(characters)
+            return lambda: catalog.commit(plan)
+
+        encode = PersistenceService._char_to_dict
+        slots = [(None, ref) if c is None else (encode(c), None) for _, c, ref in characters.slots()]
+
+        def records() -> Iterator[Dict[str, Any]]:
+            for start in range(0, len(slots), BATCH_SIZE):
+                part = slots[start:start + BATCH_SIZE]
+                built = iter(characters.build_detached([ref for record, ref in part if record is None]))
+                for record, _ in part:
+                    yield record if record is not None else encode(next(built))
+
+        header = {"ability_encoding": registry.ENCODING_VERSION}
+        return lambda: savefile.write_document(path, header, "characters", records())
+
+    @staticmethod
+    def save_character(character: Character, path: Optional[Path] = None) -> bool:
+        """Writes one edited character. Only the SQLite catalog can do this without rewriting the file."""
+        path = PersistenceService._catalog_path(path)
+        if not is_sqlite_path(path):
+            return False
+        try:
+            PersistenceService._catalog_db(path).upsert(character)
+            return True
+        except Exception as e:
+            print(f"Error saving character: {e}")
+            return False
+
+    @staticmethod
+    def load_characters(path: Optional[Path] = None) -> List[Character]:
+        path = PersistenceService._catalog_path(path)
+        if is_sqlite_path(path):
+            return PersistenceService._load_catalog_db(path)
+        if not path.exists():
+            print(f"DEBUG: File not found at {path}")
             return []
         try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                chars = data.get("characters", [])
-                print(f"DEBUG: Loaded {len(chars)} characters from JSON")
-                return [PersistenceService._dict_to_char(d) for d in chars]
+            chars = list(PersistenceService.iter_characters(path))
+            print(f"DEBUG: Loaded {len(chars)} characters from {path.name}")
+            return chars
         except Exception as e:
             print(f"Error loading catalog: {e}")
             return []
+
+    @staticmethod
+    def iter_characters(path: Optional[Path] = None) -> Iterator[Character]:
+        """Reads a JSON or binary catalog one character at a time."""
+        with savefile.read_document(path or DATA_FILE, "characters") as (fields, records):
+            for d in records:
+                yield PersistenceService._dict_to_char(d, fields.get("ability_encoding"))
             
     @staticmethod
-    def save_game(characters: List[Character], history: List[str]) -> bool:
+    def _import_legacy_catalog(path: Path):
+        if not path.exists() and path == CATALOG_DB_FILE and DATA_FILE.exists():
+            legacy = PersistenceService.load_characters(DATA_FILE)
+            PersistenceService._catalog_db(path).save(legacy)
+
+    @staticmethod
+    def _load_catalog_db(path: Path) -> List[Character]:
+        try:
+            PersistenceService._import_legacy_catalog(path)
+            if not path.exists():
+                print(f"DEBUG: File not found at {path}")
+                return []
+            chars = PersistenceService._catalog_db(path).load()
+            print(f"DEBUG: Loaded {len(chars)} characters from SQLite")
+            return chars
+        except Exception as e:
+            print(f"Error loading catalog: {e}")
+            return []
+
+    @staticmethod
+    def open_catalog(path: Optional[Path] = None) -> LazyCatalog:
+        """Like load_characters, but only the id/name/level index is read up front."""
+        path = PersistenceService._catalog_path(path)
+        try:
+            if is_sqlite_path(path):
+                PersistenceService._import_legacy_catalog(path)
+            if not path.exists():
+                print(f"DEBUG: File not found at {path}")
+                return LazyCatalog()
+            if is_sqlite_path(path):
+                catalog = PersistenceService._catalog_db(path).lazy()
+            else:
+                # Records are spooled to a temporary file rather than read back from `path`, which an
+                # autosave may rewrite (in a different order) while the catalog still points into it.
+                spool = jsonstream.RecordSpool()
+                with savefile.read_document(path, "characters") as (fields, records):
+                    entries = [(spool.append(d), d.get("id"), d.get("name", "Unknown"), d.get("level", 1)) for d in records]
+                encoding = fields.get("ability_encoding")
+                catalog = LazyCatalog(entries, lambda refs: [PersistenceService._dict_to_char(d, encoding) for d in spool.read(refs)])
+            return catalog
+        except Exception as e:
+            print(f"Error loading catalog: {e}")
+            return LazyCatalog()
+
+    @staticmethod
+    def _save_game_path() -> Path:
+        return savefile.path_for(SAVE_GAME_FILE, PersistenceService.save_format)
+
+    @staticmethod
+    def _journal_ref(save: Path, journal: Path) -> str:
+        """The journal's path relative to the save's folder, so a data folder can be moved or copied."""
+        try:
+            return journal.resolve().relative_to(save.parent.resolve()).as_posix()
+        except ValueError:
+            return str(journal)
+
+    @staticmethod
+    def _saved_journals() -> Set[Path]:
+        """Journals the save files on disk reference."""
+        journals = set()
+        for path in (savefile.path_for(SAVE_GAME_FILE, fmt) for fmt in (savefile.JSON, savefile.BINARY)):
+            if not path.exists():
+                continue
+            try:
+                with savefile.read_document(path, "session_characters") as (fields, records):
+                    deque(records, maxlen=0)
+            except Exception:
+                continue
+            if "history_journal" in fields:
+                journals.add((path.parent / fields["history_journal"]).resolve())
+        return journals
+
+    @staticmethod
+    def save_game(characters: List[Character], history: Sequence[str]) -> bool:
+        """A HistoryJournal is flushed and referenced rather than copied into the save, along with
+        its length, so records logged after the save never show up when it is loaded. Journals that
+        only the replaced save referenced are deleted."""
         DATA_DIR.mkdir(parents=True, exist_ok=True)
-        data = {
-            "session_characters": [PersistenceService._char_to_dict(c) for c in characters],
-            "history": history,
-        }
+        path = PersistenceService._save_game_path()
+        records = (PersistenceService._char_to_dict(c) for c in characters)
+        if isinstance(history, HistoryJournal):
+            history.flush()
+            trailer = {"history_journal": PersistenceService._journal_ref(path, history.path), "history_count": len(history)}
+        else:
+            trailer = {"history": list(history)}
         try:
-            with open(SAVE_GAME_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            return True
+            replaced = PersistenceService._saved_journals()
+            savefile.write_document(path, {"ability_encoding": registry.ENCODING_VERSION},
+                                    "session_characters", records, trailer)
         except Exception as e:
             print(f"Game Save Error: {e}")
             return False
+        for journal in replaced - PersistenceService._saved_journals():
+            try:
+                HistoryJournal.remove(journal)
+            except OSError:
+                pass
+        return True
             
     @staticmethod
-    def load_game() -> Tuple[List[Character], List[str]]:
-        if not SAVE_GAME_FILE.exists():
+    def load_game() -> Tuple[List[Character], Sequence[str]]:
+        preferred = PersistenceService._save_game_path()
+        path = next((p for p in (preferred, savefile.path_for(SAVE_GAME_FILE, savefile.JSON),
+                                 savefile.path_for(SAVE_GAME_FILE, savefile.BINARY)) if p.exists()), None)
+        if path is None:
              return [], []
         try:
-            with open(SAVE_GAME_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            loaded_chars = [PersistenceService._dict_to_char(d) for d in data.get("session_characters", [])]
-            return loaded_chars, data.get("history", [])
+            with savefile.read_document(path, "session_characters") as (fields, records):
+                loaded_chars = [PersistenceService._dict_to_char(d, fields.get("ability_encoding")) for d in records]
+            if "history_journal" in fields:
+                # Older saves hold an absolute path, which joining leaves as it is.
+                journal = HistoryJournal(path.parent / fields["history_journal"])
+                return loaded_chars, journal.head(fields["history_count"])
+            return loaded_chars, fields.get("history", [])
         except Exception as e:
             print(f"Game Load Error: {e}")
             return [], []
\ No newline at end of file
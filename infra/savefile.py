@@ -0,0 +1,87 @@
+"""Save documents in either format: JSON (jsonstream) or compact binary (binfmt).
+
+Reading sniffs the binary magic, so either format loads from any path; writing picks binary for
+BINARY_SUFFIX paths unless a format is given.
+
+    python -m infra.savefile data/game_save.json data/game_save.bin
+"""
+import io
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from infra import binfmt, jsonstream
+from infra.atomic import atomic_write
+
+JSON = "json"
+BINARY = "binary"
+FORMATS = (JSON, BINARY)
+BINARY_SUFFIX = ".bin"
+# Array keys of the documents PersistenceService and GameStorage write.
+DOCUMENT_KEYS = ("characters", "session_characters")
+
+def format_for(path: Path) -> str:
+    return BINARY if Path(path).suffix.lower() == BINARY_SUFFIX else JSON
+
+def path_for(path: Path, fmt: str) -> Path:
+    """`path` with the suffix `fmt` is written under."""
+    return Path(path).with_suffix(BINARY_SUFFIX if fmt == BINARY else ".json")
+
+def is_binary(path: Path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(binfmt.MAGIC)) == binfmt.MAGIC
+
+@contextmanager
+def open_document(path: Path, keys: Sequence[str] = DOCUMENT_KEYS) -> Iterator[Tuple[Optional[str], Dict[str, Any], Iterator[Any]]]:
+    """(array key, fields, records) of a save in either format; records stream while the file is open."""
+    with open(path, "rb") as f:
+        if f.read(len(binfmt.MAGIC)) == binfmt.MAGIC:
+            f.seek(0)
+            yield binfmt.read_header(f)
+            return
+        f.seek(0)
+        with io.TextIOWrapper(f, encoding="utf-8") as text:
+            yield jsonstream.read_header(text, keys)
+
+@contextmanager
+def read_document(path: Path, key: str) -> Iterator[Tuple[Dict[str, Any], Iterator[Any]]]:
+    with open_document(path, (key,)) as (found, fields, records):
+        if found not in (key, None):
+            raise ValueError(f"Expected a '{key}' document, found '{found}'")
+        yield fields, records
+
+def write_document(path: Path, header: Dict[str, Any], key: str, records: Iterable[Any],
+                   trailer: jsonstream.Trailer = None, fmt: Optional[str] = None) -> int:
+    """Writes atomically: `path` keeps its old contents until the new document is complete and synced."""
+    fmt = fmt or format_for(path)
+    with atomic_write(path) as f:
+        if fmt == BINARY:
+            return binfmt.write_document(f, header, key, records, trailer)
+        text = io.TextIOWrapper(f, encoding="utf-8")
+        try:
+            return jsonstream.write_document(text, header, key, records, trailer)
+        finally:
+            text.detach()
+
+def convert(src: Path, dst: Path, fmt: Optional[str] = None) -> int:
+    """Rewrites a save in the other format record by record; returns the record count."""
+    with open_document(src) as (key, fields, records):
+        if key is None:
+            raise ValueError(f"{src} holds no character list")
+        header = dict(fields)
+        trailer = lambda: {k: v for k, v in fields.items() if k not in header}
+        return write_document(dst, header, key, records, trailer, fmt)
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) not in (2, 3) or (len(args) == 3 and args[2] not in FORMATS):
+        print("Usage: python -m infra.savefile <source> <destination> [json|binary]")
+        return 2
+    src, dst = Path(args[0]), Path(args[1])
+    count = convert(src, dst, args[2] if len(args) == 3 else None)
+    print(f"Converted {count} characters: {src} ({src.stat().st_size:,} bytes) -> {dst} ({dst.stat().st_size:,} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
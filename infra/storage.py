@@ -1,52 +1,63 @@
-import json
 import dataclasses
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
 from infra.api_importer.entities import Character, Skill, Item
+from core.game import registry
+from infra import savefile
 
 SAVE_FILE = Path("data/savegame.json")
+SAVE_VERSION = 2
+CHARACTER_FIELDS = frozenset(f.name for f in dataclasses.fields(Character) if f.init)
 
 class GameStorage:
+    # Format used when no path is given: "json" (savegame.json) or "binary" (savegame.bin).
+    save_format = savefile.JSON
+
     @staticmethod
-    def save_game(characters: List[Character]):
-        data_to_save = []
-        
-        for char in characters:
-            char_dict = dataclasses.asdict(char)
-            data_to_save.append(char_dict)
+    def _char_to_dict(char: Character) -> Dict[str, Any]:
+        return {
+            "id": char.id,
+            "name": char.name,
+            "game": char.game,
+            "level": char.level,
+            "stats": dict(char.stats),
+            "skills": registry.encode_skills(char.skills),
+            "equipment": [dataclasses.asdict(i) for i in char.equipment],
+            "metadata": char.metadata,
+        }
+
+    @staticmethod
+    def _dict_to_char(char_data: Dict[str, Any], encoding: Optional[int]) -> Character:
+        fields = {k: v for k, v in char_data.items() if k in CHARACTER_FIELDS}
+        fields["skills"] = registry.decode_skills(char_data.get("skills", []), encoding)
+        fields["equipment"] = [Item(**i) for i in char_data.get("equipment", [])]
+        return Character(**fields)
+
+    @staticmethod
+    def save_game(characters: List[Character], path: Optional[Path] = None):
+        path = path or savefile.path_for(SAVE_FILE, GameStorage.save_format)
+        header = {"version": SAVE_VERSION, "ability_encoding": registry.ENCODING_VERSION}
+        records = (GameStorage._char_to_dict(char) for char in characters)
         
-        SAVE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            with open(SAVE_FILE, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, indent=4, ensure_ascii=False)
-            print(f"Game saved to {SAVE_FILE}")
+            savefile.write_document(path, header, "characters", records)
+            print(f"Game saved to {path}")
         except Exception as e:
             print(f"Save failed: {e}")
 
     @staticmethod
-    def load_game() -> List[Character]:
-        if not SAVE_FILE.exists():
+    def load_game(path: Optional[Path] = None) -> List[Character]:
+        path = path or savefile.path_for(SAVE_FILE, GameStorage.save_format)
+        if not path.exists():
             print("No save file found")
             return []
             
         try:
-            with open(SAVE_FILE, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
-            
-            loaded_chars = []
-            for char_data in raw_data:
-                skills_data = char_data.get("skills", [])
-                restored_skills = [Skill(**s) for s in skills_data] 
-
-                items_data = char_data.get("equipment", [])
-                restored_items = [Item(**i) for i in items_data]
-
-                char_data["skills"] = restored_skills
-                char_data["equipment"] = restored_items
-                
-                character = Character(**char_data)
-                loaded_chars.append(character)
+            # Version 1 saves are a bare list of dataclasses.asdict() dumps without ability encoding.
+            with savefile.read_document(path, "characters") as (fields, records):
+                loaded_chars = [GameStorage._dict_to_char(d, fields.get("ability_encoding")) for d in records]
             
             print(f"Loaded {len(loaded_chars)} characters from save")
             return loaded_chars
@@ -0,0 +1,153 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from infra import savefile
+from infra.autosave import AutosaveWorker
+from infra.catalog import LazyCatalog
+from infra.persistence import PersistenceService
+from core.game.engine import GameEngine
+from core.game.grouping import SplitInTwoStrategy
+from tests.test_simulator import make_char
+
+class TestAtomicSave(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+
+    def test_failed_write_keeps_the_old_file(self):
+        def records():
+            yield {"id": 1}
+            raise RuntimeError("crash mid-save")
+
+        for name in ("c.json", "c.bin"):
+            path = self.dir / name
+            savefile.write_document(path, {}, "characters", [{"id": 0}])
+            before = path.read_bytes()
+            with self.assertRaises(RuntimeError):
+                savefile.write_document(path, {}, "characters", records())
+            self.assertEqual(path.read_bytes(), before)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["c.bin", "c.json"])
+
+    def test_catalog_save_replaces_file(self):
+        path = self.dir / "game_data.json"
+        with redirect_stdout(StringIO()):
+            self.assertTrue(PersistenceService.save_characters([make_char("A", 10, 0, 1)], path))
+            self.assertTrue(PersistenceService.save_characters([make_char("B", 10, 0, 1)], path))
+        self.assertEqual([c["name"] for c in json.loads(path.read_text(encoding="utf-8"))["characters"]], ["B"])
+
+class TestAutosaveWorker(unittest.TestCase):
+
+    def test_requests_during_a_save_are_coalesced(self):
+        started, release = threading.Event(), threading.Event()
+        snapshots, writes = [], []
+
+        def write():
+            writes.append(time.monotonic())
+            started.set()
+            release.wait(5)
+
+        def snapshot():
+            snapshots.append(1)
+            return write
+
+        worker = AutosaveWorker(snapshot, interval=None)
+        worker.start()
+        worker.request()
+        self.assertTrue(started.wait(5))
+        begin = time.perf_counter()
+        for _ in range(100):
+            worker.request()
+        self.assertLess(time.perf_counter() - begin, 0.5)
+        release.set()
+        worker.stop()
+        self.assertEqual((len(snapshots), len(writes)), (101, 2))
+
+    def test_event_count_and_interval_trigger_saves(self):
+        saved = threading.Semaphore(0)
+        worker = AutosaveWorker(lambda: saved.release, interval=0.05, every_events=10)
+        worker.start()
+        worker.notify(4)
+        self.assertFalse(saved.acquire(timeout=0.02))
+        worker.notify(6)
+        self.assertTrue(saved.acquire(timeout=5))
+        time.sleep(0.06)
+        worker.notify(1)
+        self.assertTrue(saved.acquire(timeout=5))
+        worker.checkpoint()
+        self.assertFalse(saved.acquire(timeout=0.2))
+        worker.stop()
+        self.assertEqual(worker.saves, 2)
+
+    def test_stop_flushes_and_survives_failures(self):
+        calls = []
+        def write():
+            calls.append(1)
+            raise OSError("disk full")
+
+        worker = AutosaveWorker(lambda: write, interval=None, every_events=None)
+        worker.start()
+        worker.notify(3)
+        with redirect_stdout(StringIO()):
+            worker.stop(timeout=5)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual((len(calls), str(worker.last_error)), (1, "disk full"))
+
+    def test_snapshot_runs_on_the_requesting_thread(self):
+        threads = []
+        worker = AutosaveWorker(lambda: threads.append(threading.current_thread()) or (lambda: None),
+                                interval=None, every_events=2)
+        worker.start()
+        worker.notify(2)
+        worker.stop(timeout=5)
+        self.assertEqual((threads, worker.saves), ([threading.current_thread()], 1))
+
+    def test_engine_reports_battle_events(self):
+        engine = GameEngine()
+        engine.autosave = AutosaveWorker(lambda: None, interval=None, every_events=None)
+        roster = [make_char(f"C{i}", 100, 0, 10) for i in range(4)]
+        engine.start_battle(seed=3)
+        engine.resolve_turn(roster, SplitInTwoStrategy())
+        self.assertEqual(engine.autosave._events, 1)
+        list(engine.battle_simulation_step(roster, SplitInTwoStrategy()))
+        self.assertEqual(engine.autosave._events, 1 + len(engine.events))
+
+class TestCatalogSnapshot(unittest.TestCase):
+
+    def test_copy_is_independent_and_autosaved(self):
+        path = Path(tempfile.mkdtemp()) / "game_data.db"
+        with redirect_stdout(StringIO()):
+            PersistenceService.save_characters([make_char(f"C{i}", 100, 0, 10) for i in range(30)], path)
+            catalog = PersistenceService.open_catalog(path)
+            snapshot = catalog.copy()
+            catalog.append(make_char("Late", 50, 0, 5))
+            del catalog[0]
+            self.assertEqual((len(snapshot), snapshot.name_at(0), catalog.loaded_count), (30, "C0", 1))
+            self.assertIsNone(PersistenceService.snapshot_catalog([make_char("Fresh", 1, 0, 1)], path))
+            PersistenceService.snapshot_catalog(catalog, path)()
+            reloaded = PersistenceService.open_catalog(path)
+        self.assertIsInstance(reloaded, LazyCatalog)
+        self.assertEqual(reloaded.names()[0], "C1")
+        self.assertEqual(reloaded.names()[-1], "Late")
+
+    def test_snapshot_holds_the_state_at_request_time(self):
+        for name in ("game_data.db", "game_data.json"):
+            path = Path(tempfile.mkdtemp()) / name
+            with redirect_stdout(StringIO()):
+                PersistenceService.save_characters([make_char(f"C{i}", 100, 0, 10) for i in range(30)], path)
+                catalog = PersistenceService.open_catalog(path)
+                catalog[3].name = "Renamed"
+                write = PersistenceService.snapshot_catalog(catalog, path)
+                catalog[3].name = "Too late"
+                catalog[4].name = "Also too late"
+                write()
+                names = PersistenceService.open_catalog(path).names()
+            self.assertEqual(names[2:5], ["C2", "Renamed", "C4"], name)
+            self.assertEqual(len(names), 30, name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from core.game import abilities
+from infra import binfmt, savefile
+from infra.persistence import PersistenceService
+from infra.storage import GameStorage
+from tests.test_simulator import make_char
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [{"id": f"hero_{i}", "name": f"Hero {i % 7}", "level": i % 90, "stats": {"max_hp": 100 + i, "attack": -i},
+                         "skills": [["fireball", 30 + i % 3], ["heal", 20]], "ratio": i / 7, "flag": i % 2 == 0,
+                         "note": None, "bio": "Ünïcode " * (i % 40), 7: "int key"} for i in range(400)]
+        self.expected = json.loads(json.dumps(self.records))
+
+    def test_scalar_round_trip(self):
+        values = [0, 127, 128, -1, -32, -33, -129, 40000, -70000, 2**40, -2**62, 1.5, "", "x" * 300,
+                  "y" * 70000, [], {}, [[1, [2]], {"a": {"b": None}}], {f"k{i}": i for i in range(300)}, (1, 2), True]
+        for value in values:
+            self.assertEqual(binfmt.loads(binfmt.dumps(value)), json.loads(json.dumps(value)), repr(value)[:40])
+
+    def test_document_round_trip_across_chunks(self):
+        buf = io.BytesIO()
+        count = binfmt.write_document(buf, {"version": 2}, "characters", iter(self.records), lambda: {"history": ["a"]})
+        self.assertEqual(count, 400)
+        for chunk_size in (1, 7, 1 << 16):
+            key, fields, records = binfmt.read_header(io.BytesIO(buf.getvalue()), chunk_size)
+            self.assertEqual((key, fields), ("characters", {"version": 2}))
+            self.assertEqual(list(records), self.expected)
+            self.assertEqual(fields["history"], ["a"])
+
+    def test_shared_lists_are_copies(self):
+        buf = io.BytesIO()
+        binfmt.write_document(buf, {}, "characters", self.records[:2])
+        buf.seek(0)
+        first, second = binfmt.read_document(buf, "characters")[1]
+        first["skills"][1].append(99)
+        self.assertEqual(second["skills"][1], ["heal", 20])
+
+    def test_truncated_and_foreign_files(self):
+        buf = io.BytesIO()
+        binfmt.write_document(buf, {}, "characters", self.records)
+        _, records = binfmt.read_document(io.BytesIO(buf.getvalue()[:5000]), "characters", 512)
+        with self.assertRaises(ValueError):
+            list(records)
+        with self.assertRaises(ValueError):
+            binfmt.read_document(io.BytesIO(b'{"characters": []}'), "characters")
+
+class TestSaveFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.roster = [make_char(f"C{i}", 100 + i, i % 4, 12) for i in range(200)]
+        for c in self.roster:
+            c.abilities.extend([abilities.Fireball(30), abilities.Shield(4, 2)])
+
+    def test_catalog_formats_and_conversion(self):
+        json_path, bin_path, back = self.dir / "c.json", self.dir / "c.bin", self.dir / "back.json"
+        with redirect_stdout(StringIO()):
+            PersistenceService.save_characters(self.roster, json_path)
+            PersistenceService.save_characters(self.roster, bin_path)
+            self.assertEqual(savefile.convert(bin_path, back), 200)
+            loaded = PersistenceService.load_characters(bin_path)
+        self.assertTrue(savefile.is_binary(bin_path))
+        self.assertEqual(json.loads(back.read_text(encoding="utf-8")), json.loads(json_path.read_text(encoding="utf-8")))
+        self.assertEqual((loaded[150].max_hp, loaded[150].abilities[1].bonus), (250, 4))
+        self.assertLess(bin_path.stat().st_size * 5, json_path.stat().st_size)
+
+    def test_game_storage_binary(self):
+        path = self.dir / "save.bin"
+        self.roster[3].health = 17
+        with redirect_stdout(StringIO()):
+            GameStorage.save_game(self.roster, path)
+            loaded = GameStorage.load_game(path)
+            converted = self.dir / "save.json"
+            savefile.convert(path, converted)
+            from_json = GameStorage.load_game(converted)
+        self.assertEqual((len(loaded), loaded[3].health), (200, 17))
+        self.assertEqual([c.name for c in from_json], [c.name for c in loaded])
+
+if __name__ == '__main__':
+    unittest.main()
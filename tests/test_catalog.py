@@ -0,0 +1,100 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from core.game.engine import GameEngine
+from cli.commands import ListCharsCommand
+from infra.catalog import LazyCatalog, find_by_name
+from infra.catalog_db import SqliteCatalog
+from infra.persistence import PersistenceService
+from tests.test_registry import ScriptedDisplay
+from tests.test_simulator import make_char
+
+class TestLazyCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.built = []
+        def load_many(refs):
+            self.built.extend(refs)
+            return [make_char(f"C{r}", 100, 1, 10) for r in refs]
+        self.catalog = LazyCatalog([(i, f"c{i}", f"C{i}", 1) for i in range(100)], load_many)
+
+    def test_index_answers_without_building(self):
+        self.assertEqual(len(self.catalog), 100)
+        self.assertEqual(self.catalog.name_at(42), "C42")
+        self.assertTrue(self.catalog)
+        self.assertEqual(self.built, [])
+
+    def test_access_builds_once(self):
+        self.assertIs(self.catalog[5], self.catalog[5])
+        self.assertEqual(self.catalog[-1].name, "C99")
+        self.assertEqual([c.name for c in self.catalog[10:13]], ["C10", "C11", "C12"])
+        self.assertIs(find_by_name(self.catalog, "c50", ignore_case=True), self.catalog[50])
+        self.assertEqual(sorted(self.built), [5, 10, 11, 12, 50, 99])
+        self.assertEqual(self.catalog.loaded_count, 6)
+
+    def test_list_operations(self):
+        extra = make_char("Extra", 50, 0, 5)
+        self.catalog.append(extra)
+        del self.catalog[0]
+        self.assertEqual((len(self.catalog), self.catalog.name_at(0)), (100, "C1"))
+        self.assertIn(extra, self.catalog)
+        self.assertIs(find_by_name(self.catalog, "Extra"), extra)
+        self.assertEqual(len([extra] + self.catalog), 101)
+        self.assertEqual(len(list(self.catalog)), 100)
+
+class TestCatalogLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / "catalog.db"
+        with redirect_stdout(StringIO()):
+            PersistenceService.save_characters([make_char(f"C{i}", 100 + i, 1, 10) for i in range(45)], self.path)
+        SqliteCatalog.close_all()
+
+    def tearDown(self):
+        SqliteCatalog.close_all()
+
+    def open(self) -> LazyCatalog:
+        with redirect_stdout(StringIO()):
+            return PersistenceService.open_catalog(self.path)
+
+    def test_edit_and_save_touches_one_row(self):
+        catalog = self.open()
+        catalog[30].stats["attack"] = 77
+        self.assertEqual(catalog.source.save(catalog), 1)
+        self.assertEqual(catalog.loaded_count, 1)
+        SqliteCatalog.close_all()
+        reopened = self.open()
+        self.assertEqual((len(reopened), reopened[30].attack, reopened[44].max_hp), (45, 77, 144))
+
+    def test_ls_pages(self):
+        engine, display = GameEngine(), ScriptedDisplay([])
+        engine.characters = self.open()
+        ListCharsCommand(engine, display).execute(["3"])
+        self.assertEqual(display.lines[0], "= Available Characters (page 3/3) =")
+        self.assertEqual(len(display.lines), 6)
+        self.assertEqual(engine.characters.loaded_count, 5)
+
+class TestJsonCatalogLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / "catalog.json"
+        with redirect_stdout(StringIO()):
+            PersistenceService.save_characters([make_char(f"C{i}", 100 + i, 1, 10) for i in range(45)], self.path)
+            self.catalog = PersistenceService.open_catalog(self.path)
+
+    def test_index_keeps_refs_not_records(self):
+        refs = [ref for _, _, ref in self.catalog.slots()]
+        self.assertTrue(all(isinstance(ref, tuple) and len(ref) == 2 for ref in refs))
+        self.assertEqual(self.catalog.loaded_count, 0)
+        self.assertEqual((self.catalog.name_at(44), self.catalog[44].max_hp), ("C44", 144))
+
+    def test_records_survive_the_file_being_rewritten(self):
+        with redirect_stdout(StringIO()):
+            PersistenceService.save_characters([make_char("Other", 1, 0, 1)], self.path)
+        self.assertEqual([c.max_hp for c in self.catalog[3:5]], [103, 104])
+        self.assertEqual(self.catalog.build_detached([ref for _, _, ref in self.catalog.slots()][:1])[0].name, "C0")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from core.game import abilities
+from infra.catalog_db import SqliteCatalog
+from infra import persistence
+from infra.persistence import PersistenceService
+from tests.test_simulator import make_char
+
+class TestSqliteCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / "catalog.db"
+        self.roster = [make_char(f"C{i}", 100 + i, i % 5, 10) for i in range(50)]
+        self.roster[0].abilities.append(abilities.Fireball(33))
+        self.catalog = PersistenceService._catalog_db(self.path)
+        self.catalog.save(self.roster)
+
+    def tearDown(self):
+        SqliteCatalog.close_all()
+
+    def reopen(self):
+        SqliteCatalog.close_all()
+        self.catalog = PersistenceService._catalog_db(self.path)
+        return self.catalog.load()
+
+    def test_round_trip_through_persistence_service(self):
+        with redirect_stdout(StringIO()):
+            self.assertTrue(PersistenceService.save_characters(self.roster, self.path))
+            SqliteCatalog.close_all()
+            loaded = PersistenceService.load_characters(self.path)
+        self.assertEqual([c.name for c in loaded], [c.name for c in self.roster])
+        self.assertEqual((loaded[7].max_hp, loaded[7].base_armor), (107, 2))
+        self.assertEqual(loaded[0].abilities[0].damage, 33)
+        mode = sqlite3.connect(self.path).execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_json_stays_the_default_and_sqlite_imports_it_once(self):
+        data = self.path.parent / "game_data.json"
+        db = self.path.parent / "game_data.db"
+        with mock.patch.object(persistence, "DATA_FILE", data), mock.patch.object(persistence, "CATALOG_DB_FILE", db), \
+             mock.patch.dict("os.environ", {}, clear=True), redirect_stdout(StringIO()) as out:
+            self.assertEqual(PersistenceService.catalog_backend, "json")
+            self.assertTrue(PersistenceService.save_characters(self.roster[:3]))
+            self.assertFalse(db.exists())
+            with mock.patch.object(PersistenceService, "catalog_backend", "sqlite"):
+                self.assertEqual([c.name for c in PersistenceService.load_characters()], ["C0", "C1", "C2"])
+                PersistenceService.save_characters(self.roster[:1])
+                SqliteCatalog.close_all()
+                self.assertEqual(len(PersistenceService.load_characters()), 1)
+            self.assertEqual(len(PersistenceService.load_characters()), 3)
+        self.assertTrue(db.exists())
+        self.assertNotIn("rows changed", out.getvalue())
+        self.assertNotIn("Importing", out.getvalue())
+
+    def test_prepare_does_not_wait_for_a_commit(self):
+        self.roster[3].stats["attack"] += 1
+        plan = self.catalog.prepare(self.roster)
+        blocker = sqlite3.connect(self.path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        writer = threading.Thread(target=self.catalog.commit, args=(plan,))
+        writer.start()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        self.assertEqual(len(self.catalog.prepare(self.roster)[0]), 1)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        blocker.execute("COMMIT")
+        writer.join(5)
+        blocker.close()
+        self.assertEqual(self.catalog.prepare(self.roster)[0], [])
+        self.assertEqual(self.reopen()[3].attack, self.roster[3].attack)
+
+    def test_only_changed_characters_are_written(self):
+        self.assertEqual(self.catalog.save(self.roster), 0)
+        self.roster[3].stats["attack"] = 99
+        self.roster[9].name = "Renamed"
+        self.roster[12].health = 1
+        self.assertEqual(self.catalog.save(self.roster), 2)
+        loaded = self.reopen()
+        self.assertEqual((loaded[3].attack, loaded[9].name, loaded[12].health), (99, "Renamed", 112))
+
+    def test_loaded_characters_are_tracked(self):
+        loaded = self.reopen()
+        self.assertEqual(self.catalog.save(loaded), 0)
+        loaded[5].abilities.append(abilities.Heal(20))
+        self.assertEqual(self.catalog.save(loaded), 1)
+
+    def test_added_removed_and_duplicated_characters(self):
+        roster = self.roster[1:] + [make_char("New", 50, 1, 5), self.roster[2]]
+        self.assertEqual(self.catalog.save(roster), 3)
+        loaded = self.reopen()
+        self.assertEqual(len(loaded), 51)
+        self.assertEqual([c.name for c in loaded[-2:]], ["New", "C2"])
+        self.assertNotIn("C0", [c.name for c in loaded])
+
+    def test_single_character_upsert(self):
+        loaded = self.reopen()
+        loaded[4].stats["defense"] = 30
+        with redirect_stdout(StringIO()):
+            self.assertTrue(PersistenceService.save_character(loaded[4], self.path))
+        self.assertFalse(self.catalog.upsert(loaded[4]))
+        self.assertEqual(self.reopen()[4].base_armor, 30)
+
+    def test_indexed_find(self):
+        self.assertEqual([c.name for c in self.catalog.find(name="C8")], ["C8"])
+        self.assertEqual(len(self.catalog.find(game="custom", min_level=1, max_level=1)), 50)
+        self.assertEqual(self.catalog.find(game="genshin"), [])
+        plan = " ".join(str(r) for r in self.catalog._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM characters WHERE name = ?", ("C8",)))
+        self.assertIn("idx_characters_name", plan)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from core.game import events as ev
+from core.game.abilities import Fireball, Thunderstorm, Doom
+from tests.test_simulator import make_char
+
+class TestBattleEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.hero = make_char("Hero", 100, 2, 20)
+        self.enemy = make_char("Enemy", 80, 5, 15)
+
+    def test_headless_apply_emits_nothing(self):
+        Fireball(30).apply(self.hero, self.enemy)
+        self.assertEqual(self.enemy.health, 55)
+
+    def test_buffer_records_and_renders(self):
+        buf = ev.EventBuffer()
+        Fireball(30).apply(self.hero, self.enemy, events=buf)
+        Thunderstorm(10, 10, 2, 2).apply(self.hero, self.enemy, events=buf)
+        Doom(2).apply(self.hero, self.enemy, events=buf)
+
+        kinds = [e[0] for e in buf]
+        self.assertEqual(kinds, [ev.FIREBALL, ev.THUNDERSTORM, ev.DOOM])
+        self.assertEqual(buf.records[0][3], 25)
+        self.assertEqual(list(ev.render_lines(buf)), [
+            " > (Skill) Hero casts Fireball at Enemy for 25 dmg",
+            " > (Skill) Hero summons Thunderstorm! Hits: 2 (5, 5). Total: 10 dmg",
+            " > (Skill) Hero casts Doom on Enemy. Death in 2 turns..",
+        ])
+
+        buf.clear()
+        self.assertEqual(len(buf), 0)
+
+    def test_status_lines(self):
+        buf = ev.EventBuffer()
+        self.enemy._frozen_turns = 1
+        Doom(1).apply(self.hero, self.enemy)
+        self.enemy.tick_status(buf)
+        self.assertEqual(list(ev.render_lines(buf)), ["[STATUS] Enemy thawed out", "[STATUS] ☠️ DOOM claims Enemy!"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from infra.api_importer import genshin_adapter, http_cache
+from infra.api_importer.http_cache import HttpCache
+from infra.api_importer.importer_service import import_character, import_characters
+from cli.commands import ImportCharCommand
+from core.game.engine import GameEngine
+from tests.test_registry import ScriptedDisplay
+
+class FakeGenshinApi(BaseHTTPRequestHandler):
+    """Stand-in for genshin.jmp.blue: /characters/<slug> with an ETag, 404 for unknown slugs."""
+    hits = []
+    version = "v1"
+    roster = ["xiao", "hu-tao", "ayaka"]
+    delay = 0.0
+
+    def do_GET(self):
+        self.hits.append(self.path)
+        time.sleep(self.delay)
+        if self.path == "/characters":
+            return self._send(json.dumps(self.roster).encode("utf-8"), '"roster"')
+        slug = self.path.rsplit("/", 1)[-1]
+        if slug == "nobody":
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{slug}-{self.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self._send(json.dumps({"id": slug, "name": slug.title(), "vision": "Anemo",
+                               "skillTalents": [{"name": "Whirl", "unlock": "Elemental Skill"}]}).encode("utf-8"), etag)
+
+    def _send(self, body: bytes, etag: str):
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class FakeApiTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGenshinApi)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeGenshinApi.hits.clear()
+        FakeGenshinApi.version, FakeGenshinApi.delay = "v1", 0.0
+        self.dir = Path(tempfile.mkdtemp())
+
+    def patched(self, cache: HttpCache):
+        return (mock.patch.object(genshin_adapter, "api_cache", cache),
+                mock.patch.object(genshin_adapter, "GENSHIN_API_URL", self.base),
+                mock.patch.object(genshin_adapter, "cache_image", lambda url, name: url))
+
+class TestHttpCache(FakeApiTestCase):
+
+    def test_reimport_after_restart_skips_the_network(self):
+        for _ in range(2):
+            api, url, image = self.patched(HttpCache(self.dir))
+            with api, url, image, redirect_stdout(StringIO()):
+                roster = [import_character("genshin", name=n) for n in ("Xiao", "Hu Tao", "Xiao")]
+                with self.assertRaises(ValueError):
+                    import_character("genshin", name="Nobody")
+        self.assertEqual([c.name for c in roster], ["Xiao", "Hu-Tao", "Xiao"])
+        self.assertIsNot(roster[0], roster[2])
+        self.assertEqual(sorted(FakeGenshinApi.hits),
+                         ["/characters/hu-tao", "/characters/nobody", "/characters/nobody", "/characters/xiao"])
+
+    def test_stale_entries_are_revalidated(self):
+        cache = HttpCache(self.dir, ttl=0)
+        url = f"{self.base}/characters/xiao"
+        self.assertFalse(cache.get(url).from_cache)
+        revalidated = cache.get(url)
+        self.assertEqual((revalidated.from_cache, revalidated.json()["id"]), (True, "xiao"))
+        FakeGenshinApi.version = "v2"
+        self.assertFalse(cache.get(url).from_cache)
+        self.assertEqual(cache.network_requests, 3)
+        self.assertEqual(cache.stats()["entries"], 1)
+
+    def test_stale_entry_served_when_offline(self):
+        url = f"{self.base}/characters/xiao"
+        HttpCache(self.dir).get(url)
+        offline = HttpCache(self.dir, ttl=0)
+        with mock.patch.object(offline.session, "get", side_effect=genshin_adapter.requests.ConnectionError):
+            self.assertEqual(offline.get(url).json()["name"], "Xiao")
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = HttpCache(self.dir)
+        urls = [f"{self.base}/characters/c{i}" for i in range(4)]
+        for i, url in enumerate(urls):
+            cache.get(url)
+            os.utime(cache._path(cache.key_for(url)), (time.time() - 100 + i, time.time() - 100 + i))
+        size = cache.stats()["bytes"] // 4
+        cache = HttpCache(self.dir, max_bytes=size * 3 + size // 2)
+        cache.get(urls[0])
+        cache.get(f"{self.base}/characters/c9")
+        self.assertEqual(cache.stats()["entries"], 3)
+        self.assertFalse(cache._path(cache.key_for(urls[1])).exists())
+        self.assertTrue(cache._path(cache.key_for(urls[0])).exists())
+
+    def test_store_writes_outside_the_lock(self):
+        cache = HttpCache(self.dir)
+        held = []
+        real_write = http_cache.atomic_write
+        def atomic_write(path):
+            held.append(cache._lock.locked())
+            return real_write(path)
+        with mock.patch.object(http_cache, "atomic_write", atomic_write):
+            cache.get(f"{self.base}/characters/xiao")
+        self.assertEqual(held, [False])
+        self.assertEqual(cache.stats()["entries"], 1)
+
+class TestBulkImport(FakeApiTestCase):
+
+    def test_import_command_fetches_concurrently(self):
+        FakeGenshinApi.delay = 0.2
+        engine, display = GameEngine(), ScriptedDisplay([])
+        names = [f"Hero_{i}" for i in range(16)] + ["Nobody"]
+        api, url, image = self.patched(HttpCache(self.dir, session=genshin_adapter.make_session(8)))
+        start = time.perf_counter()
+        with api, url, image, redirect_stdout(StringIO()):
+            ImportCharCommand(engine, display).execute(["genshin"] + names + ["45"])
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertEqual([c.name for c in engine.characters], [f"Hero-{i}" for i in range(16)])
+        self.assertEqual(engine.characters[0].level, 45)
+        self.assertTrue(display.lines[1].startswith("Imported 16 characters (Lvl 45)"))
+        self.assertIn("Failed: Nobody", display.lines[2])
+
+    def test_two_names_are_both_imported(self):
+        engine, display = GameEngine(), ScriptedDisplay([])
+        api, url, image = self.patched(HttpCache(self.dir))
+        with api, url, image, redirect_stdout(StringIO()):
+            ImportCharCommand(engine, display).execute(["genshin", "Xiao", "Hu_Tao"])
+        self.assertEqual([(c.name, c.level) for c in engine.characters], [("Xiao", 90), ("Hu-Tao", 90)])
+        self.assertNotIn("Level must be a number. Defaulting to 90", display.lines)
+
+    def test_import_all(self):
+        engine, display = GameEngine(), ScriptedDisplay([])
+        api, url, image = self.patched(HttpCache(self.dir))
+        with api, url, image, redirect_stdout(StringIO()):
+            ImportCharCommand(engine, display).execute(["genshin", "--all"])
+            characters, errors = import_characters("genshin", ["Xiao", "Xiao", "Ayaka"], concurrency=1)
+        self.assertEqual([c.name for c in engine.characters], ["Xiao", "Hu-Tao", "Ayaka"])
+        self.assertEqual(([c.name for c in characters], errors), (["Xiao", "Ayaka"], {}))
+        self.assertEqual(len(FakeGenshinApi.hits), 4)
+
+if __name__ == '__main__':
+    unittest.main()
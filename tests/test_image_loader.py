@@ -0,0 +1,223 @@
+import struct
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+from contextlib import ExitStack, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from infra import image_loader
+from cli.commands import CacheCommand
+from core.game.engine import GameEngine
+from tests.test_registry import ScriptedDisplay
+
+def make_png(text: bytes = b"") -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 6, 0, 0, 0))
+            + chunk(b"tEXt", text) + chunk(b"IEND", b""))
+
+PNG = make_png(b"\0" * 64)
+
+class FakeMirror(BaseHTTPRequestHandler):
+    """/slow/* never answers in time, /miss/* is a 404 and /hit/<name>.png has icons for `known`."""
+    known = {"hutao", "xiao"}
+    delay = 2.0
+    hits = []
+    in_flight = peak = 0
+    counter = threading.Lock()
+
+    def do_GET(self):
+        self.hits.append(self.path)
+        with self.counter:
+            FakeMirror.in_flight += 1
+            FakeMirror.peak = max(FakeMirror.peak, FakeMirror.in_flight)
+        try:
+            self._answer()
+        finally:
+            with self.counter:
+                FakeMirror.in_flight -= 1
+
+    def _answer(self):
+        kind, name = self.path.strip("/").split("/", 1)
+        if kind == "slow":
+            time.sleep(self.delay)
+        if kind == "lag":
+            time.sleep(0.1)
+        if kind == "hit" and name[:-4] in self.known:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(PNG)))
+            self.end_headers()
+            self.wfile.write(PNG)
+            return
+        self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+class MirrorServer(ThreadingHTTPServer):
+    # Probes arrive in bursts of dozens of connections.
+    request_queue_size = 128
+    daemon_threads = True
+
+class TestImageResolver(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MirrorServer(("127.0.0.1", 0), FakeMirror)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.stack = ExitStack()
+        self.stack.enter_context(redirect_stdout(StringIO()))
+        for name, value in (("CACHE_DIR", self.dir), ("MIRROR_STATS_FILE", self.dir / "mirror_stats.json"),
+                            ("MISSING_FILE", self.dir / "missing.json"), ("MANIFEST_FILE", self.dir / "manifest.json"),
+                            ("PROBE_TIMEOUT", 1), ("_stats", None), ("_missing", None), ("_manifest", None),
+                            ("_session", None),
+                            ("MIRRORS", {"slow": self.base + "/slow/{cap}.png", "miss": self.base + "/miss/{cap}.png",
+                                         "hit": self.base + "/hit/{lower}.png"})):
+            self.stack.enter_context(mock.patch.object(image_loader, name, value))
+
+        FakeMirror.hits.clear()
+        FakeMirror.peak = 0
+
+    def tearDown(self):
+        self.stack.close()
+
+    def test_first_png_wins_without_waiting_for_slow_mirrors(self):
+        start = time.perf_counter()
+        path = image_loader.cache_image("remote", "Hu Tao")
+        self.assertLess(time.perf_counter() - start, 0.9)
+        self.assertEqual(Path(path).read_bytes(), PNG)
+        self.assertEqual(image_loader._mirror_stats(), {"hit/alias": 1})
+
+        image_loader._stats = None
+        self.assertEqual(image_loader.candidate_urls("Xiao")[0][0], "hit/nospace")
+
+    def test_missing_icon_costs_about_one_timeout(self):
+        start = time.perf_counter()
+        self.assertEqual(image_loader.cache_image("remote", "Kamisato Nobody"), "remote")
+        self.assertLess(time.perf_counter() - start, 1.9)
+        self.assertGreater(len(image_loader.candidate_urls("Kamisato Nobody")), 8)
+
+    def test_every_candidate_is_probed_in_one_wave(self):
+        image_loader.MIRRORS.update({m: self.base + f"/slow/{m}-{{cap}}.png" for m in ("a", "b", "c", "d")})
+        with mock.patch.dict(image_loader.ALIASES, {"big Bad wolf": "Wolfy"}):
+            self.assertGreater(len(image_loader.candidate_urls("big Bad wolf")), 16)
+            start = time.perf_counter()
+            self.assertEqual(image_loader.cache_image("remote", "big Bad wolf"), "remote")
+        self.assertLess(time.perf_counter() - start, 1.9)
+
+    def test_concurrent_lookups_probe_everything(self):
+        image_loader.MIRRORS.clear()
+        image_loader.MIRRORS.update({m: self.base + f"/lag/{m}-{{cap}}.png" for m in ("a", "b", "c")})
+        names = [f"Unknown Hero{i}" for i in range(8)]
+        threads = [threading.Thread(target=image_loader.cache_image, args=("", n)) for n in names]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.assertEqual(len(FakeMirror.hits), sum(len(image_loader.candidate_urls(n)) for n in names))
+
+    def test_slow_lookups_do_not_hold_up_others(self):
+        image_loader.MIRRORS.update({m: self.base + f"/slow/{m}-{{cap}}.png" for m in ("a", "b")})
+        names = [f"Unknown Hero{i}" for i in range(6)]
+        slow = [threading.Thread(target=image_loader.cache_image, args=("", n)) for n in names]
+        self.assertGreater(sum(len(image_loader.candidate_urls(n)) for n in names), 2 * image_loader.probe_workers())
+        for t in slow: t.start()
+        time.sleep(0.2)
+        start = time.perf_counter()
+        path = image_loader.cache_image("remote", "Hu Tao")
+        self.assertLess(time.perf_counter() - start, 0.9)
+        self.assertEqual(Path(path).read_bytes(), PNG)
+        for t in slow: t.join()
+
+    def test_failed_lookups_are_remembered_until_cleared(self):
+        image_loader.MIRRORS.pop("slow")
+        self.assertEqual(image_loader.cache_image("", "Custom Hero"), "")
+        probes = len(FakeMirror.hits)
+        self.assertGreater(probes, 0)
+        image_loader._missing = None
+        for _ in range(3):
+            self.assertEqual(image_loader.cache_image("", "Custom Hero"), "")
+        self.assertEqual(len(FakeMirror.hits), probes)
+
+        image_loader.MIRRORS["extra"] = self.base + "/miss/extra-{lower}.png"
+        image_loader.cache_image("", "Custom Hero")
+        self.assertTrue(all("/extra-" in hit for hit in FakeMirror.hits[probes:]))
+        self.assertEqual(image_loader.missing_count(), 1)
+
+        display = ScriptedDisplay([])
+        CacheCommand(GameEngine(), display).execute(["clear-missing", "Custom_Hero"])
+        self.assertEqual(display.lines, ["Forgot 1 failed image lookups; they will be searched again"])
+        FakeMirror.hits.clear()
+        image_loader.cache_image("", "Custom Hero")
+        self.assertEqual(len(FakeMirror.hits), len(image_loader.candidate_urls("Custom Hero")))
+
+    def test_network_errors_expire_soon(self):
+        image_loader.cache_image("", "Kamisato Nobody")
+        entry = image_loader._missing_entries()["kamisato_nobody"]
+        self.assertLess(entry["expires_at"] - time.time(), image_loader.MISSING_RETRY_TTL + 1)
+
+class TestImageCacheManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.stack = ExitStack()
+        for name, value in (("CACHE_DIR", self.dir), ("MANIFEST_FILE", self.dir / "manifest.json"),
+                            ("MISSING_FILE", self.dir / "missing.json"), ("_manifest", None), ("_missing", None),
+                            ("IMAGE_CACHE_MAX_BYTES", 10 * len(PNG))):
+            self.stack.enter_context(mock.patch.object(image_loader, name, value))
+
+    def tearDown(self):
+        self.stack.close()
+
+    def test_lookups_come_from_the_manifest(self):
+        (self.dir / "xiao.png").write_bytes(PNG)
+        (self.dir / "broken.png").write_bytes(PNG[:40])
+        self.assertEqual(image_loader.image_cache_stats()["files"], 1)
+        self.assertFalse((self.dir / "broken.png").exists())
+
+        image_loader._manifest = None
+        with mock.patch.object(image_loader, "resolve_image") as resolve, \
+             mock.patch.object(Path, "stat", side_effect=AssertionError("stat on lookup")):
+            self.assertEqual(image_loader.cache_image("", "Xiao"), str(self.dir / "xiao.png"))
+        resolve.assert_not_called()
+        with self.assertRaises(ValueError):
+            image_loader._store_image("bad", b"<html>not found</html>")
+
+    def test_size_cap_evicts_least_recently_used(self):
+        image_loader.IMAGE_CACHE_MAX_BYTES = 3 * len(PNG)
+        for i, name in enumerate(("a", "b", "c")):
+            image_loader._store_image(name, PNG)
+            image_loader._manifest_entries()[name]["last_access"] = 1000 + i
+        image_loader._cached_path("a")
+        image_loader._store_image("d", PNG)
+        self.assertEqual(sorted(image_loader._manifest_entries()), ["a", "c", "d"])
+        self.assertEqual(sorted(p.name for p in self.dir.glob("*.png")), ["a.png", "c.png", "d.png"])
+
+    def test_cache_commands(self):
+        for name in ("a", "b", "c"):
+            image_loader._store_image(name, make_png(name.encode()))
+        (self.dir / "b.png").write_bytes(make_png(b"swapped"))
+        display = ScriptedDisplay([])
+        command = CacheCommand(GameEngine(), display)
+        command.execute(["prune", "0"])
+        command.execute(["stats"])
+        command.execute(["shrink"])
+        self.assertEqual(display.lines[0], "Removed 1 corrupt and 2 least recently used images (0.0 MiB freed)")
+        self.assertTrue(display.lines[1].startswith("Images: 0 files, 0.0 MiB of 0 MiB; 0 failed lookups"))
+        self.assertEqual(display.lines[-1], CacheCommand.USAGE)
+        self.assertEqual(list(self.dir.glob("*.png")), [])
+
+if __name__ == '__main__':
+    unittest.main()
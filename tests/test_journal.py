@@ -0,0 +1,117 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from infra.journal import HistoryJournal
+from infra.persistence import PersistenceService
+from core.game.gamestate import GameSession, PlayingState
+from core.game.engine import GameEngine
+from tests.test_registry import ScriptedDisplay
+
+class TestHistoryJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / "session"
+        self.journal = HistoryJournal(self.path, fsync_every=4, compact_every=10)
+
+    def tearDown(self):
+        self.journal.close()
+
+    def reopen(self) -> HistoryJournal:
+        self.journal.close()
+        self.journal = HistoryJournal(self.path, fsync_every=4, compact_every=10)
+        return self.journal
+
+    def test_pages_across_snapshot_and_journal(self):
+        for i in range(205):
+            self.journal.append(f"event {i}")
+        self.assertEqual(len(self.journal._offsets), 5)
+        self.assertEqual(len(self.journal), 205)
+        self.assertEqual(self.journal[63:66], ["event 63", "event 64", "event 65"])
+        self.assertEqual(self.journal[198:205], [f"event {i}" for i in range(198, 205)])
+        self.assertEqual((self.journal[0], self.journal[-1]), ("event 0", "event 204"))
+        self.assertEqual(list(self.reopen()), [f"event {i}" for i in range(205)])
+
+    def test_torn_line_and_unfinished_compaction_are_recovered(self):
+        for i in range(15):
+            self.journal.append(i)
+        self.journal.flush()
+        with open(self.journal.journal_path, "ab") as f:
+            f.write(b'"half a rec')
+        with open(self.journal.snapshot_path, "ab") as f:
+            f.write(b"99\n")
+        self.assertEqual(list(self.reopen()), list(range(15)))
+
+        for i in range(15, 20):
+            with mock.patch.object(HistoryJournal, "_fold_journal"):
+                self.journal.append(i)
+        self.assertEqual(list(self.reopen()), list(range(20)))
+        self.assertEqual(len(self.journal._offsets), 0)
+
+    def test_save_game_references_the_journal(self):
+        self.journal.append("hit")
+        save = self.path.parent / "save.json"
+        with mock.patch("infra.persistence.SAVE_GAME_FILE", save), redirect_stdout(StringIO()):
+            self.assertTrue(PersistenceService.save_game([], self.journal))
+            _, history = PersistenceService.load_game()
+        self.assertNotIn('"hit"', save.read_text(encoding="utf-8"))
+        self.assertEqual(list(history), ["hit"])
+        history.close()
+
+    def test_loaded_history_stops_at_the_save(self):
+        save = self.path.parent / "save.json"
+        history_dir = self.path.parent / "history"
+        with mock.patch("infra.persistence.SAVE_GAME_FILE", save), \
+             mock.patch("core.game.gamestate.HISTORY_DIR", history_dir), redirect_stdout(StringIO()):
+            first = GameSession(GameEngine(), ScriptedDisplay([]))
+            first.log("hit")
+            PlayingState(first).handle_input("save")
+            first.log("after the save")
+            first.history.close()
+            GameSession(GameEngine(), ScriptedDisplay(["quit"])).run()
+            _, history = PersistenceService.load_game()
+        self.assertEqual(list(history), ["hit"])
+        self.assertEqual((len(history), history[-1:], history[::-1]), (1, list(history), list(history)))
+        history.close()
+        self.assertEqual(len(list(history_dir.glob("*.journal"))), 1)
+
+    def test_save_references_the_journal_relatively_and_drops_the_replaced_one(self):
+        data = self.path.parent / "data"
+        save = data / "save.json"
+        with mock.patch("infra.persistence.SAVE_GAME_FILE", save), \
+             mock.patch("core.game.gamestate.HISTORY_DIR", data / "history"), redirect_stdout(StringIO()):
+            first = GameSession(GameEngine(), ScriptedDisplay([]))
+            first.log("first")
+            PlayingState(first).handle_input("save")
+            PlayingState(first).handle_input("save")
+            self.assertTrue(first.history.journal_path.exists())
+            first.history.close()
+            second = GameSession(GameEngine(), ScriptedDisplay([]))
+            second.log("second")
+            PlayingState(second).handle_input("save")
+            second.history.close()
+        self.assertFalse(first.history.journal_path.exists())
+        self.assertEqual([p.name for p in (data / "history").glob("*.journal")], [second.history.journal_path.name])
+        self.assertIn(f'"history/{second.history.path.name}"', save.read_text(encoding="utf-8"))
+
+        moved = data.rename(self.path.parent / "moved")
+        with mock.patch("infra.persistence.SAVE_GAME_FILE", moved / "save.json"), redirect_stdout(StringIO()):
+            _, history = PersistenceService.load_game()
+        self.assertEqual(list(history), ["second"])
+        history.close()
+
+    def test_history_command_pages(self):
+        display = ScriptedDisplay([])
+        session = GameSession(GameEngine(), display, self.journal)
+        for i in range(45):
+            session.history.append(f"log {i}")
+        state = PlayingState(session)
+        state.handle_input("history")
+        self.assertEqual(display.lines[-6:], ["\n-- Battle History (page 3/3) --"] + [f" > log {i}" for i in range(40, 45)])
+        state.handle_input("history 1")
+        self.assertEqual(display.lines[-1], " > log 19")
+
+if __name__ == '__main__':
+    unittest.main()
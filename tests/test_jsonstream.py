@@ -0,0 +1,64 @@
+import io
+import json
+import tracemalloc
+import unittest
+from infra import jsonstream
+
+class TestJsonStream(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [{"id": i, "name": f"Ünit {i}", "stats": {"hp": 100 + i, "crit": 0.15}, "tags": [None, True]}
+                        for i in range(300)]
+
+    def write(self, records, trailer=None) -> str:
+        f = io.StringIO()
+        count = jsonstream.write_document(f, {"version": 2, "ability_encoding": 1}, "characters", iter(records), trailer)
+        self.assertEqual(count, len(records))
+        return f.getvalue()
+
+    def test_output_is_plain_json(self):
+        text = self.write(self.records, {"history": ["a", "b"]})
+        self.assertEqual(json.loads(text), {"version": 2, "ability_encoding": 1, "characters": self.records,
+                                            "history": ["a", "b"]})
+        self.assertEqual(json.loads(self.write([])), {"version": 2, "ability_encoding": 1, "characters": []})
+
+    def test_round_trip_across_chunk_boundaries(self):
+        text = self.write(self.records, {"history": ["x"], "total": 12345})
+        for chunk_size in (1, 7, 64, 1 << 16):
+            fields, records = jsonstream.read_document(io.StringIO(text), "characters", chunk_size)
+            self.assertEqual(fields, {"version": 2, "ability_encoding": 1})
+            self.assertEqual(list(records), self.records)
+            self.assertEqual(fields["history"], ["x"])
+            self.assertEqual(fields["total"], 12345)
+
+    def test_reads_json_dump_and_bare_lists(self):
+        doc = json.dumps({"ability_encoding": 1, "characters": self.records[:3]}, indent=4)
+        fields, records = jsonstream.read_document(io.StringIO(doc), "characters", 5)
+        self.assertEqual((fields, list(records)), ({"ability_encoding": 1}, self.records[:3]))
+        fields, records = jsonstream.read_document(io.StringIO(json.dumps(self.records[:2])), "characters")
+        self.assertEqual((fields, list(records)), ({}, self.records[:2]))
+        fields, records = jsonstream.read_document(io.StringIO('{"other": 1}'), "characters")
+        self.assertEqual((fields, list(records)), ({"other": 1}, []))
+
+    def test_truncated_file_raises(self):
+        text = self.write(self.records)
+        _, records = jsonstream.read_document(io.StringIO(text[:len(text) // 2]), "characters", 256)
+        with self.assertRaises(ValueError):
+            list(records)
+
+    def test_memory_stays_bounded(self):
+        text = self.write(self.records * 40)
+        f = io.StringIO(text)
+        tracemalloc.start()
+        try:
+            _, records = jsonstream.read_document(f, "characters", 4096)
+            count = sum(1 for _ in records)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 12000)
+        self.assertLess(peak, 256 * 1024)
+        self.assertGreater(len(text), 1 << 20)
+
+if __name__ == '__main__':
+    unittest.main()
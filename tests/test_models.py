@@ -80,4 +80,32 @@ class TestCharacterAndAbilities(unittest.TestCase):
         self.char1.end_turn_update() 
 
         log3 = brain_sap.use(self.char1, self.char2)
-        self.assertIn("drains mind", log3)
\ No newline at end of file
+        self.assertIn("drains mind", log3)
+
+
+class TestDerivedStatCache(unittest.TestCase):
+
+    def setUp(self):
+        self.char = Character(id="k", name="Knight", game="custom", level=1,
+                              stats={"max_hp": 100, "attack": 10, "defense": 3})
+
+    def test_equip_invalidates(self):
+        self.assertEqual((self.char.attack, self.char.armor), (10, 3))
+        self.char.equip(Item(name="Sword", bonus_attack=5, bonus_armor=2, bonus_hp=20))
+        self.assertEqual((self.char.attack, self.char.armor, self.char.health), (15, 5, 120))
+
+    def test_stat_writes_invalidate(self):
+        self.assertEqual(self.char.attack, 10)
+        self.char.stats["attack"] = 25
+        self.char.stats.update(defense=7)
+        self.assertEqual((self.char.attack, self.char.armor), (25, 7))
+        self.char.stats.pop("health", None)
+        self.char.stats["max_hp"] = 60
+        self.assertEqual(self.char.health, 60)
+
+    def test_health_and_temp_armor(self):
+        self.char.health = 0
+        self.assertFalse(self.char.is_alive())
+        self.assertEqual(self.char.stats["health"], 0)
+        self.char._temp_armor = 4
+        self.assertEqual(self.char.armor, 7)
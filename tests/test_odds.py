@@ -0,0 +1,31 @@
+import unittest
+from core.game.grouping import SplitInTwoStrategy
+from core.game.odds import estimate_odds, wilson_interval
+from tests.test_simulator import make_char
+
+class TestOdds(unittest.TestCase):
+
+    def test_wilson_interval(self):
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=3)
+        self.assertAlmostEqual(high, 0.5962, places=3)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        self.assertEqual(wilson_interval(0, 10)[0], 0.0)
+
+    def test_lopsided_matchup_stops_early(self):
+        roster = [make_char("Giant", 500, 10, 40), make_char("Rat", 30, 0, 5)]
+        report = estimate_odds(roster, SplitInTwoStrategy(), tolerance=0.05, min_trials=100, batch=50)
+        self.assertTrue(report.converged)
+        self.assertLessEqual(report.trials, 200)
+        self.assertEqual(report.win_prob, 1.0)
+        self.assertLess(report.win_ci[1] - report.win_ci[0], 0.05)
+
+    def test_even_matchup_needs_more_trials(self):
+        roster = [make_char("Twin1", 100, 2, 12), make_char("Twin2", 100, 2, 12)]
+        report = estimate_odds(roster, SplitInTwoStrategy(), tolerance=0.1, max_trials=2000)
+        self.assertGreater(report.trials, 200)
+        self.assertTrue(report.win_ci[0] <= report.win_prob <= report.win_ci[1])
+        self.assertTrue(report.turns_ci[0] <= report.mean_turns <= report.turns_ci[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from core.game import abilities, registry
+from core.game.models import Item, Skill
+from infra.persistence import PersistenceService
+from infra.storage import GameStorage
+from tests.test_simulator import make_char
+
+class TestAbilityPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.hero = make_char("Hero", 120, 3, 14)
+        self.hero.abilities.extend([abilities.Fireball(33), Skill(id=1, name="Burst", power=2.5),
+                                    abilities.BlackHole(45, 3)])
+        self.hero.equip(Item(name="Helm", slot="head", bonus_armor=2))
+
+    def assert_same_abilities(self, loaded):
+        self.assertEqual([type(a) for a in loaded.abilities], [abilities.Fireball, Skill, abilities.BlackHole])
+        self.assertEqual((loaded.abilities[0].damage, loaded.abilities[2].min_turn), (33, 3))
+        self.assertEqual(loaded.abilities[1].power, 2.5)
+
+    def test_catalog_round_trip(self):
+        path = self.dir / "catalog.json"
+        with redirect_stdout(StringIO()):
+            self.assertTrue(PersistenceService.save_characters([self.hero], path))
+            (loaded,) = PersistenceService.load_characters(path)
+        self.assert_same_abilities(loaded)
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(raw["ability_encoding"], registry.ENCODING_VERSION)
+        self.assertEqual(raw["characters"][0]["skills"][0], ["fireball", 33])
+
+    def test_legacy_catalog_drops_generic_ability_dicts(self):
+        path = self.dir / "legacy.json"
+        path.write_text(json.dumps({"characters": [{"id": "a", "name": "A", "game": "custom", "level": 1,
+            "stats": {"max_hp": 50}, "skills": [{"name": "Fireball", "description": "", "damage": 0},
+                                                 {"id": 2, "name": "Slash"}]}]}), encoding="utf-8")
+        with redirect_stdout(StringIO()):
+            (loaded,) = PersistenceService.load_characters(path)
+        self.assertEqual([s.name for s in loaded.skills], ["Slash"])
+
+    def test_game_storage_round_trip(self):
+        path = self.dir / "save.json"
+        self.hero.health = 40
+        abilities.Freeze(2).apply(self.hero, self.hero)
+        with redirect_stdout(StringIO()):
+            GameStorage.save_game([self.hero], path)
+            (loaded,) = GameStorage.load_game(path)
+        self.assert_same_abilities(loaded)
+        self.assertEqual((loaded.health, loaded.armor, loaded.items[0].name), (40, 5, "Helm"))
+        self.assertEqual(loaded._frozen_turns, 0)
+
+    def test_game_storage_reads_version_1_saves(self):
+        path = self.dir / "old.json"
+        path.write_text(json.dumps([{"id": "a", "name": "A", "game": "custom", "level": 2,
+                                     "stats": {"max_hp": 70}, "skills": [{"name": "Slash"}],
+                                     "equipment": [{"name": "Ring", "bonus_hp": 5}], "metadata": {},
+                                     "_temp_armor": 0, "_frozen_turns": 0, "_doom_counter": None}]),
+                        encoding="utf-8")
+        with redirect_stdout(StringIO()):
+            (loaded,) = GameStorage.load_game(path)
+        self.assertEqual((loaded.name, loaded.level, loaded.skills[0].name, loaded.items[0].bonus_hp),
+                         ("A", 2, "Slash", 5))
+
+if __name__ == '__main__':
+    unittest.main()
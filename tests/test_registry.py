@@ -0,0 +1,69 @@
+import random
+import unittest
+from core.game import abilities, registry
+from core.game.engine import GameEngine
+from cli.commands import AddAbilityCommand, CreateCharCommand
+from tests.test_simulator import make_char
+
+class ScriptedDisplay:
+    def __init__(self, answers):
+        self.answers, self.lines = list(answers), []
+    def show(self, message): self.lines.append(str(message))
+    def prompt(self, message): return self.answers.pop(0)
+
+class TestAbilityRegistry(unittest.TestCase):
+
+    def test_every_ability_is_registered(self):
+        classes = {cls for cls in vars(abilities).values()
+                   if isinstance(cls, type) and issubclass(cls, abilities.Ability) and cls is not abilities.Ability}
+        self.assertEqual(classes, set(registry.BY_CLASS))
+
+    def test_defaults_and_overrides(self):
+        storm = registry.get("storm").create()
+        self.assertEqual((storm.dmg_min, storm.dmg_max, storm.hits_min, storm.hits_max), (5, 15, 1, 4))
+        hole = registry.get("blackhole").create(70)
+        self.assertEqual((hole.damage, hole.min_turn), (70, 4))
+        shield = registry.get("shield").create(duration=5)
+        self.assertEqual((shield.bonus, shield.duration), (4, 5))
+
+    def test_roll_stays_in_range(self):
+        rng = random.Random(1)
+        for spec in registry.SPECS:
+            for _ in range(20):
+                values = spec.values(spec.roll(rng))
+                for param, val in zip(spec.params, values):
+                    self.assertTrue(param.roll[0] <= val <= param.roll[1], (spec.tag, param.name, val))
+
+    def test_encode_round_trip(self):
+        for spec in registry.SPECS:
+            ab = spec.roll(random.Random(2))
+            data = registry.encode(ab)
+            self.assertEqual(data[0], spec.tag)
+            restored = registry.decode(data)
+            self.assertIs(type(restored), spec.cls)
+            self.assertEqual(vars(restored), vars(ab))
+        with self.assertRaises(ValueError):
+            registry.decode(["nope", 1])
+
+class TestAbilityCommands(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = GameEngine()
+        self.engine.add_character(make_char("Hero", 100, 2, 10))
+
+    def test_add_ability(self):
+        display = ScriptedDisplay(["Hero", "storm"])
+        AddAbilityCommand(self.engine, display).execute([])
+        self.assertIsInstance(self.engine.characters[0].abilities[0], abilities.Thunderstorm)
+
+    def test_create_char_uses_spec_prompt(self):
+        storm_key = str(registry.SPECS.index(registry.get("thunderstorm")) + 1)
+        freeze_key = str(registry.SPECS.index(registry.get("freeze")) + 1)
+        display = ScriptedDisplay(["Mage", "90", "1", "12", "", "", storm_key, "25", freeze_key, "0"])
+        CreateCharCommand(self.engine, display).execute([])
+        storm, freeze = self.engine.get_character_by_name("Mage").abilities
+        self.assertEqual((storm.dmg_min, storm.dmg_max, storm.hits_max), (5, 25, 4))
+        self.assertEqual(freeze.duration, 1)
+
+if __name__ == '__main__':
+    unittest.main()
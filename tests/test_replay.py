@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from core.game import abilities, registry
+from core.game.engine import GameEngine
+from core.game.generator import CharGenerator
+from core.game.grouping import TwoVsTwoStrategy
+from core.game.models import Skill
+from core.game.replay import Replay, battle_outcome
+from core.game.rng import derive_seed, rng_stream
+from tests.test_simulator import make_char
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.roster = [make_char("A", 120, 2, 15), make_char("B", 100, 3, 12),
+                       make_char("C", 90, 1, 14), make_char("D", 110, 4, 11)]
+        self.roster[0].abilities.append(abilities.Thunderstorm(5, 15, 1, 3))
+        self.roster[1].abilities.append(abilities.BlackHole(40, 2))
+        self.roster[2].abilities.append(abilities.Shield(4, 2))
+        self.roster[3].abilities.append(abilities.Doom(3))
+
+    def play(self, seed, initiative=False):
+        engine, strategy = GameEngine(), TwoVsTwoStrategy()
+        engine.start_battle(initiative=initiative, seed=seed)
+        team1, team2 = strategy.group(self.roster)
+        turn = 1
+        while any(c.is_alive() for c in team1) and any(c.is_alive() for c in team2):
+            engine.resolve_turn(self.roster, strategy, engine.events)
+            if not any(c.is_alive() for c in team1) or not any(c.is_alive() for c in team2): break
+            turn += 1
+            if turn > 30:
+                turn = 30
+                break
+        return battle_outcome(team1, team2, turn)
+
+    def test_replay_matches_live_battle(self):
+        for seed, initiative in ((1, False), (2, True), ("x", False)):
+            self.setUp()
+            replay = Replay.record(seed, "2vs2", self.roster, initiative)
+            live = self.play(seed, initiative)
+            self.assertEqual(replay.run(TwoVsTwoStrategy()), live)
+
+    def test_save_and_load(self):
+        replay = Replay.record(5, "2vs2", self.roster)
+        replay.result = replay.run(TwoVsTwoStrategy())
+        path = Path(tempfile.mkdtemp()) / "battle.json"
+        replay.save(path)
+        loaded = Replay.load(path)
+        self.assertEqual(loaded, replay)
+        self.assertEqual(loaded.run(TwoVsTwoStrategy()), replay.result)
+        self.assertLess(os.path.getsize(path), 2048)
+
+    def test_imported_skills_are_recorded(self):
+        self.roster[0].skills.append(Skill(id=3, name="Burst", power=2.0))
+        replay = Replay.record(1, "2vs2", self.roster)
+        self.assertEqual(replay.roster[0]["abilities"], [["thunderstorm", 5, 15, 1, 3],
+                                                         {"id": 3, "name": "Burst", "description": "",
+                                                          "power": 2.0, "cooldown": None}])
+        self.assertEqual(replay.run(TwoVsTwoStrategy()), self.play(1))
+
+class TestRngStreams(unittest.TestCase):
+
+    def test_streams_are_reproducible_and_independent(self):
+        self.assertEqual(derive_seed(3, 1, "w"), "3:1:w")
+        self.assertEqual(rng_stream(3, 1).random(), rng_stream(3, 1).random())
+        self.assertNotEqual(rng_stream(3, 1).random(), rng_stream(3, 2).random())
+
+    def test_generator_uses_given_rng(self):
+        first = CharGenerator.generate_team(3, rng_stream(9))
+        second = CharGenerator.generate_team(3, rng_stream(9))
+        self.assertEqual([(c.name, c.health, c.attack, c.armor) for c in first],
+                         [(c.name, c.health, c.attack, c.armor) for c in second])
+        self.assertEqual([registry.encode_skills(c.abilities) for c in first],
+                         [registry.encode_skills(c.abilities) for c in second])
+
+if __name__ == '__main__':
+    unittest.main()
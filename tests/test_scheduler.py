@@ -0,0 +1,58 @@
+import random
+import unittest
+from collections import Counter
+from core.game.scheduler import InitiativeScheduler
+from core.game.engine import GameEngine
+from core.game.grouping import SplitInTwoStrategy
+from tests.test_simulator import make_char
+
+def with_speed(name: str, speed: int):
+    char = make_char(name, 100, 0, 1)
+    char.stats["speed"] = speed
+    return char
+
+class TestInitiativeScheduler(unittest.TestCase):
+
+    def test_actions_follow_speed(self):
+        fast, normal, slow = with_speed("Fast", 20), with_speed("Normal", 10), with_speed("Slow", 5)
+        sched = InitiativeScheduler(random.Random(1))
+        acted = Counter()
+        for _ in range(20):
+            acted.update(c.name for c in sched.turn([fast, normal, slow]))
+        self.assertEqual(acted, {"Fast": 40, "Normal": 20, "Slow": 10})
+
+    def test_order_is_by_time(self):
+        actors = [with_speed(f"c{i}", 5 + i) for i in range(50)]
+        sched = InitiativeScheduler(random.Random(2))
+        for _ in range(5):
+            times = []
+            for _ in sched.turn(actors):
+                times.append(sched.now)
+            self.assertEqual(times, sorted(times))
+
+    def test_dead_are_dropped(self):
+        a, b = with_speed("A", 10), with_speed("B", 10)
+        sched = InitiativeScheduler(random.Random(3))
+        list(sched.turn([a, b]))
+        b.health = 0
+        self.assertEqual([c.name for c in sched.turn([a, b])], ["A"])
+        self.assertEqual(len(sched), 1)
+
+    def test_frozen_actor_is_rescheduled(self):
+        engine = GameEngine()
+        engine.start_battle(initiative=True)
+        a, b = with_speed("A", 10), with_speed("B", 10)
+        a._frozen_turns = 1
+        engine.resolve_turn([a, b], SplitInTwoStrategy(), engine.events)
+        self.assertEqual(a._frozen_turns, 0)
+        self.assertEqual(len(engine.initiative), 2)
+
+    def test_start_battle_resets(self):
+        engine = GameEngine()
+        engine.start_battle(initiative=True)
+        self.assertIsNotNone(engine.initiative)
+        engine.start_battle()
+        self.assertIsNone(engine.initiative)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from core.game.models import Character
+from core.game.grouping import SplitInTwoStrategy, TwoVsTwoStrategy, FiveVsFiveStrategy
+from core.game.simulator import BattleSimulator, TEAM_1, TEAM_2, DRAW
+from core.game.combatant import build_sides
+from core.game.engine import play_turn
+from core.game.generator import CharGenerator
+from core.game.rng import rng_stream
+from core.game.status import StatusTimeline
+from core.game.teams import TeamIndex
+from core.game import abilities
+
+def make_char(name: str, hp: int, armor: int, atk: int) -> Character:
+    return Character(id=name.lower(), name=name, game="custom", level=1,
+                     stats={"max_hp": hp, "health": hp, "attack": atk, "defense": armor})
+
+class TestBattleSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.roster = [make_char("A", 120, 2, 15), make_char("B", 100, 3, 12),
+                       make_char("C", 90, 1, 14), make_char("D", 110, 4, 11)]
+        self.roster[0].abilities.append(abilities.Fireball(30))
+        self.roster[2].abilities.append(abilities.Thunderstorm(5, 15, 1, 3))
+        self.roster[3].abilities.append(abilities.BlackHole(40, 1))
+
+    def test_same_seed_same_results(self):
+        first = BattleSimulator(self.roster, TwoVsTwoStrategy(), seed=7).run_many(50)
+        second = BattleSimulator(self.roster, TwoVsTwoStrategy(), seed=7).run_many(50)
+        self.assertEqual(first, second)
+        self.assertEqual(first[10], BattleSimulator(self.roster, TwoVsTwoStrategy(), seed=7).run(10))
+
+    def test_inlined_turns_match_play_turn(self):
+        rng = rng_stream(2, "roster")
+        roster = CharGenerator.generate_team(10, rng)
+        for c in roster[::2]:
+            c.abilities = [roll(rng) for roll in CharGenerator.ABILITY_POOL]
+
+        def reference(index: int):
+            team1, team2 = build_sides(*FiveVsFiveStrategy().group(roster))
+            participants, teams, statuses = team1 + team2, TeamIndex(team1, team2), StatusTimeline()
+            battle_rng = rng_stream(9, index)
+            for turn in range(1, 31):
+                order = participants[:]
+                battle_rng.shuffle(order)
+                play_turn(order, teams, statuses, battle_rng)
+                if not teams.alive[0] or not teams.alive[1]:
+                    break
+            alive1, alive2 = bool(teams.alive[0]), bool(teams.alive[1])
+            winner = DRAW if alive1 == alive2 else TEAM_1 if alive1 else TEAM_2
+            return winner, turn, tuple(max(0, c.health) for c in participants)
+
+        results = BattleSimulator(roster, FiveVsFiveStrategy(), seed=9).run_many(200)
+        self.assertEqual([(r.winner, r.turns, r.survivors_hp) for r in results], [reference(i) for i in range(200)])
+
+    def test_roster_is_left_untouched(self):
+        self.roster[1].health = 42
+        BattleSimulator(self.roster, SplitInTwoStrategy(), seed=1).run_many(20)
+        self.assertEqual(self.roster[1].health, 42)
+        self.assertEqual(self.roster[3]._frozen_turns, 0)
+
+    def test_result_record(self):
+        for res in BattleSimulator(self.roster, TwoVsTwoStrategy(), seed=3, max_turns=30).run_many(30):
+            self.assertIn(res.winner, (TEAM_1, TEAM_2, DRAW))
+            self.assertTrue(1 <= res.turns <= 30)
+            self.assertEqual(len(res.survivors_hp), 4)
+            if res.winner == TEAM_1:
+                self.assertTrue(any(res.survivors_hp[:2]))
+                self.assertFalse(any(res.survivors_hp[2:]))
+
+    def test_write_back(self):
+        res = BattleSimulator(self.roster, TwoVsTwoStrategy(), seed=4).run(write_back=True)
+        self.assertEqual(tuple(max(0, c.health) for c in self.roster), res.survivors_hp)
+
+    def test_turn_cap_is_a_draw(self):
+        tanks = [make_char(n, 10_000, 50, 1) for n in "WXYZ"]
+        res = BattleSimulator(tanks, TwoVsTwoStrategy(), seed=0, max_turns=5).run()
+        self.assertEqual(res.winner, DRAW)
+        self.assertEqual(res.turns, 5)
+
+    def test_grouping_failure(self):
+        sim = BattleSimulator(self.roster[:2], TwoVsTwoStrategy())
+        self.assertIsNone(sim.run())
+        self.assertEqual(sim.run_many(5), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from core.game import events as ev
+from core.game.abilities import Shield, Doom, Freeze, BlackHole
+from core.game.engine import GameEngine, play_turn
+from core.game.status import StatusTimeline
+from core.game.teams import TeamIndex
+from cli.commands import BattleCommand
+from tests.test_registry import ScriptedDisplay
+from tests.test_simulator import make_char
+
+class TestStatusTimeline(unittest.TestCase):
+
+    def setUp(self):
+        self.hero = make_char("Hero", 100, 10, 20)
+        self.enemy = make_char("Enemy", 80, 5, 15)
+
+    def test_shield_lasts_its_duration(self):
+        Shield(bonus=5, duration=2).use(self.hero, self.hero)
+        self.assertEqual(self.hero.armor, 15)
+        self.hero.end_turn_update()
+        self.assertEqual(self.hero.armor, 15)
+        self.hero.end_turn_update()
+        self.assertEqual(self.hero.armor, 10)
+
+    def test_shields_stack_and_expire_independently(self):
+        timeline = StatusTimeline()
+        timeline.shield(self.hero, 3, 1)
+        timeline.shield(self.hero, 4, 3)
+        self.assertEqual(self.hero.armor, 17)
+        timeline.end_turn()
+        self.assertEqual(self.hero.armor, 14)
+        timeline.end_turn()
+        timeline.end_turn()
+        self.assertEqual(self.hero.armor, 10)
+        self.assertEqual(len(timeline), 0)
+
+    def test_doom(self):
+        Doom(delay=2).use(self.hero, self.enemy)
+        self.assertEqual(self.enemy._doom_counter, 2)
+        self.assertEqual(self.enemy.end_turn_update(), [])
+        self.assertEqual(self.enemy.health, 80)
+        logs = self.enemy.end_turn_update()
+        self.assertIn("DOOM claims", logs[0])
+        self.assertFalse(self.enemy.is_alive())
+        self.assertIsNone(self.enemy._doom_counter)
+
+    def test_doom_counter_counts_down(self):
+        timeline = StatusTimeline()
+        timeline.acted(self.hero)
+        timeline.doom(self.hero, 2)
+        timeline.doom(self.enemy, 3)
+        timeline.end_turn()
+        self.assertEqual((self.hero._doom_counter, self.enemy._doom_counter), (2, 2))
+        timeline.end_turn()
+        self.assertEqual((self.hero._doom_counter, self.enemy._doom_counter), (1, 1))
+        timeline.end_turn()
+        self.assertEqual((self.hero._doom_counter, self.enemy._doom_counter), (None, None))
+        self.assertFalse(self.hero.is_alive() or self.enemy.is_alive())
+
+    def test_battle_reset_drops_shields_from_outside_battle(self):
+        self.hero.statuses.shield(self.hero, 5, 2)
+        self.hero._temp_armor = 0
+        self.hero.end_turn_update()
+        self.hero.end_turn_update()
+        self.assertEqual(self.hero.armor, 10)
+
+        engine = GameEngine()
+        roster = [make_char(f"C{i}", 100, 2, 10) for i in range(4)]
+        for c in roster: engine.add_character(c)
+        roster[0].statuses.shield(roster[0], 5, 2)
+        replay = Path(tempfile.mkdtemp()) / "last_battle.json"
+        with mock.patch("cli.commands.LAST_REPLAY_FILE", replay), redirect_stdout(StringIO()):
+            BattleCommand(engine, ScriptedDisplay([])).execute(["2vs2", "7"])
+        self.assertIsNone(roster[0]._statuses)
+        self.assertEqual(roster[0].armor, 2)
+
+    def test_recast_doom_replaces_pending(self):
+        timeline = StatusTimeline()
+        Doom(1).apply(self.hero, self.enemy, statuses=timeline)
+        Doom(3).apply(self.hero, self.enemy, statuses=timeline)
+        self.assertEqual(timeline.end_turn(), [])
+        self.assertEqual(timeline.end_turn(), [])
+        self.assertEqual(timeline.end_turn(), [self.enemy])
+
+    def test_acted_targets_keep_effects_a_turn_longer(self):
+        timeline = StatusTimeline()
+        timeline.acted(self.enemy)
+        timeline.shield(self.enemy, 5, 1)
+        timeline.end_turn()
+        self.assertEqual(self.enemy.armor, 10)
+        timeline.end_turn()
+        self.assertEqual(self.enemy.armor, 5)
+
+    def test_freeze_stacking(self):
+        Freeze(2).apply(self.hero, self.enemy)
+        Freeze(1).apply(self.hero, self.enemy)
+        self.assertEqual(self.enemy._frozen_turns, 2)
+        BlackHole(10, 1).apply(self.hero, self.enemy)
+        self.assertEqual(self.enemy._frozen_turns, 3)
+
+    def test_turn_only_touches_due_effects(self):
+        roster = [make_char(f"c{i}", 1000, 0, 1) for i in range(200)]
+        timeline = StatusTimeline()
+        teams = TeamIndex(roster[:100], roster[100:])
+        timeline.doom(roster[150], 1)
+        buf = ev.EventBuffer()
+        play_turn(roster, teams, timeline, random.Random(0), buf)
+        self.assertFalse(roster[150].is_alive())
+        self.assertEqual(len(teams.alive[1]), 99)
+        self.assertEqual(len(timeline), 0)
+        self.assertEqual(buf.records[-1][0], ev.STATUS_DOOMED)
+
+    def test_engine_battle_resets_timeline(self):
+        engine = GameEngine()
+        engine.statuses.doom(self.enemy, 5)
+        engine.start_battle(seed=1)
+        self.assertEqual(len(engine.statuses), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import random
+import unittest
+from core.game.teams import AliveIndex, TeamIndex
+from core.game.engine import GameEngine
+from core.game.grouping import SplitInTwoStrategy
+from tests.test_simulator import make_char
+
+class TestTeamIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.team1 = [make_char(n, 100, 1, 10) for n in "ABC"]
+        self.team2 = [make_char(n, 100, 1, 10) for n in "XYZ"]
+
+    def test_enemies_of(self):
+        teams = TeamIndex(self.team1, self.team2)
+        self.assertEqual(set(map(id, teams.enemies_of(self.team1[0]))), set(map(id, self.team2)))
+        self.assertEqual(set(map(id, teams.enemies_of(self.team2[2]))), set(map(id, self.team1)))
+
+    def test_dead_are_dropped(self):
+        self.team2[1].health = 0
+        teams = TeamIndex(self.team1, self.team2)
+        self.assertEqual(len(teams.alive[1]), 2)
+
+        self.team1[0].health = -5
+        teams.refresh(self.team1[0])
+        teams.refresh(self.team1[0])
+        teams.refresh(self.team1[1])
+        self.assertEqual([c.name for c in teams.alive[0]], ["C", "B"])
+
+    def test_discard_keeps_positions_consistent(self):
+        index = AliveIndex(self.team1 + self.team2)
+        rng = random.Random(3)
+        while index:
+            victim = index.choice(rng)
+            index.discard(victim)
+            self.assertNotIn(victim, index.members)
+            self.assertEqual(index._pos, {id(m): i for i, m in enumerate(index.members)})
+
+    def test_large_battle_finishes(self):
+        roster = [make_char(f"c{i}", 60, 1, 15) for i in range(400)]
+        engine, strategy = GameEngine(), SplitInTwoStrategy()
+        random.seed(0)
+        for _ in range(100):
+            engine.resolve_turn(roster, strategy)
+            if not any(c.is_alive() for c in roster[:200]) or not any(c.is_alive() for c in roster[200:]):
+                break
+        else:
+            self.fail("battle did not finish")
+
+if __name__ == '__main__':
+    unittest.main()
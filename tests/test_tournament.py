@@ -0,0 +1,89 @@
+import subprocess
+import sys
+import unittest
+from itertools import combinations, islice
+from core.game.engine import GameEngine
+from core.game.grouping import TwoVsTwoStrategy, SplitInTwoStrategy
+from core.game import tournament
+from core.game.tournament import pairing_count, run_tournament, sample_pairings, team_pairings
+from cli.commands import TournamentCommand
+from tests.test_registry import ScriptedDisplay
+from tests.test_simulator import make_char
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        self.roster = [make_char(f"C{i}", 80 + 7 * i, i % 4, 9 + i) for i in range(6)]
+
+    def test_team_pairings_are_disjoint_and_unique(self):
+        pairs = list(team_pairings(6, 2))
+        self.assertEqual(len(pairs), 45)
+        self.assertEqual(len(set(pairs)), 45)
+        for a, b in pairs:
+            self.assertFalse(set(a) & set(b))
+
+    def test_pairings_are_lazy_and_in_lexicographic_order(self):
+        teams = list(combinations(range(8), 3))
+        expected = [(a, b) for i, a in enumerate(teams) for b in teams[i + 1:] if not set(a) & set(b)]
+        self.assertEqual(list(team_pairings(8, 3)), expected)
+        self.assertEqual(pairing_count(8, 3), len(expected))
+        self.assertEqual(len(list(islice(team_pairings(100, 5), 3))), 3)
+
+    def test_sampled_pairings_are_distinct_and_reproducible(self):
+        sample = list(sample_pairings(100, 5, 200, seed=3))
+        self.assertEqual(sample, list(sample_pairings(100, 5, 200, seed=3)))
+        self.assertEqual(len(set(sample)), 200)
+        for a, b in sample:
+            self.assertFalse(set(a) & set(b))
+            self.assertLess(a, b)
+        self.assertEqual(sorted(sample_pairings(6, 2, 45, seed=1)), list(team_pairings(6, 2)))
+
+    def test_matchup_cap_samples(self):
+        pooled = run_tournament(self.roster, TwoVsTwoStrategy(), battles_per_matchup=2, seed=4,
+                                workers=2, max_matchups=20)
+        single = run_tournament(self.roster, TwoVsTwoStrategy(), battles_per_matchup=2, seed=4,
+                                workers=1, max_matchups=20)
+        self.assertEqual((pooled, pooled.matchups, pooled.battles), (single, 20, 40))
+
+        engine, display = GameEngine(), ScriptedDisplay([])
+        for c in self.roster: engine.add_character(c)
+        TournamentCommand(engine, display).execute(["2vs2", "1", "10"])
+        self.assertEqual(display.lines[1], "45 possible matchups; sampling 10 of them")
+        self.assertIn("(10 matchups, 10 battles)", display.lines[2])
+
+    def test_result_does_not_depend_on_worker_count(self):
+        single = run_tournament(self.roster, TwoVsTwoStrategy(), battles_per_matchup=3, seed=5, workers=1)
+        pooled = run_tournament(self.roster, TwoVsTwoStrategy(), battles_per_matchup=3, seed=5, workers=2)
+        self.assertEqual(single, pooled)
+        self.assertEqual(single.battles, 45 * 3)
+
+    def test_matrices_are_consistent(self):
+        res = run_tournament(self.roster, TwoVsTwoStrategy(), battles_per_matchup=2, workers=1)
+        for i in range(6):
+            self.assertEqual(res.wins[i][i], 0)
+            for j in range(6):
+                self.assertEqual(res.wins[i][j], res.losses[j][i])
+                self.assertEqual(res.draws[i][j], res.draws[j][i])
+
+    def test_chunks_return_per_matchup_tallies(self):
+        tournament._init_worker(self.roster, TwoVsTwoStrategy())
+        try:
+            tallies = tournament._run_chunk([(0, ((0, 1), (2, 3))), (1, ((0, 4), (1, 5)))], 5, 4, 30)
+        finally:
+            tournament._init_worker([], None)
+        self.assertEqual([t[:2] for t in tallies], [((0, 1), (2, 3)), ((0, 4), (1, 5))])
+        self.assertTrue(all(sum(t[2:]) == 4 for t in tallies))
+
+    def test_core_does_not_import_the_cli(self):
+        code = ("import sys; from core.game.tournament import run_tournament; "
+                "from core.game.grouping import TwoVsTwoStrategy; "
+                "run_tournament([], TwoVsTwoStrategy(), workers=1); print('cli.commands' in sys.modules)")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+    def test_team_size_required_for_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            run_tournament(self.roster, SplitInTwoStrategy(), workers=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from core.game.grouping import SplitInTwoStrategy
+from core.game.simulator import BattleSimulator, TEAM_1
+from core.game import vectorized
+from tests.test_simulator import make_char
+
+@unittest.skipIf(vectorized.np is None, "numpy is not installed")
+class TestVectorBattle(unittest.TestCase):
+
+    def setUp(self):
+        self.roster = [make_char("A", 120, 2, 14), make_char("B", 95, 5, 12), make_char("C", 110, 3, 11),
+                       make_char("D", 130, 1, 12), make_char("E", 90, 4, 15), make_char("F", 100, 2, 10)]
+        self.team1, self.team2 = SplitInTwoStrategy().group(self.roster)
+
+    def test_matches_scalar_engine_statistically(self):
+        trials = 600
+        scalar = BattleSimulator(self.roster, SplitInTwoStrategy(), seed=11).run_many(trials)
+        vector = [vectorized.VectorBattle.from_teams(self.team1, self.team2, seed=i).run() for i in range(trials)]
+
+        scalar_rate = sum(r.winner == TEAM_1 for r in scalar) / trials
+        vector_rate = sum(r.winner == TEAM_1 for r in vector) / trials
+        self.assertAlmostEqual(scalar_rate, vector_rate, delta=0.08)
+
+        scalar_turns = sum(r.turns for r in scalar) / trials
+        vector_turns = sum(r.turns for r in vector) / trials
+        self.assertAlmostEqual(scalar_turns, vector_turns, delta=0.1 * scalar_turns)
+
+    def test_large_battle_with_waves(self):
+        n = 1000
+        battle = vectorized.VectorBattle(hp=[100] * (2 * n), attack=[20] * (2 * n), armor=[2] * (2 * n),
+                                         team=[0] * n + [1] * n, seed=3)
+        battle.step()
+        self.assertEqual(battle.turn, 1)
+        self.assertTrue(battle.team_alive(0) and battle.team_alive(1))
+        self.assertLess(int(battle.hp.sum()), 100 * 2 * n)
+
+    def test_doom_and_freeze_ticks(self):
+        battle = vectorized.VectorBattle(hp=[100, 10_000], attack=[1, 1], armor=[0, 0], team=[0, 1], seed=0)
+        battle.freeze(1, 2)
+        battle.doom_in(1, 2)
+        battle.step()
+        self.assertEqual(int(battle.frozen[1]), 1)
+        self.assertEqual(int(battle.hp[0]), 100)
+        battle.step()
+        self.assertEqual(int(battle.hp[1]), 0)
+
+if __name__ == '__main__':
+    unittest.main()